@@ -0,0 +1,176 @@
+"""
+Benchmark of pulling podpings out of Hive blocks, the chain reader's per block
+work, against the previous parse-every-custom_json implementation.
+
+Builds synthetic blocks that look like mainnet: lots of custom_json from other
+apps (games, follows, sidechain ops), some podping startup operations and a few
+podpings.  Both parsers have to find the same podpings in every block.
+
+Example:
+    python -m benchmarks.bench_block_parsing --num-blocks 2000
+"""
+import argparse
+import json
+import random
+from timeit import default_timer as timer
+from typing import Callable, List, Optional
+
+from podping_schemas.org.podcastindex.podping.hivewriter.podping_hive_transaction import (
+    PodpingHiveTransaction,
+)
+from podping_schemas.org.podcastindex.podping.podping import Podping
+
+from podping_hivewriter.hive import _podping_transactions_from_block
+from podping_hivewriter.models.internal_podping import CURRENT_PODPING_VERSION
+from podping_hivewriter.models.medium import str_medium_map
+from podping_hivewriter.models.reason import str_reason_map
+
+other_custom_jsons = (
+    ("sm_stake_tokens", {"token": "SPS", "qty": 12.5, "app": "splinterlands/0.7"}),
+    (
+        "sm_market_purchase",
+        {"items": ["C3-457-R0FCBXY9PC"], "price": 0.91, "currency": "DEC"},
+    ),
+    ("ssc-mainnet-hive", {"contractName": "tokens", "contractAction": "transfer"}),
+    ("follow", ["follow", {"follower": "alice", "following": "bob", "what": []}]),
+    ("notify", ["setLastRead", {"date": "2022-01-01T00:00:00"}]),
+    ("community", ["subscribe", {"community": "hive-123456"}]),
+    ("pp_startup", {"server_account": "podping.aaa", "message": "Podping startup"}),
+)
+
+
+def podping_json(rng: random.Random, num_iris: int) -> str:
+    return json.dumps(
+        {
+            "version": CURRENT_PODPING_VERSION,
+            "medium": "podcast",
+            "reason": "update",
+            "iris": [
+                f"https://example.com/{rng.getrandbits(64):x}/feed.xml"
+                for _ in range(num_iris)
+            ],
+            "timestampNs": 1640995200000000000,
+            "sessionId": rng.getrandbits(63),
+        }
+    )
+
+
+def build_blocks(
+    num_blocks: int, txs_per_block: int, podping_ratio: float, seed: int
+) -> List[dict]:
+    rng = random.Random(seed)  # nosec
+    blocks = []
+    for _ in range(num_blocks):
+        transactions = []
+        for _ in range(txs_per_block):
+            if rng.random() < podping_ratio:
+                op_id, op_json = "pp_podcast_update", podping_json(
+                    rng, rng.randint(1, 10)
+                )
+            else:
+                op_id, data = rng.choice(other_custom_jsons)
+                op_json = json.dumps(data)
+            transactions.append(
+                {
+                    "operations": [
+                        {
+                            "type": "custom_json_operation",
+                            "value": {
+                                "id": op_id,
+                                "json": op_json,
+                                "required_auths": [],
+                                "required_posting_auths": ["alice"],
+                            },
+                        }
+                    ]
+                }
+            )
+        blocks.append(
+            {
+                "transactions": transactions,
+                "transaction_ids": [
+                    f"{rng.getrandbits(160):040x}" for _ in transactions
+                ],
+            }
+        )
+    return blocks
+
+
+def parse_block_baseline(block: dict, block_num: int, operation_id: Optional[str]):
+    """The chain reader's parsing before the fast path"""
+    transactions = []
+    for tx_num, transaction in enumerate(block["transactions"]):
+        tx_id = block["transaction_ids"][tx_num]
+        podpings = []
+        for op in transaction["operations"]:
+            if op["type"] == "custom_json_operation" and (
+                not operation_id or op["value"]["id"] == operation_id
+            ):
+                data = json.loads(op["value"]["json"])
+                if (
+                    "iris" in data
+                    and "version" in data
+                    and data["version"] == CURRENT_PODPING_VERSION
+                ):
+                    podpings.append(
+                        Podping(
+                            medium=str_medium_map[data["medium"]],
+                            reason=str_reason_map[data["reason"]],
+                            iris=data["iris"],
+                            timestampNs=data["timestampNs"],
+                            sessionId=data["sessionId"],
+                        )
+                    )
+        if len(podpings):
+            transactions.append(
+                (
+                    tx_num,
+                    PodpingHiveTransaction(
+                        podpings=podpings, hiveTxId=tx_id, hiveBlockNum=block_num
+                    ),
+                )
+            )
+    return transactions
+
+
+def time_parser(
+    parser: Callable, blocks: List[dict], operation_id: Optional[str]
+) -> float:
+    start = timer()
+    for block_num, block in enumerate(blocks):
+        parser(block, block_num, operation_id)
+    return timer() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--num-blocks", type=int, default=1000)
+    parser.add_argument("--txs-per-block", type=int, default=50)
+    parser.add_argument("--podping-ratio", type=float, default=0.02)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    blocks = build_blocks(
+        args.num_blocks, args.txs_per_block, args.podping_ratio, args.seed
+    )
+
+    for operation_id in (None, "pp_podcast_update"):
+        for block_num, block in enumerate(blocks):
+            expected = parse_block_baseline(block, block_num, operation_id)
+            actual = _podping_transactions_from_block(block, block_num, operation_id)
+            assert [(n, tx.hiveTxId) for n, tx in expected] == [
+                (n, tx.hiveTxId) for n, tx in actual
+            ], f"Mismatch in block {block_num}"
+
+        baseline = time_parser(parse_block_baseline, blocks, operation_id)
+        fast_path = time_parser(_podping_transactions_from_block, blocks, operation_id)
+        print(
+            f"operation_id={operation_id} | Blocks: {len(blocks):,} | "
+            f"Baseline: {len(blocks) / baseline:,.0f} blocks/s | "
+            f"Fast path: {len(blocks) / fast_path:,.0f} blocks/s | "
+            f"Speedup: {baseline / fast_path:.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
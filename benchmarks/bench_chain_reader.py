@@ -0,0 +1,150 @@
+"""
+Offline throughput benchmark for get_relevant_transactions_from_blockchain.
+
+Serves a recorded block corpus (see record_blocks) from a local replay node and
+reads it from the first block on, reporting blocks/sec and podpings/sec.
+Without a corpus, a synthetic one is made up first.
+
+Reads through lighthive (pointed at the replay node with PODPING_TESTNET) by
+default, or through the asyncio HiveRPC transport with --native-rpc.
+
+Example:
+    python -m benchmarks.bench_chain_reader blocks.jsonl.gz --window 20 --latency 0.05
+"""
+import argparse
+import asyncio
+import logging
+import os
+import tempfile
+from pathlib import Path
+from timeit import default_timer as timer
+from typing import Optional
+
+from benchmarks.block_corpus import read_blocks, write_blocks
+from benchmarks.record_blocks import synthetic_blocks
+from benchmarks.replay_node import ReplayNode
+from podping_hivewriter.hive import (
+    _podping_transactions_from_block,
+    get_client,
+    get_relevant_transactions_from_blockchain,
+)
+from podping_hivewriter.hive_rpc import HiveRPC
+
+
+async def run_benchmark(
+    corpus_path: Path,
+    window: int,
+    operation_id: Optional[str],
+    native_rpc: bool,
+    latency: float,
+) -> dict:
+    expected_transactions = 0
+    expected_podpings = 0
+    for block_num, result in read_blocks(corpus_path):
+        for _, tx in _podping_transactions_from_block(
+            result["block"], block_num, operation_id
+        ):
+            expected_transactions += 1
+            expected_podpings += len(tx.podpings)
+    if not expected_transactions:
+        raise SystemExit(f"No podpings in {corpus_path} to read")
+
+    replay_node = ReplayNode(corpus_path, latency=latency).start()
+    rpc = None
+    if native_rpc:
+        rpc = HiveRPC([replay_node.url])
+        client = None
+    else:
+        os.environ["PODPING_TESTNET"] = "true"
+        os.environ["PODPING_TESTNET_NODE"] = replay_node.url
+        os.environ.setdefault("PODPING_TESTNET_CHAINID", "0" * 64)
+        client = get_client()
+
+    num_transactions = 0
+    num_podpings = 0
+    num_iris = 0
+    last_block_num = replay_node.first_block_num
+
+    start = timer()
+    transactions = get_relevant_transactions_from_blockchain(
+        client, replay_node.first_block_num, operation_id, window=window, rpc=rpc
+    )
+    async for tx in transactions:
+        num_transactions += 1
+        num_podpings += len(tx.podpings)
+        num_iris += sum(len(podping.iris) for podping in tx.podpings)
+        last_block_num = tx.hiveBlockNum
+        if num_transactions == expected_transactions:
+            break
+    elapsed = timer() - start
+    await transactions.aclose()
+
+    if rpc is not None:
+        rpc.close()
+    replay_node.close()
+
+    num_blocks = last_block_num - replay_node.first_block_num + 1
+    return {
+        "blocks": num_blocks,
+        "podpings": num_podpings,
+        "seconds": elapsed,
+        "blocks/sec": num_blocks / elapsed,
+        "podpings/sec": num_podpings / elapsed,
+        "iris/sec": num_iris / elapsed,
+        "node requests": replay_node.num_requests,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("corpus", nargs="?", help="gzip JSONL block corpus")
+    parser.add_argument("--window", type=int, default=20)
+    parser.add_argument("--operation-id", default=None)
+    parser.add_argument("--native-rpc", action="store_true")
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.05,
+        help="Seconds the replay node holds each request, like a remote node",
+    )
+    parser.add_argument(
+        "--synthetic-blocks",
+        type=int,
+        default=2000,
+        help="Blocks to make up when no corpus is given",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.WARNING,
+        format=f"%(asctime)s | %(levelname)s | %(message)s",
+        datefmt="%Y-%m-%dT%H:%M:%S%z",
+    )
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        if args.corpus:
+            corpus_path = Path(args.corpus)
+        else:
+            corpus_path = Path(temp_dir) / "synthetic.jsonl.gz"
+            write_blocks(
+                corpus_path,
+                synthetic_blocks(62000000, args.synthetic_blocks, 50, 0.02, 1),
+            )
+
+        loop = asyncio.get_event_loop()
+        results = loop.run_until_complete(
+            run_benchmark(
+                corpus_path,
+                args.window,
+                args.operation_id,
+                args.native_rpc,
+                args.latency,
+            )
+        )
+
+    for name, value in results.items():
+        print(f"{name:>24}: {value:,.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Microbenchmark of making the batches the writer queues for broadcast: the
+pydantic IRIBatch with a copied IRI set, as the writer used to, against
+the slotted QueuedIRIBatch holding the planner's list as is.
+
+Reports the memory blocks and bytes each queued batch holds on to, measured
+with tracemalloc, and batches made per second.
+
+Example:
+    python -m benchmarks.bench_iri_batch --num-batches 20000
+"""
+import argparse
+import random
+import tracemalloc
+from timeit import default_timer as timer
+from typing import Callable, List
+
+from podping_schemas.org.podcastindex.podping.podping_medium import (
+    PodpingMedium,
+)
+from podping_schemas.org.podcastindex.podping.podping_reason import (
+    PodpingReason,
+)
+
+from podping_hivewriter.models.iri_batch import IRIBatch, QueuedIRIBatch
+
+
+def build_iri_lists(num_batches: int, max_iris: int, seed: int) -> List[List[str]]:
+    rng = random.Random(seed)  # nosec
+    return [
+        [
+            f"https://example.com/{rng.getrandbits(64):x}/feed.xml"
+            for _ in range(rng.randint(1, max_iris))
+        ]
+        for _ in range(num_batches)
+    ]
+
+
+def pydantic_batch(iris: List[str], timestamp_ns: int):
+    return IRIBatch(
+        medium=PodpingMedium.podcast,
+        reason=PodpingReason.update,
+        iri_set=set(iris),
+        priority=1,
+        timestampNs=timestamp_ns,
+    )
+
+
+def slotted_batch(iris: List[str], timestamp_ns: int):
+    return QueuedIRIBatch(
+        PodpingMedium.podcast, PodpingReason.update, iris, 1, timestamp_ns
+    )
+
+
+def measure(make_batch: Callable, iri_lists: List[List[str]]) -> dict:
+    # Warm up caches, so only steady state allocations are counted
+    for iris in iri_lists[:100]:
+        make_batch(iris, 0)
+
+    # Made up front, growing it isn't part of the cost of a batch
+    batches = [None] * len(iri_lists)
+    tracemalloc.start()
+    for i, iris in enumerate(iri_lists):
+        batches[i] = make_batch(iris, i)
+    stats = tracemalloc.take_snapshot().statistics("filename")
+    tracemalloc.stop()
+    del batches
+
+    start = timer()
+    for i, iris in enumerate(iri_lists):
+        make_batch(iris, i)
+    elapsed = timer() - start
+
+    return {
+        "blocks": sum(stat.count for stat in stats) / len(iri_lists),
+        "bytes": sum(stat.size for stat in stats) / len(iri_lists),
+        "batches/s": len(iri_lists) / elapsed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--num-batches", type=int, default=10000)
+    parser.add_argument("--max-iris", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    iri_lists = build_iri_lists(args.num_batches, args.max_iris, args.seed)
+
+    results = {
+        name: measure(make_batch, iri_lists)
+        for name, make_batch in (
+            ("pydantic", pydantic_batch),
+            ("slotted", slotted_batch),
+        )
+    }
+    for name, result in results.items():
+        print(
+            f"{name:>10}: {result['blocks']:,.1f} allocations, "
+            f"{result['bytes']:,.0f} bytes per batch | "
+            f"{result['batches/s']:,.0f} batches/s"
+        )
+    print(
+        f"{'reduction':>10}: "
+        f"{results['pydantic']['blocks'] / results['slotted']['blocks']:.1f}x "
+        f"allocations, "
+        f"{results['pydantic']['bytes'] / results['slotted']['bytes']:.1f}x bytes"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Throughput benchmark for the on-disk IRI journal.
+
+Records IRIs as accepted at the given rate (or as fast as possible) while the
+journal's fsync loop runs, marks them done in transaction sized groups, then
+replays the journal from disk.  Reports records/sec, fsyncs and replay time, to
+check that journaling doesn't bottleneck ingestion.
+
+Example:
+    python -m benchmarks.bench_iri_journal --num-iris 200000 --directory /tmp/journal
+"""
+import argparse
+import asyncio
+import shutil
+import tempfile
+from timeit import default_timer as timer
+
+from podping_schemas.org.podcastindex.podping.podping_medium import PodpingMedium
+from podping_schemas.org.podcastindex.podping.podping_reason import PodpingReason
+
+from podping_hivewriter.iri_journal import IRIJournal
+
+
+async def run_benchmark(args):
+    journal = IRIJournal(
+        args.directory,
+        fsync_interval=args.fsync_interval,
+        max_segment_bytes=args.max_segment_bytes,
+    )
+    await journal.open()
+    flush_task = asyncio.create_task(journal.flush_loop())
+
+    medium = PodpingMedium.podcast
+    reason = PodpingReason.update
+    iris = [f"https://example.com/{i}/feed.xml" for i in range(args.num_iris)]
+
+    start = timer()
+    for i, iri in enumerate(iris):
+        journal.record_accepted(medium, reason, iri)
+        done_end = i + 1 - args.pending
+        if done_end > 0 and done_end % args.tx_size == 0:
+            done_iris = iris[done_end - args.tx_size : done_end]
+            journal.record_done(medium, reason, done_iris)
+        if i % 1000 == 999:
+            # Let the flush loop run, like the writer does between ZMQ messages
+            await asyncio.sleep(0)
+    record_duration = timer() - start
+
+    await journal.flush()
+    total_duration = timer() - start
+    flush_task.cancel()
+    journal.close()
+
+    start = timer()
+    replay_journal = IRIJournal(args.directory)
+    pending = await replay_journal.open()
+    replay_duration = timer() - start
+    replay_journal.close()
+
+    print(f"      IRIs recorded: {args.num_iris:,}")
+    print(f"   record IRIs/sec: {args.num_iris / record_duration:,.0f}")
+    print(f"  durable IRIs/sec: {args.num_iris / total_duration:,.0f}")
+    print(f"            fsyncs: {journal.num_fsyncs:,}")
+    print(f"      IRIs pending: {len(pending):,}")
+    print(f"       replay time: {replay_duration:.3f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--num-iris", type=int, default=100000)
+    parser.add_argument(
+        "--pending",
+        type=int,
+        default=1000,
+        help="IRIs left in flight before they're marked done",
+    )
+    parser.add_argument("--tx-size", type=int, default=500)
+    parser.add_argument("--fsync-interval", type=float, default=0.1)
+    parser.add_argument("--max-segment-bytes", type=int, default=16 * 1024 * 1024)
+    parser.add_argument("--directory", default=None)
+    args = parser.parse_args()
+
+    cleanup = args.directory is None
+    if cleanup:
+        args.directory = tempfile.mkdtemp(prefix="podping-journal-bench-")
+
+    try:
+        asyncio.get_event_loop().run_until_complete(run_benchmark(args))
+    finally:
+        if cleanup:
+            shutil.rmtree(args.directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
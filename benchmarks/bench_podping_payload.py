@@ -0,0 +1,94 @@
+"""
+Microbenchmark of serializing podping payloads: InternalPodping(...).dict() plus
+json.dumps, as the writer used to for every batch, against
+encode_podping_payload.
+
+Both have to produce the same bytes for every batch.
+
+Example:
+    python -m benchmarks.bench_podping_payload --num-batches 20000
+"""
+import argparse
+import json
+import random
+from timeit import default_timer as timer
+from typing import List
+
+from podping_schemas.org.podcastindex.podping.podping_medium import (
+    PodpingMedium,
+)
+from podping_schemas.org.podcastindex.podping.podping_reason import (
+    PodpingReason,
+)
+
+from podping_hivewriter.models.internal_podping import InternalPodping
+from podping_hivewriter.podping_payload import encode_podping_payload
+
+
+def build_batches(num_batches: int, max_iris: int, seed: int) -> List[List[str]]:
+    rng = random.Random(seed)  # nosec
+    return [
+        [
+            f"https://example.com/{rng.getrandbits(64):x}/feed.xml"
+            for _ in range(rng.randint(1, max_iris))
+        ]
+        for _ in range(num_batches)
+    ]
+
+
+def pydantic_payload(iris: List[str], timestamp_ns: int, session_id: int) -> str:
+    return json.dumps(
+        InternalPodping(
+            medium=PodpingMedium.podcast,
+            reason=PodpingReason.update,
+            iris=iris,
+            timestampNs=timestamp_ns,
+            sessionId=session_id,
+        ).dict(),
+        separators=(",", ":"),
+    )
+
+
+def direct_payload(iris: List[str], timestamp_ns: int, session_id: int) -> str:
+    return encode_podping_payload(
+        str(PodpingMedium.podcast),
+        str(PodpingReason.update),
+        iris,
+        timestamp_ns,
+        session_id,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--num-batches", type=int, default=10000)
+    parser.add_argument("--max-iris", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    batches = build_batches(args.num_batches, args.max_iris, args.seed)
+    timestamp_ns = 1640995200123456789
+    session_id = (1 << 64) - 1
+
+    for iris in batches:
+        assert pydantic_payload(iris, timestamp_ns, session_id) == direct_payload(
+            iris, timestamp_ns, session_id
+        )
+
+    results = {}
+    for name, encode in (("pydantic", pydantic_payload), ("direct", direct_payload)):
+        start = timer()
+        for iris in batches:
+            encode(iris, timestamp_ns, session_id)
+        results[name] = timer() - start
+
+    for name, elapsed in results.items():
+        print(
+            f"{name:>10}: {len(batches) / elapsed:,.0f} payloads/s | "
+            f"{elapsed / len(batches) * 1e6:.1f}us per payload"
+        )
+    print(f"{'speedup':>10}: {results['pydantic'] / results['direct']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
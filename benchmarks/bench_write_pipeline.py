@@ -0,0 +1,269 @@
+"""
+Offline throughput benchmark for the full PodpingHivewriter write pipeline.
+
+IRIs are pushed through send_podping (in-process Plexus), send_podpings (bulk)
+or a ZeroMQ PodpingWrite client, batched by the writer and broadcast to a
+FakeHiveClient.  Reports IRIs/sec, end-to-end latency percentiles (IRI sent ->
+PodpingHiveTransaction received), CPU time and RSS.
+
+Example:
+    python -m benchmarks.bench_write_pipeline --num-iris 20000 --mode zmq
+"""
+import argparse
+import asyncio
+import logging
+import random
+import resource
+import statistics
+import time
+import uuid
+from ipaddress import IPv4Address
+from timeit import default_timer as timer
+from typing import Dict, List
+
+from plexo.ganglion.tcp_pair import GanglionZmqTcpPair
+from plexo.plexus import Plexus
+from podping_schemas.org.podcastindex.podping.hivewriter.podping_hive_transaction import (
+    PodpingHiveTransaction,
+)
+from podping_schemas.org.podcastindex.podping.podping_write import PodpingWrite
+
+from benchmarks.fake_hive import FakeHiveClient
+from podping_hivewriter.models.medium import mediums
+from podping_hivewriter.models.reason import reasons
+from podping_hivewriter.neuron import (
+    podping_hive_transaction_neuron,
+    podping_write_neuron,
+)
+from podping_hivewriter.podping_hivewriter import PodpingHivewriter
+from podping_hivewriter.podping_settings_manager import PodpingSettingsManager
+
+host = "127.0.0.1"
+port = 9979
+
+
+def current_rss_kib() -> float:
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * resource.getpagesize() / 1024
+    except (OSError, IndexError, ValueError):
+        return float("nan")
+
+
+def max_rss_kib() -> float:
+    # ru_maxrss is KiB on Linux
+    return float(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return float("nan")
+    last = len(sorted_values) - 1
+    index = min(last, int(round(pct / 100 * last)))
+    return sorted_values[index]
+
+
+async def run_benchmark(args) -> Dict[str, float]:
+    sent_times: Dict[str, float] = {}
+    latencies: List[float] = []
+    all_received = asyncio.Event()
+
+    async def _podping_hive_transaction_reaction(
+        transaction: PodpingHiveTransaction, _, _2
+    ):
+        now = timer()
+        for podping in transaction.podpings:
+            for iri in podping.iris:
+                sent_time = sent_times.pop(iri, None)
+                if sent_time is not None:
+                    latencies.append(now - sent_time)
+        if len(latencies) >= args.num_iris:
+            all_received.set()
+
+    settings_manager = PodpingSettingsManager(
+        ignore_updates=True, hive_operation_period=args.hive_operation_period
+    )
+    client = FakeHiveClient(
+        latency=args.broadcast_latency, wait_for_block=args.wait_for_block
+    )
+
+    writer_plexus = None if args.mode == "zmq" else Plexus()
+
+    writer = PodpingHivewriter(
+        "podping.bench",
+        ["5JbenchmarkFakePostingKey"],
+        settings_manager,
+        listen_ip=host,
+        listen_port=port,
+        resource_test=False,
+        status=False,
+        zmq_service=args.mode == "zmq",
+        client=client,
+        plexus=writer_plexus,
+        max_broadcasts_in_flight=args.max_broadcasts_in_flight,
+        block_aligned=args.block_aligned,
+    )
+    await writer.wait_startup()
+
+    if args.mode == "zmq":
+        tcp_pair_ganglion = GanglionZmqTcpPair(
+            peer=(IPv4Address(host), port),
+            relevant_neurons=(
+                podping_hive_transaction_neuron,
+                podping_write_neuron,
+            ),
+        )
+        client_plexus = Plexus(ganglia=(tcp_pair_ganglion,))
+        await client_plexus.adapt(
+            podping_hive_transaction_neuron,
+            reactants=(_podping_hive_transaction_reaction,),
+        )
+        await client_plexus.adapt(podping_write_neuron)
+    else:
+        client_plexus = writer.plexus
+        await client_plexus.adapt(
+            podping_hive_transaction_neuron,
+            reactants=(_podping_hive_transaction_reaction,),
+        )
+
+    session_uuid_str = str(uuid.uuid4())
+    medium_list = sorted(mediums)
+    reason_list = sorted(reasons)
+
+    rss_start = current_rss_kib()
+    cpu_start = time.process_time()
+    start = timer()
+
+    if args.mode == "send_podpings":
+        for chunk_start in range(0, args.num_iris, args.chunk_size):
+            chunk_end = min(args.num_iris, chunk_start + args.chunk_size)
+            iris = [
+                f"https://example.com/feed.xml?i={i}&s={session_uuid_str}"
+                for i in range(chunk_start, chunk_end)
+            ]
+            now = timer()
+            sent_times.update((iri, now) for iri in iris)
+            await writer.send_podpings(iris)
+    else:
+        for i in range(args.num_iris):
+            iri = f"https://example.com/feed.xml?i={i}&s={session_uuid_str}"
+            if args.random_pairs:
+                medium = random.choice(medium_list)  # nosec
+                reason = random.choice(reason_list)  # nosec
+            else:
+                medium = writer.medium
+                reason = writer.reason
+            sent_times[iri] = timer()
+            if args.mode == "zmq":
+                await client_plexus.transmit(
+                    PodpingWrite(medium=medium, reason=reason, iri=iri)
+                )
+            else:
+                await writer.send_podping(iri, medium, reason)
+            if args.rate and (i + 1) % args.rate == 0:
+                # Pace the sender at roughly args.rate IRIs per second
+                await asyncio.sleep(max(0.0, (i + 1) / args.rate - (timer() - start)))
+
+    send_duration = timer() - start
+
+    try:
+        await asyncio.wait_for(all_received.wait(), timeout=args.timeout)
+    except asyncio.TimeoutError:
+        logging.warning(
+            f"Timed out with {len(latencies)} of {args.num_iris} IRIs received"
+        )
+
+    duration = timer() - start
+    cpu_time = time.process_time() - cpu_start
+
+    latencies.sort()
+    results = {
+        "iris_sent": float(args.num_iris),
+        "iris_received": float(len(latencies)),
+        "send_duration_s": send_duration,
+        "duration_s": duration,
+        "iris_per_sec": len(latencies) / duration if duration else float("nan"),
+        "cpu_s": cpu_time,
+        "cpu_ms_per_1k_iris": cpu_time * 1e6 / max(1, len(latencies)),
+        "latency_mean_s": statistics.mean(latencies) if latencies else float("nan"),
+        "latency_p50_s": percentile(latencies, 50),
+        "latency_p90_s": percentile(latencies, 90),
+        "latency_p99_s": percentile(latencies, 99),
+        "latency_max_s": latencies[-1] if latencies else float("nan"),
+        "broadcasts": float(client.num_broadcasts),
+        "operations": float(client.num_operations),
+        "rejected_broadcasts": float(client.num_rejected),
+        "rss_start_kib": rss_start,
+        "rss_end_kib": current_rss_kib(),
+        "rss_max_kib": max_rss_kib(),
+    }
+
+    writer.close()
+    if args.mode == "zmq":
+        client_plexus.close()
+    else:
+        writer_plexus.close()
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--num-iris", type=int, default=10000)
+    parser.add_argument(
+        "--mode",
+        choices=("send_podping", "send_podpings", "zmq"),
+        default="send_podping",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=1000,
+        help="IRIs per send_podpings call in send_podpings mode",
+    )
+    parser.add_argument(
+        "--rate", type=int, default=0, help="IRIs per second, 0 for unlimited"
+    )
+    parser.add_argument("--hive-operation-period", type=int, default=3)
+    parser.add_argument(
+        "--broadcast-latency",
+        type=float,
+        default=0.25,
+        help="Seconds the fake node takes to answer a broadcast",
+    )
+    parser.add_argument(
+        "--random-pairs",
+        action="store_true",
+        help="Spread IRIs over random medium/reason pairs",
+    )
+    parser.add_argument(
+        "--wait-for-block",
+        action="store_true",
+        help="Broadcasts only return once their block is produced, like a real "
+        "synchronous broadcast, so latency includes time to inclusion",
+    )
+    parser.add_argument("--max-broadcasts-in-flight", type=int, default=3)
+    parser.add_argument(
+        "--block-aligned",
+        action="store_true",
+        help="Send transactions right after each new block",
+    )
+    parser.add_argument("--timeout", type=float, default=600)
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.WARNING,
+        format=f"%(asctime)s | %(levelname)s | %(message)s",
+        datefmt="%Y-%m-%dT%H:%M:%S%z",
+    )
+
+    loop = asyncio.get_event_loop()
+    results = loop.run_until_complete(run_benchmark(args))
+
+    for name, value in results.items():
+        print(f"{name:>24}: {value:,.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+"""
+Recorded block corpus format: gzip compressed JSON lines, one block per line,
+in block order:
+
+    {"block_num": 62000000, "result": {"block": {...}}}
+
+where result is exactly what a node answered to block_api.get_block for that
+block number.
+"""
+import gzip
+import json
+from pathlib import Path
+from typing import Iterable, Iterator, Tuple, Union
+
+
+def write_blocks(path: Union[str, Path], blocks: Iterable[Tuple[int, dict]]) -> int:
+    """Write (block_num, get_block result) pairs, returns how many"""
+    num_blocks = 0
+    with gzip.open(path, "wt", encoding="UTF-8") as f:
+        for block_num, result in blocks:
+            f.write(json.dumps({"block_num": block_num, "result": result}))
+            f.write("\n")
+            num_blocks += 1
+    return num_blocks
+
+
+def read_blocks(path: Union[str, Path]) -> Iterator[Tuple[int, dict]]:
+    """(block_num, get_block result) pairs in the order they were recorded"""
+    with gzip.open(path, "rt", encoding="UTF-8") as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                yield record["block_num"], record["result"]
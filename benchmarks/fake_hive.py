@@ -0,0 +1,115 @@
+import hashlib
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, List
+
+from lighthive.exceptions import RPCNodeException
+
+HIVE_BLOCK_INTERVAL = 3
+CUSTOM_JSON_PER_BLOCK = 5
+
+
+class FakeHiveClient:
+    """Stand-in for a lighthive Client that accepts broadcasts without a chain.
+
+    Blocks are produced every block_interval seconds on a wall clock grid, like
+    Hive's block slots.  Broadcasts sleep for the given latency (they run in the
+    writer's thread pool, just like the real client) and then land in the next
+    block, enforcing the custom_json per block limit of a real Hive node.  With
+    wait_for_block they only return once that block is produced, like a real
+    synchronous broadcast.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        block_interval: float = HIVE_BLOCK_INTERVAL,
+        custom_json_per_block: int = CUSTOM_JSON_PER_BLOCK,
+        wait_for_block: bool = False,
+    ):
+        self.latency = latency
+        self.block_interval = block_interval
+        self.custom_json_per_block = custom_json_per_block
+        self.wait_for_block = wait_for_block
+
+        self.nodes: List[str] = ["http://fake-hive.invalid"]
+        self.node_list: List[str] = list(self.nodes)
+        self.current_node: str = self.nodes[0]
+        self.circuit_breaker_cache: Dict[str, bool] = {}
+        self.circuit_breaker_ttl = 300
+        self.chain = None
+
+        self.num_broadcasts = 0
+        self.num_operations = 0
+        self.num_rejected = 0
+
+        # Block 1 is the one in the slot the client was created in
+        self._first_slot = int(time.time() // block_interval)
+        self._lock = threading.Lock()
+        self._ops_per_block: Dict[int, int] = {}
+        self._txs_per_block: Dict[int, int] = {}
+
+    def __call__(self, api_type="condenser_api"):
+        return self
+
+    def next_node(self):
+        return self.current_node
+
+    def head_block_number(self) -> int:
+        return int(time.time() // self.block_interval) - self._first_slot + 1
+
+    def block_timestamp(self, block_num: int) -> float:
+        return (self._first_slot + block_num - 1) * self.block_interval
+
+    def get_dynamic_global_properties(self) -> dict:
+        head_block_number = self.head_block_number()
+        head_block_time = datetime.fromtimestamp(
+            self.block_timestamp(head_block_number), timezone.utc
+        )
+        return {
+            "head_block_number": head_block_number,
+            "head_block_id": f"{head_block_number:08x}" + "0" * 32,
+            "time": head_block_time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+
+    def broadcast_sync(self, op, dry_run=False) -> dict:
+        ops = op if isinstance(op, list) else [op]
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        with self._lock:
+            block_num = self.head_block_number() + 1
+            num_ops = self._ops_per_block.get(block_num, 0) + len(ops)
+            if num_ops > self.custom_json_per_block:
+                self.num_rejected += 1
+                raise RPCNodeException(
+                    "plugin exception",
+                    code=-32000,
+                    raw_body={
+                        "error": {
+                            "message": "plugin exception: "
+                            "Account can only issue 5 custom json operations per block"
+                        }
+                    },
+                )
+            self._ops_per_block[block_num] = num_ops
+            trx_num = self._txs_per_block.get(block_num, 0)
+            self._txs_per_block[block_num] = trx_num + 1
+            self.num_broadcasts += 1
+            self.num_operations += len(ops)
+
+        if self.wait_for_block:
+            time.sleep(max(0.0, self.block_timestamp(block_num) - time.time()))
+
+        tx_id = hashlib.sha1(  # nosec
+            f"{block_num}:{trx_num}:{repr(ops)}".encode("UTF-8")
+        ).hexdigest()
+
+        return {
+            "id": tx_id,
+            "block_num": block_num,
+            "trx_num": trx_num,
+            "expired": False,
+        }
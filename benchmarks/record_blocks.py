@@ -0,0 +1,116 @@
+"""
+Record a block corpus for the replay node, either from a live Hive node or
+synthesized offline.
+
+Recording fetches block_api.get_block in JSON-RPC batches and stores the
+responses untouched.  Synthesized blocks are the mainnet-like mix of custom_json
+from bench_block_parsing.
+
+Examples:
+    python -m benchmarks.record_blocks blocks.jsonl.gz --start 62000000 --count 2000
+    python -m benchmarks.record_blocks synthetic.jsonl.gz --synthetic --count 5000
+"""
+import argparse
+import json
+import time
+import urllib.request
+from typing import Iterator, List, Tuple
+
+from benchmarks.bench_block_parsing import build_blocks
+from benchmarks.block_corpus import write_blocks
+
+
+def fetch_blocks(
+    node: str, block_nums: List[int], timeout: float = 30
+) -> List[Tuple[int, dict]]:
+    request = urllib.request.Request(  # nosec
+        node,
+        data=json.dumps(
+            [
+                {
+                    "jsonrpc": "2.0",
+                    "method": "block_api.get_block",
+                    "params": {"block_num": block_num},
+                    "id": block_num,
+                }
+                for block_num in block_nums
+            ]
+        ).encode("UTF-8"),
+        headers={"Content-Type": "application/json"},
+    )
+    with urllib.request.urlopen(request, timeout=timeout) as response:  # nosec
+        responses = {
+            response["id"]: response for response in json.loads(response.read())
+        }
+    blocks = []
+    for block_num in block_nums:
+        result = responses[block_num].get("result")
+        if not result or "block" not in result:
+            raise ValueError(f"{node} has no block {block_num}: {responses[block_num]}")
+        blocks.append((block_num, result))
+    return blocks
+
+
+def recorded_blocks(
+    node: str, start: int, count: int, batch_size: int
+) -> Iterator[Tuple[int, dict]]:
+    for batch_start in range(start, start + count, batch_size):
+        block_nums = list(
+            range(batch_start, min(batch_start + batch_size, start + count))
+        )
+        for attempt in range(5):
+            try:
+                yield from fetch_blocks(node, block_nums)
+                break
+            except (OSError, ValueError) as e:
+                if attempt == 4:
+                    raise
+                print(f"Retrying blocks {block_nums[0]:,}+: {e}")
+                time.sleep(2**attempt)
+        print(f"Recorded up to block {block_nums[-1]:,}", end="\r")
+    print()
+
+
+def synthetic_blocks(
+    start: int, count: int, txs_per_block: int, podping_ratio: float, seed: int
+) -> Iterator[Tuple[int, dict]]:
+    first_timestamp = 1640995200
+    for i, block in enumerate(build_blocks(count, txs_per_block, podping_ratio, seed)):
+        block_num = start + i
+        block["block_id"] = f"{block_num:08x}" + "0" * 32
+        block["timestamp"] = time.strftime(
+            "%Y-%m-%dT%H:%M:%S", time.gmtime(first_timestamp + i * 3)
+        )
+        yield block_num, {"block": block}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("output", help="gzip JSONL file to write")
+    parser.add_argument("--node", default="https://api.hive.blog")
+    parser.add_argument("--start", type=int, default=62000000)
+    parser.add_argument("--count", type=int, default=1000)
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument(
+        "--synthetic",
+        action="store_true",
+        help="Make up mainnet-like blocks instead of recording from --node",
+    )
+    parser.add_argument("--txs-per-block", type=int, default=50)
+    parser.add_argument("--podping-ratio", type=float, default=0.02)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    if args.synthetic:
+        blocks = synthetic_blocks(
+            args.start, args.count, args.txs_per_block, args.podping_ratio, args.seed
+        )
+    else:
+        blocks = recorded_blocks(args.node, args.start, args.count, args.batch_size)
+
+    num_blocks = write_blocks(args.output, blocks)
+    print(f"Wrote {num_blocks:,} blocks to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
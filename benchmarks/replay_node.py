@@ -0,0 +1,142 @@
+"""
+Local Hive JSON-RPC node replaying a recorded block corpus, for running the
+chain reader offline.
+
+Answers block_api.get_block (and condenser_api.get_block) from the corpus and
+get_dynamic_global_properties with a head block one past the last recorded
+block, so a reader started at the first block catches up over all of them.
+JSON-RPC batches are supported, and every request can be held back by latency
+seconds to stand in for the round trip to a real node.
+
+Example:
+    python -m benchmarks.replay_node blocks.jsonl.gz --port 8091
+"""
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Union
+
+from benchmarks.block_corpus import read_blocks
+
+
+class ReplayNode:
+    def __init__(
+        self,
+        corpus_path: Union[str, Path],
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+    ):
+        # Kept encoded, the node shouldn't be what the benchmark measures
+        self.blocks: Dict[int, str] = {
+            block_num: json.dumps(result)
+            for block_num, result in read_blocks(corpus_path)
+        }
+        if not self.blocks:
+            raise ValueError(f"No blocks in {corpus_path}")
+        self.first_block_num = min(self.blocks)
+        self.head_block_number = max(self.blocks) + 1
+        self.latency = latency
+
+        self.num_requests = 0
+
+        replay_node = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body go out in separate writes
+            disable_nagle_algorithm = True
+
+            def do_POST(self):
+                replay_node.num_requests += 1
+                request = json.loads(
+                    self.rfile.read(int(self.headers["Content-Length"]))
+                )
+                if replay_node.latency:
+                    time.sleep(replay_node.latency)
+                if isinstance(request, list):
+                    body = (
+                        "["
+                        + ",".join(replay_node.response(call) for call in request)
+                        + "]"
+                    )
+                else:
+                    body = replay_node.response(request)
+                encoded_body = body.encode("UTF-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(encoded_body)))
+                self.end_headers()
+                self.wfile.write(encoded_body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.url = f"http://{host}:{self.server.server_port}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def start(self) -> "ReplayNode":
+        self.thread.start()
+        return self
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def result(self, method: str, params) -> str:
+        """The JSON encoded result of a call"""
+        if method.endswith("get_dynamic_global_properties"):
+            return json.dumps(
+                {
+                    "head_block_number": self.head_block_number,
+                    "head_block_id": f"{self.head_block_number:08x}" + "0" * 32,
+                    "time": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime()),
+                }
+            )
+        if method.endswith("get_block"):
+            block_num = (
+                params["block_num"] if isinstance(params, dict) else int(params[0])
+            )
+            # Empty like a node answers for a block it doesn't have
+            return self.blocks.get(block_num, "{}")
+        raise LookupError(method)
+
+    def response(self, request: dict) -> str:
+        request_id = json.dumps(request.get("id"))
+        try:
+            result = self.result(request["method"], request.get("params"))
+        except LookupError as e:
+            error = {"code": -32601, "message": f"Unknown method: {e}"}
+            return f'{{"jsonrpc":"2.0","id":{request_id},"error":{json.dumps(error)}}}'
+        return f'{{"jsonrpc":"2.0","id":{request_id},"result":{result}}}'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("corpus", help="gzip JSONL block corpus")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8091)
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="Seconds to hold each request"
+    )
+    args = parser.parse_args()
+
+    replay_node = ReplayNode(args.corpus, args.host, args.port, args.latency)
+    print(
+        f"Replaying blocks {replay_node.first_block_num:,} to "
+        f"{replay_node.head_block_number - 1:,} on {replay_node.url}"
+    )
+    try:
+        replay_node.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        replay_node.server.server_close()
+
+
+if __name__ == "__main__":
+    main()
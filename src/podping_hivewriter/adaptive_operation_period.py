@@ -0,0 +1,64 @@
+import math
+from timeit import default_timer as timer
+from typing import Optional
+
+
+class AdaptiveOperationPeriod:
+    """Picks how long IRIs are collected before they're batched, from how busy
+    the custom_json block slots are.
+
+    With few operations going out there's nothing to save, so IRIs are batched
+    after floor seconds.  As the operations sent approach what the accounts can
+    get into blocks, the window widens to the configured hive_operation_period,
+    packing more IRIs into every operation.  Utilization is the operations
+    queued per second over the block slots per second, smoothed over
+    time_constant seconds.
+    """
+
+    def __init__(
+        self,
+        floor: float = 1.0,
+        time_constant: float = 30.0,
+        low_utilization: float = 0.2,
+        high_utilization: float = 0.8,
+        sample_interval: float = 1.0,
+    ):
+        if not 0 <= low_utilization < high_utilization:
+            raise ValueError("low_utilization must be below high_utilization")
+        self.floor = floor
+        self.time_constant = time_constant
+        self.low_utilization = low_utilization
+        self.high_utilization = high_utilization
+        self.sample_interval = sample_interval
+
+        self.utilization = 0.0
+        # Last window handed out, for the status report
+        self.period: Optional[float] = None
+
+        self._operations = 0
+        self._sampled = timer()
+
+    def record_operations(self, num_operations: int):
+        self._operations += num_operations
+
+    def update(self, slots_per_second: float):
+        """Folds the operations recorded since the last sample into the
+        utilization, at most once per sample_interval"""
+        now = timer()
+        elapsed = now - self._sampled
+        if elapsed < self.sample_interval or slots_per_second <= 0:
+            return
+        sample = self._operations / elapsed / slots_per_second
+        weight = 1 - math.exp(-elapsed / self.time_constant)
+        self.utilization += weight * (sample - self.utilization)
+        self._operations = 0
+        self._sampled = now
+
+    def period_for(self, ceiling: float) -> float:
+        """The window to use, between floor and ceiling"""
+        floor = min(self.floor, ceiling)
+        load = (self.utilization - self.low_utilization) / (
+            self.high_utilization - self.low_utilization
+        )
+        self.period = floor + min(max(load, 0.0), 1.0) * (ceiling - floor)
+        return self.period
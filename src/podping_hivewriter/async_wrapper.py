@@ -9,8 +9,9 @@ thread_pool = ThreadPoolExecutor()
 
 
 # Async generator wrapper from https://github.com/django/asgiref/issues/142
-def sync_to_async(sync_fn, thread_sensitive=True):
-    executor = thread_pool if not thread_sensitive else None
+def sync_to_async(sync_fn, thread_sensitive=True, executor=None):
+    if executor is None and not thread_sensitive:
+        executor = thread_pool
     is_gen = inspect.isgeneratorfunction(sync_fn)
     async_fn = _sync_to_async(
         sync_fn, thread_sensitive=thread_sensitive, executor=executor
@@ -0,0 +1,64 @@
+import asyncio
+import logging
+from typing import Callable, Optional
+
+
+class Backpressure:
+    """Throttles producers while too many IRIs are waiting to be written.
+
+    Throttling starts once the backlog reaches high_watermark and only stops
+    when it's back down to low_watermark, so producers aren't flipped between
+    throttled and not on every IRI.  The changed event is set whenever it starts
+    or stops, so producers can be told.
+    """
+
+    def __init__(
+        self,
+        backlog: Callable[[], int],
+        high_watermark: int,
+        low_watermark: Optional[int] = None,
+    ):
+        if high_watermark < 1:
+            raise ValueError("high_watermark must be at least 1")
+        if low_watermark is None:
+            low_watermark = high_watermark // 2
+        if not 0 <= low_watermark < high_watermark:
+            raise ValueError("low_watermark must be below high_watermark")
+
+        self.backlog = backlog
+        self.high_watermark = high_watermark
+        self.low_watermark = low_watermark
+        self.throttled = False
+        self._released = asyncio.Event()
+        self._released.set()
+        self.changed = asyncio.Event()
+
+        self.num_throttles = 0
+
+    def update(self) -> bool:
+        """Checks the backlog against the watermarks, returns True while
+        throttled"""
+        backlog = self.backlog()
+        if self.throttled:
+            if backlog <= self.low_watermark:
+                self.throttled = False
+                self._released.set()
+                self.changed.set()
+                logging.info(
+                    f"Backlog down to {backlog} IRIs, no longer throttling producers"
+                )
+        elif backlog >= self.high_watermark:
+            self.throttled = True
+            self._released.clear()
+            self.changed.set()
+            self.num_throttles += 1
+            logging.warning(
+                f"Backlog of {backlog} IRIs, throttling producers until it's down "
+                f"to {self.low_watermark}"
+            )
+        return self.throttled
+
+    async def wait(self):
+        """Returns once producers aren't throttled"""
+        while self.update():
+            await self._released.wait()
@@ -0,0 +1,54 @@
+from collections import deque
+from itertools import repeat
+from timeit import default_timer as timer
+from typing import Callable, Deque
+
+from podping_hivewriter.constants import (
+    HIVE_BLOCK_INTERVAL,
+    HIVE_CUSTOM_JSON_OPS_PER_BLOCK,
+)
+
+
+class BlockSlotLimiter:
+    """Counts the custom_json operations an account sent within the last block
+    interval so several transactions in flight never exceed the per block limit.
+
+    By default the interval is a sliding window of local time.  Pass a clock that
+    only moves on block boundaries (HiveBlockClock.block_time) to count the
+    operations per actual block instead.
+    """
+
+    def __init__(
+        self,
+        slots: int = HIVE_CUSTOM_JSON_OPS_PER_BLOCK,
+        interval: float = HIVE_BLOCK_INTERVAL,
+        clock: Callable[[], float] = timer,
+    ):
+        self.slots = slots
+        self.interval = interval
+        self.clock = clock
+        # Send time of every operation still inside the interval, oldest first
+        self._sent: Deque[float] = deque()
+
+    def _evict_expired(self, now: float):
+        sent = self._sent
+        while sent and sent[0] <= now - self.interval:
+            sent.popleft()
+
+    def available(self) -> int:
+        """Operations that can be sent right now"""
+        self._evict_expired(self.clock())
+        return max(self.slots - len(self._sent), 0)
+
+    def reserve(self, num_operations: int):
+        now = self.clock()
+        self._evict_expired(now)
+        self._sent.extend(repeat(now, num_operations))
+
+    def next_slot_in(self) -> float:
+        """Seconds until at least one operation can be sent"""
+        now = self.clock()
+        self._evict_expired(now)
+        if len(self._sent) < self.slots:
+            return 0.0
+        return self._sent[-self.slots] + self.interval - now
@@ -0,0 +1,88 @@
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+from timeit import default_timer as timer
+from typing import Optional, Union
+
+from podping_hivewriter.async_wrapper import sync_to_async
+
+
+class ChainReaderCheckpoint:
+    """Where a chain reader got to, kept in a small JSON file so a restarted
+    reader carries on from there instead of rescanning or skipping blocks.
+
+    The position is the next transaction to deliver: the block number and the
+    index of the transaction within that block.  It only moves past a
+    transaction once the consumer comes back for the next one, and it's saved
+    at most every save_interval seconds, so after a crash some transactions
+    may be delivered again but none are missed.
+    """
+
+    def __init__(self, path: Union[str, Path], save_interval: float = 5):
+        self.path = Path(path)
+        self.save_interval = save_interval
+
+        self.block_num: Optional[int] = None
+        self.tx_num = 0
+
+        self.num_saves = 0
+
+        self._dirty = False
+        self._last_save = timer()
+
+        self._async_write = sync_to_async(self._write, thread_sensitive=False)
+
+    def load(self) -> bool:
+        """Read the saved position, returns whether there was one"""
+        try:
+            state = json.loads(self.path.read_text())
+            self.block_num = int(state["block_num"])
+            self.tx_num = int(state["tx_num"])
+        except FileNotFoundError:
+            return False
+        except (ValueError, KeyError, TypeError) as e:
+            logging.warning(f"Ignoring unreadable checkpoint {self.path}: {e}")
+            return False
+        return True
+
+    def advance(self, block_num: int, tx_num: int = 0):
+        self.block_num = block_num
+        self.tx_num = tx_num
+        self._dirty = True
+
+    def _write(self, state: dict):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Write next to the checkpoint and swap it in, so a crash mid-write
+        # leaves the previous checkpoint intact
+        fd, temp_path = tempfile.mkstemp(
+            prefix=f".{self.path.name}.", dir=self.path.parent
+        )
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(state, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        # Make the rename durable too
+        directory_fd = os.open(self.path.parent, os.O_RDONLY)
+        try:
+            os.fsync(directory_fd)
+        finally:
+            os.close(directory_fd)
+
+    async def save(self, force: bool = False):
+        """Write the position if it moved and save_interval passed, or right
+        away with force"""
+        if not self._dirty or self.block_num is None:
+            return
+        if not force and timer() - self._last_save < self.save_interval:
+            return
+        self._dirty = False
+        self._last_save = timer()
+        await self._async_write({"block_num": self.block_num, "tx_num": self.tx_num})
+        self.num_saves += 1
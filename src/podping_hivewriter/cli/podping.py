@@ -1,9 +1,8 @@
 import asyncio
 import logging
 import sys
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
-import rfc3987
 import typer
 from lighthive.broadcast.base58 import Base58
 from lighthive.client import Client
@@ -22,6 +21,7 @@ from podping_hivewriter.constants import (
     EXIT_CODE_INVALID_POSTING_KEY,
 )
 from podping_hivewriter.hive import get_client
+from podping_hivewriter.iri_validator import is_valid_iri
 from podping_hivewriter.models.medium import medium_strings, str_medium_map
 from podping_hivewriter.models.reason import reason_strings, str_reason_map
 from podping_hivewriter.podping_hivewriter import PodpingHivewriter
@@ -55,7 +55,7 @@ def reason_callback(reason: str) -> str:
 
 def iris_callback(iris: List[str]) -> List[str]:
     for iri in iris:
-        if not rfc3987.match(iri, "IRI"):
+        if not is_valid_iri(iri):
             raise typer.BadParameter(
                 """IRI is not valid. Must match rfc3987.
             Example: https://www.example.com/feed.xml
@@ -65,6 +65,17 @@ def iris_callback(iris: List[str]) -> List[str]:
     return iris
 
 
+def additional_accounts_callback(additional_accounts: Optional[str]) -> Optional[str]:
+    for account_key in (additional_accounts or "").replace(",", " ").split():
+        account, _, posting_key = account_key.partition(":")
+        if not account or not posting_key:
+            raise typer.BadParameter(
+                "Additional accounts must be given as account:posting_key pairs "
+                "separated by commas"
+            )
+    return additional_accounts
+
+
 def version_callback(value: bool):
     if value:
         typer.echo(__version__)
@@ -77,6 +88,7 @@ app = typer.Typer()
 class Config:
     hive_account: str
     hive_posting_key: str
+    additional_accounts: List[Tuple[str, str]]
     medium: PodpingMedium
     reason: PodpingReason
     sanity_check: bool
@@ -85,6 +97,17 @@ class Config:
     status: bool
     ignore_config_updates: bool
     hive_operation_period: bool
+    dedup_window: int
+    journal_dir: Optional[str]
+    max_broadcasts_in_flight: int
+    block_aligned: bool
+    probe_nodes: bool
+    hedge_broadcasts: bool
+    native_rpc: bool
+    cache_signing: bool
+    backlog_high_watermark: int
+    backlog_low_watermark: Optional[int]
+    adaptive_operation_period: bool
     i_know_what_im_doing: bool
     debug: bool
     testnet: bool
@@ -260,6 +283,18 @@ def server(
         zmq_service=True,
         status=Config.status,
         client=Config.lighthive_client,
+        dedup_window=Config.dedup_window,
+        journal_path=Config.journal_dir,
+        max_broadcasts_in_flight=Config.max_broadcasts_in_flight,
+        additional_accounts=Config.additional_accounts,
+        block_aligned=Config.block_aligned,
+        probe_nodes=Config.probe_nodes,
+        hedge_broadcasts=Config.hedge_broadcasts,
+        native_rpc=Config.native_rpc,
+        cache_signing=Config.cache_signing,
+        backlog_high_watermark=Config.backlog_high_watermark,
+        backlog_low_watermark=Config.backlog_low_watermark,
+        adaptive_operation_period=Config.adaptive_operation_period,
     )
 
     try:
@@ -306,6 +341,14 @@ def callback(
         confirmation_prompt=True,
         hide_input=True,
     ),
+    hive_additional_accounts: Optional[str] = typer.Option(
+        None,
+        envvar="PODPING_HIVE_ADDITIONAL_ACCOUNTS",
+        callback=additional_accounts_callback,
+        help="More Hive accounts for the server to post with, as comma separated "
+        "account:posting_key pairs. Each account can only get 5 operations into "
+        "a block, so the server spreads its transactions over all of them.",
+    ),
     sanity_check: Optional[bool] = typer.Option(
         True,
         envvar="PODPING_SANITY_CHECK",
@@ -340,6 +383,83 @@ def callback(
         "speed. If this is set here, the setting will override any settings "
         "sent by a config update.",
     ),
+    dedup_window: Optional[int] = typer.Option(
+        0,
+        envvar="PODPING_DEDUP_WINDOW",
+        help="If set above 0, the server drops IRIs that were already queued with "
+        "the same medium and reason within this many seconds instead of writing "
+        "them to Hive again.",
+    ),
+    journal_dir: Optional[str] = typer.Option(
+        None,
+        envvar="PODPING_JOURNAL_DIR",
+        help="Directory for an on-disk journal of IRIs received by the server but not "
+        "yet written to Hive. IRIs left in the journal are sent again on the next "
+        "startup, so nothing is lost if the server stops unexpectedly.",
+    ),
+    max_broadcasts_in_flight: Optional[int] = typer.Option(
+        3,
+        envvar="PODPING_MAX_BROADCASTS_IN_FLIGHT",
+        help="How many Hive transactions the server may have in flight at once, so "
+        "a slow Hive node doesn't hold up the next transaction. Never more than 5 "
+        "custom_json operations are sent per block regardless.",
+    ),
+    block_aligned: Optional[bool] = typer.Option(
+        False,
+        envvar="PODPING_BLOCK_ALIGNED",
+        help="Time transactions to go out right after each new Hive block, based "
+        "on the head block time, instead of on a fixed period. This gets them into "
+        "the next block sooner. Requires a reasonably accurate system clock.",
+    ),
+    probe_nodes: Optional[bool] = typer.Option(
+        False,
+        envvar="PODPING_PROBE_NODES",
+        help="Probe the Hive nodes in the background for latency and head block lag, "
+        "and send everything to the fastest healthy node instead of rotating "
+        "between all of them.",
+    ),
+    hedge_broadcasts: Optional[bool] = typer.Option(
+        False,
+        envvar="PODPING_HEDGE_BROADCASTS",
+        help="If a Hive node is slower than usual to answer a broadcast, send the "
+        "same signed transaction to a second node and take whichever answers "
+        "first. It can only be included in a block once.",
+    ),
+    native_rpc: Optional[bool] = typer.Option(
+        False,
+        envvar="PODPING_NATIVE_RPC",
+        help="Talk to the Hive nodes over asyncio keep-alive connections instead of "
+        "running blocking lighthive requests in a thread pool. Only signing still "
+        "runs in a thread.",
+    ),
+    cache_signing: Optional[bool] = typer.Option(
+        False,
+        envvar="PODPING_CACHE_SIGNING",
+        help="Sign transactions locally against a recent block refreshed in the "
+        "background, instead of asking the Hive node for one before every "
+        "broadcast.",
+    ),
+    backlog_high_watermark: Optional[int] = typer.Option(
+        10000,
+        envvar="PODPING_BACKLOG_HIGH_WATERMARK",
+        help="How many received IRIs may be waiting to be written to Hive before "
+        "the server throttles its clients. Writes over ZeroMQ are held up until "
+        "the backlog is back down to the low watermark, and clients are sent a "
+        "PodpingBackpressure as JSON when throttling starts and stops.",
+    ),
+    backlog_low_watermark: Optional[int] = typer.Option(
+        None,
+        envvar="PODPING_BACKLOG_LOW_WATERMARK",
+        help="Backlog of IRIs the server has to get down to before it stops "
+        "throttling its clients. Defaults to half the high watermark.",
+    ),
+    adaptive_operation_period: Optional[bool] = typer.Option(
+        False,
+        envvar="PODPING_ADAPTIVE_OPERATION_PERIOD",
+        help="Batch IRIs after as little as a second while the server sends few "
+        "operations, waiting longer as its block slots fill up. The "
+        "hive_operation_period setting is the longest it waits.",
+    ),
     ignore_config_updates: Optional[bool] = typer.Option(
         False,
         envvar="PODPING_IGNORE_CONFIG_UPDATES",
@@ -364,6 +484,10 @@ def callback(
 ):
     Config.hive_account = hive_account
     Config.hive_posting_key = hive_posting_key
+    Config.additional_accounts = [
+        tuple(account_key.partition(":")[::2])
+        for account_key in (hive_additional_accounts or "").replace(",", " ").split()
+    ]
     Config.medium = str_medium_map[medium]
     Config.reason = str_reason_map[reason]
     Config.sanity_check = sanity_check
@@ -372,6 +496,17 @@ def callback(
     Config.status = status
     Config.ignore_config_updates = ignore_config_updates
     Config.hive_operation_period = hive_operation_period
+    Config.dedup_window = dedup_window
+    Config.journal_dir = journal_dir
+    Config.max_broadcasts_in_flight = max_broadcasts_in_flight
+    Config.block_aligned = block_aligned
+    Config.probe_nodes = probe_nodes
+    Config.hedge_broadcasts = hedge_broadcasts
+    Config.native_rpc = native_rpc
+    Config.cache_signing = cache_signing
+    Config.backlog_high_watermark = backlog_high_watermark
+    Config.backlog_low_watermark = backlog_low_watermark
+    Config.adaptive_operation_period = adaptive_operation_period
     Config.i_know_what_im_doing = i_know_what_im_doing
     Config.debug = debug
 
@@ -410,6 +545,24 @@ def callback(
         logging.error("Exiting")
         sys.exit(EXIT_CODE_INVALID_POSTING_KEY)
 
+    for additional_account, additional_posting_key in Config.additional_accounts:
+        if not client.get_accounts([additional_account]):
+            logging.error(
+                f"Hive account @{additional_account} does not exist, "
+                f"check ENV vars and try again"
+            )
+            logging.error("Exiting")
+            sys.exit(EXIT_CODE_INVALID_ACCOUNT)
+
+        if not is_base58(additional_posting_key):
+            logging.error("Startup of Podping status: FAILED!")
+            logging.error(
+                f"Posting Key for @{additional_account} not valid Base58 "
+                f"- check ENV vars and try again",
+            )
+            logging.error("Exiting")
+            sys.exit(EXIT_CODE_INVALID_POSTING_KEY)
+
 
 if __name__ == "__main__":
     app()
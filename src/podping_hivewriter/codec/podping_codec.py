@@ -1,4 +1,10 @@
+from typing import Type
+
 from plexo.codec.capnpy_codec import CapnpyCodec
+from plexo.typing import EncodedSignal
+from pydantic import BaseModel
+
+from podping_hivewriter.models.podping_backpressure import PodpingBackpressure
 
 from podping_schemas.org.podcastindex.podping.hivewriter.podping_hive_transaction import (
     PodpingHiveTransaction,
@@ -13,3 +19,25 @@ from podping_schemas.org.podcastindex.podping.podping_write_error import (
 podping_hive_transaction_codec = CapnpyCodec(PodpingHiveTransaction)
 podping_write_codec = CapnpyCodec(PodpingWrite)
 podping_write_error_codec = CapnpyCodec(PodpingWriteError)
+
+
+class PydanticJsonCodec:
+    """Codec for the writer's own pydantic models, sent as JSON"""
+
+    _name = "json"
+
+    def __init__(self, model: Type[BaseModel]):
+        self.model = model
+
+    def encode(self, data: BaseModel) -> EncodedSignal:
+        return data.json().encode("UTF-8")
+
+    def decode(self, data: EncodedSignal) -> BaseModel:
+        return self.model.parse_raw(data)
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+
+podping_backpressure_codec = PydanticJsonCodec(PodpingBackpressure)
@@ -1,6 +1,11 @@
 LIVETEST_OPERATION_ID = "pplt"
 PODPING_OPERATION_ID = "pp"
 STARTUP_OPERATION_ID = "_startup"
+# custom_json ids podpings are written under, e.g. pp_podcast_update
+PODPING_OPERATION_ID_PREFIXES = (
+    f"{PODPING_OPERATION_ID}_",
+    f"{LIVETEST_OPERATION_ID}_",
+)
 
 EXIT_CODE_UNKNOWN = 10
 EXIT_CODE_INVALID_POSTING_KEY = 20
@@ -13,3 +18,8 @@ PODPING_SETTINGS_KEY = "podping-settings"
 
 # Operation JSON must be less than or equal to 8192 bytes.
 HIVE_CUSTOM_OP_DATA_MAX_LENGTH = 8192
+
+# Seconds between Hive blocks
+HIVE_BLOCK_INTERVAL = 3
+# Custom json operations a single account can get into one block
+HIVE_CUSTOM_JSON_OPS_PER_BLOCK = 5
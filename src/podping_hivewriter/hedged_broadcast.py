@@ -0,0 +1,195 @@
+import asyncio
+import json
+import logging
+import urllib.request
+from collections import deque
+from timeit import default_timer as timer
+from typing import Callable, Deque, List, Optional
+
+from lighthive.client import Client
+from lighthive.datastructures import Operation
+from lighthive.exceptions import RPCNodeException
+
+from podping_hivewriter.async_wrapper import sync_to_async
+from podping_hivewriter.hive_rpc import HiveRPC
+from podping_hivewriter.hive_signing import HiveSigningContext, sign_transaction
+
+
+class HedgedBroadcaster:
+    """Signs a transaction once and sends it to the current node, then sends the
+    very same transaction to a second node if the first one hasn't answered
+    within the hedge_percentile of recent broadcast times.
+
+    Whichever node answers first wins.  Both carry the same transaction id, so
+    it can only ever be included once.
+    """
+
+    def __init__(
+        self,
+        client: Client,
+        ranked_nodes: Optional[Callable[[], List[str]]] = None,
+        hedge_percentile: float = 95,
+        min_hedge_delay: float = 0.5,
+        initial_hedge_delay: float = 5,
+        min_samples: int = 20,
+        max_samples: int = 200,
+        timeout: float = 30,
+        rpc: Optional[HiveRPC] = None,
+        signing_context: Optional[HiveSigningContext] = None,
+    ):
+        self.client = client
+        # Talk to the nodes straight from the event loop when given
+        self.rpc = rpc
+        # Reuse a cached reference block instead of fetching one every time
+        self.signing_context = signing_context
+        # Healthy nodes, best first, e.g. HiveNodePool.ranked_nodes
+        self.ranked_nodes = ranked_nodes
+        self.hedge_percentile = hedge_percentile
+        self.min_hedge_delay = min_hedge_delay
+        self.initial_hedge_delay = initial_hedge_delay
+        self.min_samples = min_samples
+        self.timeout = timeout
+
+        self.latencies: Deque[float] = deque(maxlen=max_samples)
+        self.num_broadcasts = 0
+        self.num_hedged = 0
+        self.num_hedge_wins = 0
+
+        self._async_sign = sync_to_async(self.sign, thread_sensitive=False)
+        if rpc is not None:
+            self._async_rpc_broadcast = self._hive_rpc_broadcast
+        else:
+            self._async_rpc_broadcast = sync_to_async(
+                self._rpc_broadcast, thread_sensitive=False
+            )
+            self._async_client_get_dynamic_global_properties = sync_to_async(
+                client.get_dynamic_global_properties, thread_sensitive=False
+            )
+
+    def hedge_delay(self) -> float:
+        """Seconds to wait on the first node before asking a second one"""
+        if len(self.latencies) < self.min_samples:
+            return self.initial_hedge_delay
+        latencies = sorted(self.latencies)
+        index = min(
+            len(latencies) - 1, int(len(latencies) * self.hedge_percentile / 100)
+        )
+        return max(self.min_hedge_delay, latencies[index])
+
+    def sign(
+        self, operations: List[Operation], dynamic_global_properties: dict
+    ) -> dict:
+        return sign_transaction(
+            operations, dynamic_global_properties, self.client.keys, self.client.chain
+        )
+
+    def _rpc_broadcast(self, node: str, signed_transaction: dict) -> dict:
+        request = urllib.request.Request(  # nosec
+            node,
+            data=json.dumps(
+                {
+                    "jsonrpc": "2.0",
+                    "method": "condenser_api.broadcast_transaction_synchronous",
+                    "params": [signed_transaction],
+                    "id": 1,
+                }
+            ).encode("UTF-8"),
+            headers={"Content-Type": "application/json"},
+        )
+        try:
+            with urllib.request.urlopen(  # nosec
+                request, timeout=self.timeout
+            ) as response:
+                body = json.loads(response.read())
+        except (OSError, ValueError) as e:
+            # No well-formed Hive error, so the node gets skipped on retry
+            raise RPCNodeException(f"{node}: {e}", code=None, raw_body={})
+
+        if "error" in body:
+            raise RPCNodeException(
+                body["error"].get("message"),
+                code=body["error"].get("code"),
+                raw_body=body,
+            )
+        return body["result"]
+
+    async def _hive_rpc_broadcast(self, node: str, signed_transaction: dict) -> dict:
+        """HiveRPC's broadcast, with the arguments in _rpc_broadcast's order"""
+        return await self.rpc.broadcast_transaction_synchronous(
+            signed_transaction, node
+        )
+
+    async def _get_dynamic_global_properties(self) -> dict:
+        if self.signing_context is not None:
+            return await self.signing_context.dynamic_global_properties()
+        if self.rpc is not None:
+            return await self.rpc.get_dynamic_global_properties(
+                self.client.current_node
+            )
+        return await self._async_client_get_dynamic_global_properties()
+
+    def _hedge_nodes(self) -> List[str]:
+        """The current node first, then the node to hedge with"""
+        current_node = self.client.current_node
+        if self.ranked_nodes is not None:
+            nodes = self.ranked_nodes()
+        else:
+            nodes = [
+                node
+                for node in self.client.nodes
+                if not self.client.circuit_breaker_cache.get(node)
+            ]
+        return [current_node] + [node for node in nodes if node != current_node][:1]
+
+    async def broadcast(self, op: List[Operation], dry_run: bool = False) -> dict:
+        """Drop in replacement for an async Client.broadcast_sync"""
+        dynamic_global_properties = await self._get_dynamic_global_properties()
+        signed_transaction = await self._async_sign(op, dynamic_global_properties)
+        if dry_run:
+            return signed_transaction
+
+        nodes = self._hedge_nodes()
+        self.num_broadcasts += 1
+        start = timer()
+
+        primary = asyncio.ensure_future(
+            self._async_rpc_broadcast(nodes[0], signed_transaction)
+        )
+        pending = {primary}
+        try:
+            done, _ = await asyncio.wait(pending, timeout=self.hedge_delay())
+
+            if not done and len(nodes) > 1:
+                self.num_hedged += 1
+                logging.info(
+                    f"No answer from {nodes[0]} after {timer() - start:.2f}s, "
+                    f"also broadcasting to {nodes[1]}"
+                )
+                pending.add(
+                    asyncio.ensure_future(
+                        self._async_rpc_broadcast(nodes[1], signed_transaction)
+                    )
+                )
+
+            # The first answer wins, an error only counts once every node failed
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        self.latencies.append(timer() - start)
+                        if task is not primary:
+                            self.num_hedge_wins += 1
+                        return task.result()
+                    error = task.exception()
+
+            self.latencies.append(timer() - start)
+            raise error
+        finally:
+            # The losers, or everything if the caller was cancelled.  Not
+            # waited for, a broadcast in the thread pool only stops once its
+            # request does
+            for task in pending:
+                task.cancel()
@@ -3,9 +3,10 @@ import itertools
 import json
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
 from random import shuffle
 from timeit import default_timer as timer
-from typing import List, Optional, Set
+from typing import Dict, List, Optional, Set, Tuple
 
 import backoff
 from lighthive.client import Client
@@ -16,6 +17,12 @@ from podping_schemas.org.podcastindex.podping.hivewriter.podping_hive_transactio
 from podping_schemas.org.podcastindex.podping.podping import Podping
 
 from podping_hivewriter.async_wrapper import sync_to_async
+from podping_hivewriter.chain_reader_checkpoint import ChainReaderCheckpoint
+from podping_hivewriter.constants import (
+    HIVE_BLOCK_INTERVAL,
+    PODPING_OPERATION_ID_PREFIXES,
+)
+from podping_hivewriter.hive_rpc import HiveRPC
 from podping_hivewriter.models.internal_podping import CURRENT_PODPING_VERSION
 from podping_hivewriter.models.medium import str_medium_map
 from podping_hivewriter.models.reason import str_reason_map
@@ -93,79 +100,182 @@ def get_allowed_accounts(
             client.next_node()
 
 
+def _podping_transactions_from_block(
+    block: dict, block_num: int, operation_id: Optional[str] = None
+) -> List[Tuple[int, PodpingHiveTransaction]]:
+    """Every transaction in the block with current version podpings in it, along
+    with its index in the block"""
+    transactions = []
+    for tx_num, transaction in enumerate(block["transactions"]):
+        podpings = []
+        for op in transaction["operations"]:
+            if op["type"] != "custom_json_operation":
+                continue
+            value = op["value"]
+            if operation_id:
+                if value["id"] != operation_id:
+                    continue
+            elif not value["id"].startswith(PODPING_OPERATION_ID_PREFIXES):
+                continue
+            # Most custom_json isn't a podping, don't parse what can't be one
+            json_str = value["json"]
+            if '"iris"' not in json_str or '"version"' not in json_str:
+                continue
+            data = json.loads(json_str)
+            if (
+                "iris" in data
+                and "version" in data
+                and data["version"] == CURRENT_PODPING_VERSION
+            ):
+                podpings.append(
+                    Podping(
+                        medium=str_medium_map[data["medium"]],
+                        reason=str_reason_map[data["reason"]],
+                        iris=data["iris"],
+                        timestampNs=data["timestampNs"],
+                        sessionId=data["sessionId"],
+                    )
+                )
+        if len(podpings):
+            transactions.append(
+                (
+                    tx_num,
+                    PodpingHiveTransaction(
+                        podpings=podpings,
+                        hiveTxId=block["transaction_ids"][tx_num],
+                        hiveBlockNum=block_num,
+                    ),
+                )
+            )
+    return transactions
+
+
 async def get_relevant_transactions_from_blockchain(
-    condenser_api_client: Client, start_block: int, operation_id: str = None
+    condenser_api_client: Client,
+    start_block: int,
+    operation_id: str = None,
+    window: int = 20,
+    rpc: Optional[HiveRPC] = None,
+    checkpoint: Optional[ChainReaderCheckpoint] = None,
 ):
+    """Yields the podping transactions from start_block on, in block order.
+
+    While catching up, up to window blocks are fetched at the same time.  The
+    head block is polled separately once per block interval.
+
+    With a checkpoint, reading resumes from its saved position instead of
+    start_block, and the position is saved as transactions are consumed.
+    """
+    block_fetch_pool: Optional[ThreadPoolExecutor] = None
+    if rpc is not None:
+        # Both fail over to the next node when the current one is down
+        async_get_dynamic_global_properties = rpc.get_dynamic_global_properties
+        async_get_block = rpc.get_block
+    else:
+        block_client = get_client(automatic_node_selection=False, api_type="block_api")
+        # Threads of its own, so catching up can't tie up the shared thread pool
+        # that broadcasts and journal writes run in
+        block_fetch_pool = ThreadPoolExecutor(
+            max_workers=window, thread_name_prefix="get_block"
+        )
+        async_get_block_params = sync_to_async(
+            block_client.get_block, thread_sensitive=False, executor=block_fetch_pool
+        )
+
+        async def async_get_block(block_num: int) -> dict:
+            return await async_get_block_params({"block_num": block_num})
+
+        async_get_dynamic_global_properties = sync_to_async(
+            condenser_api_client.get_dynamic_global_properties, thread_sensitive=False
+        )
+
     current_block = start_block
+    # Transactions before this index in current_block were already delivered
+    resume_tx_num = 0
+    if checkpoint is not None and checkpoint.load():
+        current_block = checkpoint.block_num
+        resume_tx_num = checkpoint.tx_num
+        logging.info(
+            f"Resuming from block {current_block}, transaction {resume_tx_num}"
+        )
     if not current_block:
-        current_block = condenser_api_client.get_dynamic_global_properties()[
+        current_block = (await async_get_dynamic_global_properties())[
             "head_block_number"
         ]
-    block_client = get_client(automatic_node_selection=False, api_type="block_api")
-    async_get_block = sync_to_async(block_client.get_block, thread_sensitive=False)
-    async_get_dynamic_global_properties = sync_to_async(
-        condenser_api_client.get_dynamic_global_properties, thread_sensitive=False
-    )
-    while True:
-        start_time = timer()
-        try:
-            head_block = (await async_get_dynamic_global_properties())[
-                "head_block_number"
-            ]
-            while (head_block - current_block) > 0:
-                try:
-                    while True:
-                        try:
-                            block = await async_get_block({"block_num": current_block})
-                            for tx_num, transaction in enumerate(
-                                block["block"]["transactions"]
-                            ):
-                                tx_id = block["block"]["transaction_ids"][tx_num]
-                                podpings = []
-                                for op in transaction["operations"]:
-                                    if op["type"] == "custom_json_operation" and (
-                                        not operation_id
-                                        or op["value"]["id"] == operation_id
-                                    ):
-                                        data = json.loads(op["value"]["json"])
-                                        if (
-                                            "iris" in data
-                                            and "version" in data
-                                            and data["version"]
-                                            == CURRENT_PODPING_VERSION
-                                        ):
-                                            podpings.append(
-                                                Podping(
-                                                    medium=str_medium_map[
-                                                        data["medium"]
-                                                    ],
-                                                    reason=str_reason_map[
-                                                        data["reason"]
-                                                    ],
-                                                    iris=data["iris"],
-                                                    timestampNs=data["timestampNs"],
-                                                    sessionId=data["sessionId"],
-                                                )
-                                            )
-                                if len(podpings):
-                                    yield PodpingHiveTransaction(
-                                        podpings=podpings,
-                                        hiveTxId=tx_id,
-                                        hiveBlockNum=current_block,
-                                    )
-                            break
-                        except KeyError as e:
-                            pass
-                    current_block += 1
-                    head_block = (await async_get_dynamic_global_properties())[
-                        "head_block_number"
-                    ]
-                except RPCNodeException as e:
-                    logging.warning(f"Hive API error {e}")
-
-            end_time = timer()
-            sleep_time = 3 - (end_time - start_time)
-            if sleep_time > 0 and (head_block - current_block) <= 0:
-                await asyncio.sleep(sleep_time)
-        except RPCNodeException as e:
-            logging.warning(f"Hive API error {e}")
+
+    head_block = 0
+    head_block_advanced = asyncio.Event()
+
+    async def poll_head_block():
+        nonlocal head_block
+        while True:
+            start_time = timer()
+            try:
+                new_head_block = (await async_get_dynamic_global_properties())[
+                    "head_block_number"
+                ]
+                if new_head_block > head_block:
+                    head_block = new_head_block
+                    head_block_advanced.set()
+            except RPCNodeException as e:
+                logging.warning(f"Hive API error {e}")
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # Nothing else moves the reader forward, so never give up polling
+                logging.exception("Unknown error polling the head block")
+            await asyncio.sleep(max(0.0, HIVE_BLOCK_INTERVAL - (timer() - start_time)))
+
+    async def fetch_block(block_num: int) -> List[Tuple[int, PodpingHiveTransaction]]:
+        while True:
+            try:
+                block = await async_get_block(block_num)
+                return _podping_transactions_from_block(
+                    block["block"], block_num, operation_id
+                )
+            except KeyError:
+                # The node doesn't have the block yet
+                await asyncio.sleep(0.5)
+            except RPCNodeException as e:
+                logging.warning(f"Hive API error {e}")
+                await asyncio.sleep(0.5)
+
+    # Blocks being fetched, always current_block and the ones right after it
+    fetches: Dict[int, asyncio.Future] = {}
+    head_block_poller = asyncio.ensure_future(poll_head_block())
+    try:
+        while True:
+            next_block = current_block + len(fetches)
+            while next_block < min(head_block, current_block + window):
+                fetches[next_block] = asyncio.ensure_future(fetch_block(next_block))
+                next_block += 1
+
+            if current_block not in fetches:
+                head_block_advanced.clear()
+                await head_block_advanced.wait()
+                continue
+
+            for tx_num, transaction in await fetches.pop(current_block):
+                if tx_num < resume_tx_num:
+                    continue
+                yield transaction
+                # Back for more, so the consumer is done with this one
+                if checkpoint is not None:
+                    checkpoint.advance(current_block, tx_num + 1)
+                    await checkpoint.save()
+            current_block += 1
+            resume_tx_num = 0
+            if checkpoint is not None:
+                checkpoint.advance(current_block)
+                await checkpoint.save()
+    finally:
+        head_block_poller.cancel()
+        for fetch in fetches.values():
+            fetch.cancel()
+        await asyncio.gather(
+            head_block_poller, *fetches.values(), return_exceptions=True
+        )
+        if block_fetch_pool is not None:
+            block_fetch_pool.shutdown(wait=False)
+        if checkpoint is not None:
+            await checkpoint.save(force=True)
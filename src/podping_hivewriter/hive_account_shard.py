@@ -0,0 +1,64 @@
+import asyncio
+from timeit import default_timer as timer
+from typing import Any, Optional, Set
+
+from lighthive.client import Client
+
+from podping_hivewriter.async_wrapper import sync_to_async
+from podping_hivewriter.block_slots import BlockSlotLimiter
+
+
+class HiveAccountShard:
+    """One of the Hive accounts a writer broadcasts with.  Each account has its
+    own custom_json per block quota and its own resource credits, so each one
+    keeps track of its own block slots and RC back off."""
+
+    def __init__(
+        self,
+        account: str,
+        client: Client,
+        block_slots: Optional[BlockSlotLimiter] = None,
+        broadcaster: Optional[Any] = None,
+    ):
+        self.account = account
+        self.client = client
+        self.required_posting_auths = [account]
+        self.block_slots = (
+            block_slots if block_slots is not None else BlockSlotLimiter()
+        )
+        # Broadcasts of this account that haven't returned yet
+        self.in_flight: Set[asyncio.Task] = set()
+        # Set when the account ran out of resource credits
+        self.rc_paused_until = float("-inf")
+        self.total_operations_sent = 0
+
+        # Anything with an async broadcast(op, dry_run) in place of the client's
+        # broadcast_sync, e.g. HedgedBroadcaster or HiveRPCBroadcaster
+        self.broadcaster = broadcaster
+        if broadcaster is not None:
+            self.async_broadcast = broadcaster.broadcast
+        else:
+            self.async_broadcast = sync_to_async(
+                client.broadcast_sync, thread_sensitive=False
+            )
+
+    def __repr__(self):
+        return f"HiveAccountShard(@{self.account})"
+
+    @property
+    def rc_paused(self) -> bool:
+        return timer() < self.rc_paused_until
+
+    def pause_for_rc(self, seconds: float):
+        """Stop using the account until its resource credits had time to recover"""
+        self.rc_paused_until = max(self.rc_paused_until, timer() + seconds)
+
+    def available_slots(self) -> int:
+        """Custom json operations the account can send right now"""
+        if self.rc_paused:
+            return 0
+        return self.block_slots.available()
+
+    def next_slot_in(self) -> float:
+        """Seconds until the account can send at least one operation"""
+        return max(self.rc_paused_until - timer(), self.block_slots.next_slot_in())
@@ -0,0 +1,108 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Optional
+
+from lighthive.client import Client
+
+from podping_hivewriter.async_wrapper import sync_to_async
+from podping_hivewriter.constants import HIVE_BLOCK_INTERVAL
+from podping_hivewriter.hive_rpc import HiveRPC
+
+
+def parse_hive_time(hive_time: str) -> float:
+    """Hive timestamps are UTC without a timezone, to the second"""
+    return (
+        datetime.strptime(hive_time, "%Y-%m-%dT%H:%M:%S")
+        .replace(tzinfo=timezone.utc)
+        .timestamp()
+    )
+
+
+class HiveBlockClock:
+    """Follows the head block with get_dynamic_global_properties to know when the
+    next block is due.
+
+    Blocks are produced on a fixed grid of block_interval second slots, so one
+    head block timestamp is enough to place every following block, as long as
+    the local clock is reasonably in sync (NTP) with the witnesses.  Broadcasting
+    broadcast_delay seconds after a block leaves nearly a full interval for the
+    transaction to make it into the next one.
+    """
+
+    def __init__(
+        self,
+        client: Client,
+        block_interval: float = HIVE_BLOCK_INTERVAL,
+        broadcast_delay: float = 0.25,
+        sync_period: float = 60,
+        rpc: Optional[HiveRPC] = None,
+    ):
+        self.block_interval = block_interval
+        self.broadcast_delay = broadcast_delay
+        self.sync_period = sync_period
+
+        self.head_block_num: Optional[int] = None
+        self.head_block_timestamp: Optional[float] = None
+
+        self.client = client
+        self.rpc = rpc
+        self._async_client_get_dynamic_global_properties = sync_to_async(
+            client.get_dynamic_global_properties, thread_sensitive=False
+        )
+
+    @property
+    def synced(self) -> bool:
+        return self.head_block_timestamp is not None
+
+    def update(self, dynamic_global_properties: dict):
+        self.head_block_num = dynamic_global_properties["head_block_number"]
+        self.head_block_timestamp = parse_hive_time(dynamic_global_properties["time"])
+
+    async def sync(self):
+        if self.rpc is not None:
+            dynamic_global_properties = await self.rpc.get_dynamic_global_properties(
+                self.client.current_node
+            )
+        else:
+            dynamic_global_properties = (
+                await self._async_client_get_dynamic_global_properties()
+            )
+        self.update(dynamic_global_properties)
+
+    async def sync_loop(self):
+        while True:
+            try:
+                await self.sync()
+                logging.debug(
+                    f"HiveBlockClock | Head block: {self.head_block_num} | "
+                    f"Next block in: {self.next_block_in():.3f}s"
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.warning(f"Unable to sync the Hive block clock: {e}")
+            await asyncio.sleep(self.sync_period)
+
+    def block_time(self) -> float:
+        """Timestamp of the block that should be the head block right now, falling
+        back to the local time until the clock is synced"""
+        now = time.time()
+        if not self.synced:
+            return now
+        blocks_since = (now - self.head_block_timestamp) // self.block_interval
+        return self.head_block_timestamp + blocks_since * self.block_interval
+
+    def next_block_in(self, not_before: float = 0) -> float:
+        """Seconds until just after the block boundary closest to not_before
+        seconds from now"""
+        if not self.synced:
+            return not_before
+        now = time.time()
+        first_broadcast_time = self.head_block_timestamp + self.broadcast_delay
+        blocks = round((now + not_before - first_broadcast_time) / self.block_interval)
+        broadcast_time = first_broadcast_time + blocks * self.block_interval
+        while broadcast_time <= now:
+            broadcast_time += self.block_interval
+        return broadcast_time - now
@@ -0,0 +1,174 @@
+import asyncio
+import json
+import logging
+import urllib.request
+from timeit import default_timer as timer
+from typing import Dict, Iterable, List, Optional
+
+from lighthive.client import Client
+
+from podping_hivewriter.async_wrapper import sync_to_async
+from podping_hivewriter.hive_rpc import HiveRPC
+
+
+class HiveNodeStats:
+    """What the probes learned about one node"""
+
+    def __init__(self, node: str):
+        self.node = node
+        # Exponentially weighted moving average of the round trip time
+        self.rtt_ewma: Optional[float] = None
+        self.head_block_num: Optional[int] = None
+        self.consecutive_failures = 0
+
+    def __repr__(self):
+        return (
+            f"HiveNodeStats({self.node}, rtt_ewma={self.rtt_ewma}, "
+            f"head_block_num={self.head_block_num}, "
+            f"consecutive_failures={self.consecutive_failures})"
+        )
+
+
+class HiveNodePool:
+    """Probes every node in the background for round trip time and how far its
+    head block lags behind the others, and points the attached lighthive
+    clients at the fastest healthy node.
+
+    A node is healthy when its last probe succeeded and it's no more than
+    max_head_block_lag blocks behind the highest head block seen.
+    """
+
+    def __init__(
+        self,
+        nodes: Iterable[str],
+        probe_period: float = 30,
+        probe_timeout: float = 3,
+        max_head_block_lag: int = 5,
+        ewma_alpha: float = 0.3,
+        rpc: Optional[HiveRPC] = None,
+    ):
+        self.stats: Dict[str, HiveNodeStats] = {
+            node: HiveNodeStats(node) for node in nodes
+        }
+        self.probe_period = probe_period
+        self.probe_timeout = probe_timeout
+        self.max_head_block_lag = max_head_block_lag
+        self.ewma_alpha = ewma_alpha
+
+        self.clients: List[Client] = []
+
+        if rpc is not None:
+            self._async_rpc_head_block_num = self._native_rpc_head_block_num
+        else:
+            self._async_rpc_head_block_num = sync_to_async(
+                self._rpc_head_block_num, thread_sensitive=False
+            )
+        self.rpc = rpc
+
+    def attach(self, client: Client):
+        """Route this client's requests from now on"""
+        # Lighthive would otherwise move to the next node on every request
+        client.load_balance_nodes = False
+        self.clients.append(client)
+        self.route(client)
+
+    def _rpc_head_block_num(self, node: str) -> int:
+        request = urllib.request.Request(  # nosec
+            node,
+            data=json.dumps(
+                {
+                    "jsonrpc": "2.0",
+                    "method": "condenser_api.get_dynamic_global_properties",
+                    "params": [],
+                    "id": 1,
+                }
+            ).encode("UTF-8"),
+            headers={"Content-Type": "application/json"},
+        )
+        with urllib.request.urlopen(  # nosec
+            request, timeout=self.probe_timeout
+        ) as response:
+            return json.loads(response.read())["result"]["head_block_number"]
+
+    async def _native_rpc_head_block_num(self, node: str) -> int:
+        return (await self.rpc.get_dynamic_global_properties(node))["head_block_number"]
+
+    def record_success(self, node: str, rtt: float, head_block_num: int):
+        stats = self.stats[node]
+        if stats.rtt_ewma is None:
+            stats.rtt_ewma = rtt
+        else:
+            stats.rtt_ewma += self.ewma_alpha * (rtt - stats.rtt_ewma)
+        stats.head_block_num = head_block_num
+        stats.consecutive_failures = 0
+
+    def record_failure(self, node: str):
+        if node in self.stats:
+            self.stats[node].consecutive_failures += 1
+
+    async def probe(self, node: str):
+        start = timer()
+        try:
+            head_block_num = await asyncio.wait_for(
+                self._async_rpc_head_block_num(node), timeout=self.probe_timeout
+            )
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logging.debug(f"HiveNodePool | Probe of {node} failed: {e}")
+            self.record_failure(node)
+        else:
+            self.record_success(node, timer() - start, head_block_num)
+
+    async def probe_all(self):
+        await asyncio.gather(*(self.probe(node) for node in self.stats))
+        for client in self.clients:
+            self.route(client)
+
+    async def probe_loop(self):
+        """Probes every probe_period, run probe_all first to start out ranked"""
+        while True:
+            try:
+                await asyncio.sleep(self.probe_period)
+                await self.probe_all()
+                logging.debug(f"HiveNodePool | Ranking: {self.ranked_nodes()}")
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logging.exception("Unknown error in HiveNodePool probe_loop")
+
+    def healthy(self, stats: HiveNodeStats, max_head_block_num: int) -> bool:
+        return (
+            stats.consecutive_failures == 0
+            and stats.rtt_ewma is not None
+            and max_head_block_num - stats.head_block_num <= self.max_head_block_lag
+        )
+
+    def ranked_nodes(self) -> List[str]:
+        """Healthy nodes, fastest first"""
+        head_block_nums = [
+            stats.head_block_num
+            for stats in self.stats.values()
+            if stats.head_block_num is not None
+        ]
+        if not head_block_nums:
+            return []
+        max_head_block_num = max(head_block_nums)
+        healthy_stats = [
+            stats
+            for stats in self.stats.values()
+            if self.healthy(stats, max_head_block_num)
+        ]
+        healthy_stats.sort(key=lambda stats: stats.rtt_ewma)
+        return [stats.node for stats in healthy_stats]
+
+    def best_node(self) -> Optional[str]:
+        ranked_nodes = self.ranked_nodes()
+        return ranked_nodes[0] if ranked_nodes else None
+
+    def route(self, client: Client):
+        """Point the client at the fastest healthy node, if any is known"""
+        best_node = self.best_node()
+        if best_node is not None and client.current_node != best_node:
+            logging.info(f"HiveNodePool | Switching to {best_node}")
+            client.current_node = best_node
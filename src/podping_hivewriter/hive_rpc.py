@@ -0,0 +1,320 @@
+import asyncio
+import itertools
+import json
+import logging
+import ssl
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+from urllib.parse import urlsplit
+
+from lighthive.client import Client
+from lighthive.datastructures import Operation
+from lighthive.exceptions import RPCNodeException
+
+from podping_hivewriter.async_wrapper import sync_to_async
+from podping_hivewriter.hive_signing import HiveSigningContext, sign_transaction
+
+Connection = Tuple[asyncio.StreamReader, asyncio.StreamWriter]
+
+
+class HiveRPC:
+    """Hive JSON-RPC over keep-alive HTTP/1.1 connections run straight on the
+    event loop, with a small connection pool per node.
+
+    Hive nodes don't reliably support HTTP pipelining, so several calls are
+    combined into one request with JSON-RPC batching (see batch) instead.
+    """
+
+    def __init__(
+        self,
+        nodes: Sequence[str],
+        max_connections_per_node: int = 8,
+        connect_timeout: float = 3,
+        read_timeout: float = 30,
+    ):
+        self.nodes = list(nodes)
+        self.current_node = self.nodes[0]
+        self.max_connections_per_node = max_connections_per_node
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+
+        self._idle: Dict[str, List[Connection]] = defaultdict(list)
+        self._connection_slots: Dict[str, asyncio.Semaphore] = {}
+        self._ssl_context = ssl.create_default_context()
+        self._request_ids = itertools.count(1)
+
+        self.num_connections_opened = 0
+
+    def close(self):
+        for connections in self._idle.values():
+            for _, writer in connections:
+                writer.close()
+        self._idle.clear()
+
+    async def _open_connection(self, node: str) -> Connection:
+        url = urlsplit(node)
+        secure = url.scheme == "https"
+        port = url.port or (443 if secure else 80)
+        connection = await asyncio.wait_for(
+            asyncio.open_connection(
+                url.hostname,
+                port,
+                ssl=self._ssl_context if secure else None,
+            ),
+            timeout=self.connect_timeout,
+        )
+        self.num_connections_opened += 1
+        return connection
+
+    @staticmethod
+    async def _read_response(reader: asyncio.StreamReader) -> Tuple[int, bytes, bool]:
+        """Returns the status code, the body and whether the connection can be
+        used again"""
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError("Connection closed by the node")
+        _, status, _ = status_line.decode("latin-1").split(" ", 2)
+
+        headers: Dict[str, str] = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        keep_alive = headers.get("connection", "").lower() != "close"
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int((await reader.readline()).split(b";")[0], 16)
+                if size == 0:
+                    # Skip trailers
+                    while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                        pass
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readexactly(2)
+            body = b"".join(chunks)
+        elif "content-length" in headers:
+            body = await reader.readexactly(int(headers["content-length"]))
+        else:
+            body = await reader.read()
+            keep_alive = False
+
+        return int(status), body, keep_alive
+
+    async def _post(self, node: str, body: bytes) -> Tuple[int, bytes]:
+        url = urlsplit(node)
+        request = (
+            f"POST {url.path or '/'} HTTP/1.1\r\n"
+            f"Host: {url.netloc}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: keep-alive\r\n"
+            f"\r\n"
+        ).encode("latin-1") + body
+
+        if node not in self._connection_slots:
+            self._connection_slots[node] = asyncio.Semaphore(
+                self.max_connections_per_node
+            )
+
+        async with self._connection_slots[node]:
+            idle = self._idle[node]
+            while True:
+                reused = bool(idle)
+                reader, writer = (
+                    idle.pop() if reused else await self._open_connection(node)
+                )
+                try:
+                    writer.write(request)
+                    await writer.drain()
+                    status, response_body, keep_alive = await asyncio.wait_for(
+                        self._read_response(reader), timeout=self.read_timeout
+                    )
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    writer.close()
+                    if reused:
+                        # The node closed an idle keep-alive connection
+                        continue
+                    raise
+                except BaseException:
+                    writer.close()
+                    raise
+
+                if keep_alive:
+                    idle.append((reader, writer))
+                else:
+                    writer.close()
+                return status, response_body
+
+    def next_node(self, failed_node: str) -> str:
+        """Fails over from failed_node to the node after it, unless another
+        call already moved current_node off it"""
+        if self.current_node == failed_node and len(self.nodes) > 1:
+            self.current_node = self.nodes[
+                (self.nodes.index(failed_node) + 1) % len(self.nodes)
+            ]
+            logging.warning(f"Switching from {failed_node} to {self.current_node}")
+        return self.current_node
+
+    async def _rpc(self, payload: Any, node: Optional[str] = None) -> Any:
+        """Calls node, or the current node and fails over from it if it's down"""
+        failover = node is None
+        node = node or self.current_node
+        try:
+            status, body = await self._post(node, json.dumps(payload).encode("UTF-8"))
+            response = json.loads(body)
+        except (OSError, EOFError, ValueError, asyncio.TimeoutError) as e:
+            error = repr(e)
+        else:
+            if status == 200 or isinstance(response, (dict, list)):
+                return response
+            error = f"HTTP {status}"
+        if failover:
+            self.next_node(node)
+        # No well-formed Hive error, so retries know to skip the node
+        raise RPCNodeException(f"{node}: {error}", code=None, raw_body={})
+
+    @staticmethod
+    def _result(response: dict) -> Any:
+        if "error" in response:
+            raise RPCNodeException(
+                response["error"].get("message"),
+                code=response["error"].get("code"),
+                raw_body=response,
+            )
+        if "result" not in response:
+            raise RPCNodeException(
+                "Response without a result", code=None, raw_body=response
+            )
+        return response["result"]
+
+    async def call(self, method: str, params: Any, node: Optional[str] = None) -> Any:
+        response = await self._rpc(
+            {
+                "jsonrpc": "2.0",
+                "method": method,
+                "params": params,
+                "id": next(self._request_ids),
+            },
+            node,
+        )
+        return self._result(response)
+
+    async def batch(
+        self, calls: Sequence[Tuple[str, Any]], node: Optional[str] = None
+    ) -> List[Any]:
+        """Make several calls in a single request, results in the same order"""
+        if not calls:
+            return []
+        request_ids = [next(self._request_ids) for _ in calls]
+        responses = await self._rpc(
+            [
+                {"jsonrpc": "2.0", "method": method, "params": params, "id": request_id}
+                for (method, params), request_id in zip(calls, request_ids)
+            ],
+            node,
+        )
+        if not isinstance(responses, list):
+            # Some nodes answer a whole batch with a single error
+            self._result(responses)
+        responses_by_id = {response.get("id"): response for response in responses}
+        try:
+            return [
+                self._result(responses_by_id[request_id]) for request_id in request_ids
+            ]
+        except KeyError:
+            raise RPCNodeException(
+                "Batch response is missing results", code=None, raw_body={}
+            )
+
+    async def get_dynamic_global_properties(self, node: Optional[str] = None) -> dict:
+        return await self.call("condenser_api.get_dynamic_global_properties", [], node)
+
+    async def get_block(self, block_num: int, node: Optional[str] = None) -> dict:
+        """Same as lighthive's block_api get_block, the block is under "block" """
+        return await self.call("block_api.get_block", {"block_num": block_num}, node)
+
+    async def get_blocks(
+        self, block_nums: Sequence[int], node: Optional[str] = None
+    ) -> List[dict]:
+        return await self.batch(
+            [("block_api.get_block", {"block_num": n}) for n in block_nums], node
+        )
+
+    async def get_accounts(
+        self, account_names: Sequence[str], node: Optional[str] = None
+    ) -> List[dict]:
+        return await self.call(
+            "condenser_api.get_accounts", [list(account_names)], node
+        )
+
+    async def get_following(
+        self, account_name: str, node: Optional[str] = None, page_size: int = 1000
+    ) -> Set[str]:
+        """Every account the account follows, like lighthive's
+        client.account(account_name).following()"""
+        following: Set[str] = set()
+        start = ""
+        while True:
+            page = await self.call(
+                "condenser_api.get_following",
+                [account_name, start, "blog", page_size],
+                node,
+            )
+            following.update(follow["following"] for follow in page)
+            if len(page) < page_size:
+                return following
+            start = page[-1]["following"]
+
+    async def broadcast_transaction_synchronous(
+        self, signed_transaction: dict, node: Optional[str] = None
+    ) -> dict:
+        return await self.call(
+            "condenser_api.broadcast_transaction_synchronous",
+            [signed_transaction],
+            node,
+        )
+
+
+class HiveRPCBroadcaster:
+    """Drop in replacement for an async Client.broadcast_sync that sends through
+    HiveRPC to the client's current node.  Only the signing runs in the thread
+    pool."""
+
+    def __init__(
+        self,
+        client: Client,
+        rpc: HiveRPC,
+        signing_context: Optional[HiveSigningContext] = None,
+    ):
+        self.client = client
+        self.rpc = rpc
+        # Reuse a cached reference block instead of fetching one every time
+        self.signing_context = signing_context
+
+        self._async_sign_transaction = sync_to_async(
+            sign_transaction, thread_sensitive=False
+        )
+
+    async def broadcast(self, op: List[Operation], dry_run: bool = False) -> dict:
+        node = self.client.current_node
+        if self.signing_context is not None:
+            dynamic_global_properties = (
+                await self.signing_context.dynamic_global_properties()
+            )
+        else:
+            dynamic_global_properties = await self.rpc.get_dynamic_global_properties(
+                node
+            )
+        signed_transaction = await self._async_sign_transaction(
+            op, dynamic_global_properties, self.client.keys, self.client.chain
+        )
+        if dry_run:
+            return signed_transaction
+        logging.debug(f"HiveRPCBroadcaster | Broadcasting to {node}")
+        return await self.rpc.broadcast_transaction_synchronous(
+            signed_transaction, node
+        )
@@ -0,0 +1,134 @@
+import asyncio
+import logging
+import struct
+from binascii import unhexlify
+from datetime import datetime, timedelta
+from timeit import default_timer as timer
+from typing import Awaitable, Callable, List, Optional
+
+from lighthive.broadcast.signed_transaction import SignedTransaction
+from lighthive.client import Client
+from lighthive.datastructures import Operation
+
+from podping_hivewriter.async_wrapper import sync_to_async
+
+# Seconds a signed transaction stays valid, same as lighthive uses
+TRANSACTION_EXPIRATION = 60
+
+
+def sign_transaction(
+    operations: List[Operation],
+    dynamic_global_properties: dict,
+    keys: List[str],
+    chain: Optional[dict] = None,
+) -> dict:
+    """Build and sign a transaction referencing the head block, the same way
+    lighthive's broadcast does, and return it ready to be broadcast"""
+    expiration = datetime.strptime(
+        dynamic_global_properties["time"], "%Y-%m-%dT%H:%M:%S"
+    ) + timedelta(seconds=TRANSACTION_EXPIRATION)
+    signed_transaction = SignedTransaction(
+        ref_block_num=dynamic_global_properties["head_block_number"] & 0xFFFF,
+        ref_block_prefix=struct.unpack_from(
+            "<I", unhexlify(dynamic_global_properties["head_block_id"]), 4
+        )[0],
+        expiration=expiration.strftime("%Y-%m-%dT%H:%M:%S"),
+        operations=operations,
+    )
+    signed_transaction.sign(keys, chain=chain)
+    return signed_transaction.json()
+
+
+class HiveSigningContext:
+    """Keeps a recent head block around to reference (TaPoS) in new transactions,
+    refreshed in the background, so signing doesn't need a
+    get_dynamic_global_properties round trip before every broadcast.
+
+    The reference block only has to be one of the last 65536 blocks, and the
+    expiration is based on the cached head block time plus the time since it
+    was fetched, so a reference up to max_age seconds old is as good as a
+    fresh one.
+    """
+
+    def __init__(
+        self,
+        get_dynamic_global_properties: Callable[[], Awaitable[dict]],
+        refresh_period: float = 15,
+        max_age: float = 60,
+    ):
+        self._get_dynamic_global_properties = get_dynamic_global_properties
+        self.refresh_period = refresh_period
+        self.max_age = max_age
+
+        self._dynamic_global_properties: Optional[dict] = None
+        self._fetched_at = float("-inf")
+
+        self.num_refreshes = 0
+        self.num_cache_hits = 0
+
+    @property
+    def age(self) -> float:
+        return timer() - self._fetched_at
+
+    def update(self, dynamic_global_properties: dict):
+        self._dynamic_global_properties = dynamic_global_properties
+        self._fetched_at = timer()
+
+    async def refresh(self):
+        self.update(await self._get_dynamic_global_properties())
+        self.num_refreshes += 1
+
+    async def refresh_loop(self):
+        while True:
+            try:
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.warning(f"Unable to refresh the reference block: {e}")
+            await asyncio.sleep(self.refresh_period)
+
+    async def dynamic_global_properties(self) -> dict:
+        """The cached reference block, with the time moved forward by how long
+        ago it was fetched.  Only goes to a node when the cache is too old."""
+        if self._dynamic_global_properties is None or self.age > self.max_age:
+            await self.refresh()
+        else:
+            self.num_cache_hits += 1
+
+        head_block_time = datetime.strptime(
+            self._dynamic_global_properties["time"], "%Y-%m-%dT%H:%M:%S"
+        ) + timedelta(seconds=int(self.age))
+        return {
+            **self._dynamic_global_properties,
+            "time": head_block_time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+
+
+class LocalSigningBroadcaster:
+    """Drop in replacement for an async Client.broadcast_sync that signs with
+    a HiveSigningContext and sends the signed transaction with the client"""
+
+    def __init__(self, client: Client, signing_context: HiveSigningContext):
+        self.client = client
+        self.signing_context = signing_context
+        # Lighthive only takes WIF strings to sign with, deduplicate them once
+        self.keys = list(dict.fromkeys(client.keys))
+
+        self._async_sign_transaction = sync_to_async(
+            sign_transaction, thread_sensitive=False
+        )
+        self._async_broadcast_transaction_synchronous = sync_to_async(
+            client.broadcast_transaction_synchronous, thread_sensitive=False
+        )
+
+    async def broadcast(self, op: List[Operation], dry_run: bool = False) -> dict:
+        dynamic_global_properties = (
+            await self.signing_context.dynamic_global_properties()
+        )
+        signed_transaction = await self._async_sign_transaction(
+            op, dynamic_global_properties, self.keys, self.client.chain
+        )
+        if dry_run:
+            return signed_transaction
+        return await self._async_broadcast_transaction_synchronous(signed_transaction)
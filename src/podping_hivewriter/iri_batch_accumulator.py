@@ -0,0 +1,139 @@
+import asyncio
+from timeit import default_timer as timer
+from typing import Callable, Collection, Dict, Iterable, List, Optional, Tuple
+
+from podping_schemas.org.podcastindex.podping.podping_medium import (
+    PodpingMedium,
+)
+from podping_schemas.org.podcastindex.podping.podping_reason import (
+    PodpingReason,
+)
+
+from podping_hivewriter.iri_batch_planner import IRIListSizeTracker
+
+BatchKey = Tuple[PodpingMedium, PodpingReason]
+
+
+class PendingIRIList:
+    """IRIs of one medium and reason waiting to be batched, and since when"""
+
+    __slots__ = ("iri_list", "max_list_size", "started", "immediate", "carried_over")
+
+    def __init__(
+        self,
+        max_list_size: int,
+        iris: Iterable[str] = (),
+        immediate: bool = False,
+        started: Optional[float] = None,
+    ):
+        self.iri_list = IRIListSizeTracker(iris)
+        self.max_list_size = max_list_size
+        self.started = timer() if started is None else started
+        # Due as soon as it's started, rather than after a period
+        self.immediate = immediate
+        # Holds IRIs left over from the last batch, which mustn't be left over
+        # again
+        self.carried_over = False
+
+    @property
+    def full(self) -> bool:
+        return self.iri_list.iris_size >= self.max_list_size
+
+
+class IRIBatchAccumulator:
+    """Collects IRIs per medium and reason until their batch is due, either a
+    whole period after the first of them came in or as soon as they fill a
+    custom_json operation.  Batches of the immediate reasons are due right away.
+
+    Adding is synchronous.  The changed event is only set when a new batch
+    starts or one fills up, so whoever flushes the batches can sleep until the
+    next one is due and nothing wakes up while there's nothing to send.
+    """
+
+    def __init__(
+        self,
+        max_list_size: Callable[[PodpingMedium, PodpingReason], int],
+        immediate_reasons: Collection[PodpingReason] = (),
+    ):
+        self.max_list_size = max_list_size
+        self.immediate_reasons = immediate_reasons
+        # Insertion order is the order the batches were started in
+        self._pending: Dict[BatchKey, PendingIRIList] = {}
+        self._num_iris = 0
+        self.changed = asyncio.Event()
+
+    def __len__(self):
+        return self._num_iris
+
+    def add(self, medium: PodpingMedium, reason: PodpingReason, iri: str) -> bool:
+        """Returns False if the IRI was already waiting in its batch"""
+        key = (medium, reason)
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = self._pending[key] = PendingIRIList(
+                self.max_list_size(medium, reason),
+                immediate=reason in self.immediate_reasons,
+            )
+            self.changed.set()
+        if not pending.iri_list.add(iri):
+            return False
+        self._num_iris += 1
+        if pending.full:
+            self.changed.set()
+        return True
+
+    def carry_over(
+        self,
+        medium: PodpingMedium,
+        reason: PodpingReason,
+        iris: Iterable[str],
+        taken: PendingIRIList,
+    ) -> bool:
+        """Start the next batch of a medium and reason with IRIs left over from
+        the batch taken, still due a period after it started.
+
+        Returns False, carrying nothing over, if the batch taken held IRIs left
+        over from the one before, so no IRI is left over more than once."""
+        if taken.carried_over:
+            return False
+        key = (medium, reason)
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = self._pending[key] = PendingIRIList(
+                self.max_list_size(medium, reason),
+                immediate=reason in self.immediate_reasons,
+                started=taken.started,
+            )
+            self.changed.set()
+        else:
+            pending.started = min(pending.started, taken.started)
+        pending.carried_over = True
+        for iri in iris:
+            self.add(medium, reason, iri)
+        return True
+
+    def due(self, period: float, timed_out: bool = True) -> List[BatchKey]:
+        """Batches that are full, immediate or, with timed_out, have waited a
+        whole period"""
+        now = timer()
+        return [
+            key
+            for key, pending in self._pending.items()
+            if pending.full
+            or pending.immediate
+            or (timed_out and now - pending.started >= period)
+        ]
+
+    def next_due_in(self, period: float) -> Optional[float]:
+        """Seconds until the oldest batch has waited a whole period, None if
+        there are none"""
+        if not self._pending:
+            return None
+        # Carried over batches can be older than ones started before them
+        oldest = min(pending.started for pending in self._pending.values())
+        return max(oldest + period - timer(), 0)
+
+    def take(self, medium: PodpingMedium, reason: PodpingReason) -> PendingIRIList:
+        pending = self._pending.pop((medium, reason))
+        self._num_iris -= len(pending.iri_list)
+        return pending
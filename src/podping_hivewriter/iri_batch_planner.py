@@ -0,0 +1,142 @@
+from json.encoder import encode_basestring_ascii
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from podping_schemas.org.podcastindex.podping.podping_medium import (
+    PodpingMedium,
+)
+from podping_schemas.org.podcastindex.podping.podping_reason import (
+    PodpingReason,
+)
+
+from podping_hivewriter.constants import HIVE_CUSTOM_OP_DATA_MAX_LENGTH
+from podping_hivewriter.podping_payload import encode_podping_payload
+
+# timestampNs has 19 digits until the year 2286
+MAX_TIMESTAMP_NS = 10**19 - 1
+
+
+def encoded_iri_size(iri: str) -> int:
+    """Bytes the IRI takes up inside the JSON payload, quotes included"""
+    # Same encoder json.dumps uses with its default ensure_ascii=True
+    return len(encode_basestring_ascii(iri))
+
+
+def iri_list_size(
+    iris: Iterable[str], iri_sizes: Optional[Mapping[str, int]] = None
+) -> int:
+    """Bytes of the serialized JSON list of IRIs, square brackets included"""
+    size_of = iri_sizes.__getitem__ if iri_sizes is not None else encoded_iri_size
+    sizes = [size_of(iri) for iri in iris]
+    return sum(sizes) + max(len(sizes) - 1, 0) + 2
+
+
+class IRIListSizeTracker:
+    """Exact serialized size of a JSON list of unique IRIs, kept up to date as
+    IRIs are added so it never has to be recomputed"""
+
+    def __init__(self, iris: Iterable[str] = ()):
+        # Encoded size of every IRI, reused when the IRIs are packed
+        self.sizes: Dict[str, int] = {}
+        self._encoded_size = 0
+        for iri in iris:
+            self.add(iri)
+
+    def __len__(self):
+        return len(self.sizes)
+
+    def __contains__(self, iri: str):
+        return iri in self.sizes
+
+    def add(self, iri: str) -> bool:
+        """Returns False if the IRI was already in the list"""
+        if iri in self.sizes:
+            return False
+        size = encoded_iri_size(iri)
+        self.sizes[iri] = size
+        self._encoded_size += size
+        return True
+
+    @property
+    def iris_size(self) -> int:
+        """Bytes of the IRIs and the commas between them"""
+        return self._encoded_size + max(len(self.sizes) - 1, 0)
+
+    @property
+    def size(self) -> int:
+        """Bytes of the whole JSON list, square brackets included"""
+        return self.iris_size + 2
+
+
+def podping_envelope_size(
+    medium: PodpingMedium, reason: PodpingReason, session_id: int
+) -> int:
+    """Bytes of a serialized InternalPodping payload with an empty iris list"""
+    return len(
+        encode_podping_payload(
+            str(medium), str(reason), (), MAX_TIMESTAMP_NS, session_id
+        )
+    )
+
+
+def max_iri_list_size(
+    medium: PodpingMedium,
+    reason: PodpingReason,
+    session_id: int,
+    max_url_list_bytes: int,
+) -> int:
+    """Bytes available for the IRIs of a single custom_json operation, excluding
+    the square brackets, given the real envelope around them"""
+    envelope_size = podping_envelope_size(medium, reason, session_id)
+    # max_url_list_bytes counts the square brackets, the envelope already has them
+    return min(HIVE_CUSTOM_OP_DATA_MAX_LENGTH - envelope_size, max_url_list_bytes - 2)
+
+
+def plan_iri_lists(
+    iris: Iterable[str],
+    max_list_size: int,
+    iri_sizes: Optional[Mapping[str, int]] = None,
+) -> Tuple[List[List[str]], List[str]]:
+    """Pack IRIs into as few lists as possible, none of them taking more than
+    max_list_size bytes when serialized without the square brackets.
+
+    Uses first fit decreasing, taking encoded sizes from iri_sizes when given.
+    Returns the lists, fullest first, and any IRIs that are too large to ever
+    fit in a payload.
+    """
+    size_of = iri_sizes.__getitem__ if iri_sizes is not None else encoded_iri_size
+    # Every IRI but the first in a list needs a comma. Counting a comma for every
+    # IRI and granting one extra byte of capacity comes out the same.
+    capacity = max_list_size + 1
+    sized_iris = sorted(((size_of(iri) + 1, iri) for iri in iris), reverse=True)
+
+    oversized: List[str] = []
+    while sized_iris and sized_iris[0][0] > capacity:
+        oversized.append(sized_iris.pop(0)[1])
+
+    if not sized_iris:
+        return [], oversized
+
+    smallest_size = sized_iris[-1][0]
+
+    full_lists: List[Tuple[int, List[str]]] = []
+    # [free bytes, IRIs] for every list that can still take the smallest IRI
+    open_lists: List[list] = []
+    for size, iri in sized_iris:
+        for open_list in open_lists:
+            if open_list[0] >= size:
+                break
+        else:
+            open_list = [capacity, []]
+            open_lists.append(open_list)
+
+        open_list[0] -= size
+        open_list[1].append(iri)
+
+        if open_list[0] < smallest_size:
+            open_lists.remove(open_list)
+            full_lists.append((open_list[0], open_list[1]))
+
+    full_lists.extend((free, iri_list) for free, iri_list in open_lists)
+    full_lists.sort(key=lambda free_iri_list: free_iri_list[0])
+
+    return [iri_list for _, iri_list in full_lists], oversized
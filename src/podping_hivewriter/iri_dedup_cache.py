@@ -0,0 +1,50 @@
+from collections import OrderedDict
+from timeit import default_timer as timer
+from typing import Tuple
+
+from podping_schemas.org.podcastindex.podping.podping_medium import (
+    PodpingMedium,
+)
+from podping_schemas.org.podcastindex.podping.podping_reason import (
+    PodpingReason,
+)
+
+DedupKey = Tuple[str, PodpingMedium, PodpingReason]
+
+
+class IRIDedupCache:
+    """Remembers recently queued IRIs so a feed pinged again within the window
+    isn't written to the chain again"""
+
+    def __init__(self, window: float, max_size: int = 100000):
+        self.window = window
+        self.max_size = max_size
+        # Every entry lives for the same window, so insertion order is expiry order
+        self._expiry: "OrderedDict[DedupKey, float]" = OrderedDict()
+
+    def __len__(self):
+        return len(self._expiry)
+
+    def _evict_expired(self, now: float):
+        expiry = self._expiry
+        while expiry:
+            key = next(iter(expiry))
+            if expiry[key] > now:
+                break
+            del expiry[key]
+
+    def seen(self, iri: str, medium: PodpingMedium, reason: PodpingReason) -> bool:
+        """Returns True if the IRI was already seen within the window,
+        otherwise remembers it and returns False"""
+        now = timer()
+        self._evict_expired(now)
+
+        key = (iri, medium, reason)
+        if key in self._expiry:
+            return True
+
+        if len(self._expiry) >= self.max_size:
+            self._expiry.popitem(last=False)
+        self._expiry[key] = now + self.window
+
+        return False
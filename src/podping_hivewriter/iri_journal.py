@@ -0,0 +1,256 @@
+import asyncio
+import logging
+import os
+import threading
+from collections import Counter, deque
+from pathlib import Path
+from typing import BinaryIO, Deque, Iterable, List, Optional, Tuple, Union
+
+from podping_schemas.org.podcastindex.podping.podping_medium import (
+    PodpingMedium,
+)
+from podping_schemas.org.podcastindex.podping.podping_reason import (
+    PodpingReason,
+)
+
+from podping_hivewriter.async_wrapper import sync_to_async
+from podping_hivewriter.models.medium import str_medium_map
+from podping_hivewriter.models.reason import str_reason_map
+
+JOURNAL_SEGMENT_PREFIX = "iri-journal-"
+JOURNAL_SEGMENT_SUFFIX = ".log"
+
+RECORD_ACCEPTED = "A"
+RECORD_DONE = "D"
+
+JournalKey = Tuple[str, str, str]
+
+
+class IRIJournal:
+    """Append-only on-disk journal of accepted IRIs that haven't been written to
+    Hive yet.
+
+    Records are tab separated lines (valid IRIs can't contain tabs or newlines)
+    buffered in memory and written with a single fsync every fsync_interval
+    seconds.  Segments roll over at max_segment_bytes and once there are more
+    than max_segments of them, they are compacted into a single segment holding
+    only the IRIs still pending.
+
+    An IRI accepted again while an earlier copy is still pending is counted, so
+    it stays pending until every copy has been written.
+
+    Files are only touched under a thread lock, so close() waits for a write
+    still running in the worker thread, even one whose flush was cancelled.
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        fsync_interval: float = 0.1,
+        max_segment_bytes: int = 16 * 1024 * 1024,
+        max_segments: int = 4,
+    ):
+        self.directory = Path(directory)
+        self.fsync_interval = fsync_interval
+        self.max_segment_bytes = max_segment_bytes
+        self.max_segments = max_segments
+
+        self.num_fsyncs = 0
+
+        # Copies of every pending IRI
+        self._pending: "Counter[JournalKey]" = Counter()
+        self._buffer: List[str] = []
+        # Flushed from the buffer but not written yet
+        self._unwritten: Deque[bytes] = deque()
+        self._segment_file: Optional[BinaryIO] = None
+        self._segment_num = 0
+        self._segment_size = 0
+        self._closed = False
+        self._lock = asyncio.Lock()
+        self._file_lock = threading.RLock()
+
+        self._async_write_unwritten = sync_to_async(
+            self._write_unwritten, thread_sensitive=False
+        )
+        self._async_write_snapshot = sync_to_async(
+            self._write_snapshot, thread_sensitive=False
+        )
+        self._async_open_segment = sync_to_async(
+            self._open_segment, thread_sensitive=False
+        )
+
+    def __len__(self):
+        return len(self._pending)
+
+    def _segment_path(self, segment_num: int) -> Path:
+        return self.directory / (
+            f"{JOURNAL_SEGMENT_PREFIX}{segment_num:08d}{JOURNAL_SEGMENT_SUFFIX}"
+        )
+
+    def _segment_paths(self) -> List[Path]:
+        return sorted(
+            self.directory.glob(f"{JOURNAL_SEGMENT_PREFIX}*{JOURNAL_SEGMENT_SUFFIX}")
+        )
+
+    @staticmethod
+    def _segment_num_of(path: Path) -> int:
+        name = path.name[len(JOURNAL_SEGMENT_PREFIX) :]
+        return int(name[: -len(JOURNAL_SEGMENT_SUFFIX)])
+
+    def _replay_segment(self, path: Path):
+        lines = path.read_bytes().decode("UTF-8", errors="replace").split("\n")
+        # The last element is either empty or a record torn by a crash mid-write
+        for line in lines[:-1]:
+            try:
+                kind, medium, reason, iri = line.split("\t", 3)
+            except ValueError:
+                logging.warning(f"Skipping malformed journal record in {path}")
+                continue
+            key = (medium, reason, iri)
+            if kind == RECORD_ACCEPTED:
+                self._pending[key] += 1
+            elif kind == RECORD_DONE and key in self._pending:
+                self._pending[key] -= 1
+                if not self._pending[key]:
+                    del self._pending[key]
+
+    async def open(self) -> List[Tuple[PodpingMedium, PodpingReason, str]]:
+        """Replay the journal, compact it and return the IRIs still pending"""
+        async with self._lock:
+            self._closed = False
+            self.directory.mkdir(parents=True, exist_ok=True)
+            segment_paths = self._segment_paths()
+            for path in segment_paths:
+                self._replay_segment(path)
+            if segment_paths:
+                self._segment_num = self._segment_num_of(segment_paths[-1])
+            # Every copy of an IRI is sent again as one
+            for key in self._pending:
+                self._pending[key] = 1
+            await self._compact()
+
+        pending = []
+        for medium, reason, iri in self._pending:
+            if medium in str_medium_map and reason in str_reason_map:
+                pending.append((str_medium_map[medium], str_reason_map[reason], iri))
+            else:
+                logging.warning(
+                    f"Skipping journaled IRI with unknown medium/reason "
+                    f"{medium}/{reason}: {iri}"
+                )
+        return pending
+
+    def record_accepted(self, medium: PodpingMedium, reason: PodpingReason, iri: str):
+        medium_str, reason_str = str(medium), str(reason)
+        self._pending[(medium_str, reason_str, iri)] += 1
+        self._buffer.append(f"{RECORD_ACCEPTED}\t{medium_str}\t{reason_str}\t{iri}\n")
+
+    def record_done(
+        self, medium: PodpingMedium, reason: PodpingReason, iris: Iterable[str]
+    ):
+        medium_str, reason_str = str(medium), str(reason)
+        for iri in iris:
+            key = (medium_str, reason_str, iri)
+            if key in self._pending:
+                self._pending[key] -= 1
+                if not self._pending[key]:
+                    del self._pending[key]
+                self._buffer.append(
+                    f"{RECORD_DONE}\t{medium_str}\t{reason_str}\t{iri}\n"
+                )
+
+    def _write(self, data: bytes):
+        """Only with the file lock held"""
+        self._segment_file.write(data)
+        self._segment_file.flush()
+        os.fsync(self._segment_file.fileno())
+        self.num_fsyncs += 1
+        self._segment_size += len(data)
+
+    def _write_unwritten(self):
+        with self._file_lock:
+            if self._closed or not self._unwritten:
+                return
+            chunks = []
+            while self._unwritten:
+                chunks.append(self._unwritten.popleft())
+            self._write(b"".join(chunks))
+
+    def _open_segment(self, segment_num: int):
+        with self._file_lock:
+            if self._closed:
+                return
+            if self._segment_file:
+                self._segment_file.close()
+            self._segment_num = segment_num
+            self._segment_file = open(self._segment_path(segment_num), "ab")
+            self._segment_size = self._segment_file.tell()
+
+    async def _compact(self):
+        """Start a new segment with only the pending IRIs and drop the old ones"""
+        # Snapshot on the event loop; it supersedes anything still buffered
+        data = "".join(
+            f"{RECORD_ACCEPTED}\t{medium}\t{reason}\t{iri}\n" * count
+            for (medium, reason, iri), count in self._pending.items()
+        ).encode("UTF-8")
+        self._buffer = []
+        await asyncio.shield(self._async_write_snapshot(data))
+
+    def _write_snapshot(self, data: bytes):
+        with self._file_lock:
+            if self._closed:
+                return
+            # Flushed before the snapshot was taken, so it covers them
+            self._unwritten.clear()
+            old_segment_paths = self._segment_paths()
+            self._open_segment(self._segment_num + 1)
+            self._write(data)
+            for path in old_segment_paths:
+                path.unlink()
+            # Make the unlinks and the new segment durable too
+            directory_fd = os.open(self.directory, os.O_RDONLY)
+            try:
+                os.fsync(directory_fd)
+            finally:
+                os.close(directory_fd)
+
+    async def flush(self):
+        """Write and fsync everything recorded so far"""
+        async with self._lock:
+            if not self._buffer or not self._segment_file:
+                return
+            self._unwritten.append("".join(self._buffer).encode("UTF-8"))
+            self._buffer = []
+            # Written even if the flush is cancelled, rather than dropped
+            await asyncio.shield(self._async_write_unwritten())
+
+            if self._segment_size >= self.max_segment_bytes:
+                if len(self._segment_paths()) >= self.max_segments:
+                    await self._compact()
+                else:
+                    await asyncio.shield(
+                        self._async_open_segment(self._segment_num + 1)
+                    )
+
+    async def flush_loop(self):
+        while True:
+            try:
+                await asyncio.sleep(self.fsync_interval)
+                await self.flush()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logging.exception("Unknown error in IRIJournal flush_loop")
+
+    def close(self):
+        """Write out everything recorded, once a write still running in the
+        worker thread is done"""
+        with self._file_lock:
+            if self._segment_file:
+                if self._buffer:
+                    self._unwritten.append("".join(self._buffer).encode("UTF-8"))
+                    self._buffer = []
+                self._write_unwritten()
+                self._segment_file.close()
+                self._segment_file = None
+            self._closed = True
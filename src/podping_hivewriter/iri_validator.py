@@ -0,0 +1,30 @@
+import re
+from functools import lru_cache
+
+import rfc3987
+
+# Full RFC 3987 IRI grammar, compiled once instead of on every rfc3987.match call
+_iri_pattern = rfc3987.get_compiled_pattern("^%(IRI)s$")
+
+# Strict subset of the IRI grammar covering the common case of a plain ASCII
+# http(s) IRI with a registered host name.  Anything it rejects still goes through
+# the full grammar, so it can only ever short-circuit IRIs that are valid anyway.
+_pchar = r"(?:[A-Za-z0-9\-._~!$&'()*+,;=:@]|%[0-9A-Fa-f]{2})"
+_fast_http_iri_pattern = re.compile(
+    r"https?://[A-Za-z0-9\-.]*(?::[0-9]*)?"
+    rf"(?:/(?:{_pchar}|/)*)?"
+    rf"(?:\?(?:{_pchar}|[/?])*)?"
+    rf"(?:#(?:{_pchar}|[/?])*)?\Z"
+)
+
+# Feeds are pinged over and over, so recently seen IRIs are worth remembering
+IRI_VALIDATION_CACHE_SIZE = 8192
+
+
+@lru_cache(maxsize=IRI_VALIDATION_CACHE_SIZE)
+def is_valid_iri(iri: str) -> bool:
+    """Equivalent to rfc3987.match(iri, "IRI") but cached and with a fast path
+    for ordinary http(s) IRIs"""
+    if _fast_http_iri_pattern.match(iri):
+        return True
+    return _iri_pattern.match(iri) is not None
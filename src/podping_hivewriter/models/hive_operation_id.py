@@ -1,3 +1,6 @@
+import itertools
+from typing import Dict, Tuple
+
 from podping_schemas.org.podcastindex.podping.podping_medium import (
     PodpingMedium,
 )
@@ -5,26 +8,64 @@ from podping_schemas.org.podcastindex.podping.podping_reason import (
     PodpingReason,
 )
 
+from podping_hivewriter.models.medium import mediums
+from podping_hivewriter.models.reason import reasons
+
 
 class HiveOperationId:
+    """The custom_json id, e.g. pp_podcast_update.  Immutable, the string and its
+    hash are worked out once up front."""
+
+    __slots__ = ("_podping", "_medium", "_reason", "_str", "_hash")
+
     def __init__(
         self,
         podping: str,
         medium: PodpingMedium = PodpingMedium.podcast,
         reason: PodpingReason = PodpingReason.update,
     ):
-        self.podping: str = podping
-        self.medium: PodpingMedium = medium
-        self.reason: PodpingReason = reason
+        self._podping: str = podping
+        self._medium: PodpingMedium = medium
+        self._reason: PodpingReason = reason
+        self._str = f"{podping}_{medium}_{str(reason).replace('_', '-')}"
+        self._hash = hash(self._str)
+
+    @property
+    def podping(self) -> str:
+        return self._podping
+
+    @property
+    def medium(self) -> PodpingMedium:
+        return self._medium
+
+    @property
+    def reason(self) -> PodpingReason:
+        return self._reason
 
     def __eq__(self, other):
-        return str(self) == str(other)
+        if isinstance(other, HiveOperationId):
+            return self._str == other._str
+        return self._str == str(other)
 
     def __ne__(self, other):
         return not self.__eq__(other)
 
     def __hash__(self):
-        return hash(str(self))
+        return self._hash
 
     def __str__(self):
-        return f"{self.podping}_{self.medium}_{str(self.reason).replace('_', '-')}"
+        return self._str
+
+    def __repr__(self):
+        return f"HiveOperationId({self._str})"
+
+
+def hive_operation_id_table(
+    podping: str,
+) -> Dict[Tuple[PodpingMedium, PodpingReason], HiveOperationId]:
+    """A HiveOperationId for every medium and reason, to look up instead of
+    building one per operation"""
+    return {
+        (medium, reason): HiveOperationId(podping, medium, reason)
+        for medium, reason in itertools.product(mediums, reasons)
+    }
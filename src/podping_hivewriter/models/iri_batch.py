@@ -1,5 +1,6 @@
-import uuid
-from typing import Set
+import itertools
+from timeit import default_timer as timer
+from typing import Collection, Optional, Set, Union
 
 from podping_schemas.org.podcastindex.podping.podping_medium import (
     PodpingMedium,
@@ -7,7 +8,9 @@ from podping_schemas.org.podcastindex.podping.podping_medium import (
 from podping_schemas.org.podcastindex.podping.podping_reason import (
     PodpingReason,
 )
-from pydantic import BaseModel, validator
+from pydantic import BaseModel
+
+_batch_sequence = itertools.count()
 
 
 class IRIBatch(BaseModel):
@@ -18,4 +21,73 @@ class IRIBatch(BaseModel):
     timestampNs: int
 
     def __lt__(self, other):
-        return self.priority <= other.priority
+        return self.priority < other.priority
+
+
+class QueuedIRIBatch:
+    """What the writer passes around internally instead of IRIBatch, with no
+    validation and no per-instance __dict__.  iri_set is any collection of unique
+    IRIs, usually the list the batch planner made.
+
+    Orders by priority, then by when it was made, so batches of the same
+    priority leave the queue in the order they went in."""
+
+    __slots__ = (
+        "medium",
+        "reason",
+        "iri_set",
+        "priority",
+        "timestampNs",
+        "sequence",
+        "received",
+    )
+
+    def __init__(
+        self,
+        medium: PodpingMedium,
+        reason: PodpingReason,
+        iri_set: Collection[str],
+        priority: int,
+        timestampNs: int,
+        received: Optional[float] = None,
+    ):
+        self.medium = medium
+        self.reason = reason
+        self.iri_set = iri_set
+        self.priority = priority
+        self.timestampNs = timestampNs
+        self.sequence = next(_batch_sequence)
+        # When the first of the IRIs came in, by timeit's default_timer
+        self.received = timer() if received is None else received
+
+    def __lt__(self, other: "QueuedIRIBatch"):
+        return (self.priority, self.sequence) < (other.priority, other.sequence)
+
+    def __repr__(self):
+        return (
+            f"QueuedIRIBatch(medium={self.medium}, reason={self.reason}, "
+            f"iris={len(self.iri_set)}, priority={self.priority}, "
+            f"timestampNs={self.timestampNs}, sequence={self.sequence})"
+        )
+
+    @classmethod
+    def from_model(cls, iri_batch: IRIBatch) -> "QueuedIRIBatch":
+        return cls(
+            iri_batch.medium,
+            iri_batch.reason,
+            iri_batch.iri_set,
+            iri_batch.priority,
+            iri_batch.timestampNs,
+        )
+
+    def to_model(self) -> IRIBatch:
+        return IRIBatch(
+            medium=self.medium,
+            reason=self.reason,
+            iri_set=set(self.iri_set),
+            priority=self.priority,
+            timestampNs=self.timestampNs,
+        )
+
+
+AnyIRIBatch = Union[IRIBatch, QueuedIRIBatch]
@@ -0,0 +1,14 @@
+from pydantic import BaseModel
+
+
+class PodpingBackpressure(BaseModel):
+    """Sent to producers whenever the writer starts or stops throttling them.
+    While throttled, writes are held up until the backlog of IRIs is back down
+    to lowWatermark.
+
+    podping-schemas has no type for this, so it goes out as JSON."""
+
+    throttled: bool
+    backlog: int
+    highWatermark: int
+    lowWatermark: int
@@ -1,10 +1,12 @@
 from plexo.neuron.neuron import Neuron
 
 from podping_hivewriter.codec.podping_codec import (
+    podping_backpressure_codec,
     podping_write_codec,
     podping_write_error_codec,
     podping_hive_transaction_codec,
 )
+from podping_hivewriter.models.podping_backpressure import PodpingBackpressure
 from podping_hivewriter.namespace import podping_hivewriter_namespace
 from podping_schemas.org.podcastindex.podping.hivewriter.podping_hive_transaction import (
     PodpingHiveTransaction,
@@ -29,3 +31,8 @@ podping_write_error_neuron = Neuron(
     podping_hivewriter_namespace,
     podping_write_error_codec,
 )
+podping_backpressure_neuron = Neuron(
+    PodpingBackpressure,
+    podping_hivewriter_namespace,
+    podping_backpressure_codec,
+)
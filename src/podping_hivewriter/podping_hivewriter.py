@@ -10,7 +10,6 @@ from functools import partial
 from timeit import default_timer as timer
 from typing import List, Optional, Set, Tuple, Union, Dict, Iterable
 
-import rfc3987
 from lighthive.client import Client
 from lighthive.datastructures import Operation
 from lighthive.exceptions import RPCNodeException
@@ -25,8 +24,11 @@ from podping_schemas.org.podcastindex.podping.podping_reason import (
 )
 
 from podping_hivewriter import __version__ as podping_hivewriter_version
+from podping_hivewriter.adaptive_operation_period import AdaptiveOperationPeriod
 from podping_hivewriter.async_context import AsyncContext
 from podping_hivewriter.async_wrapper import sync_to_async
+from podping_hivewriter.backpressure import Backpressure
+from podping_hivewriter.block_slots import BlockSlotLimiter
 from podping_hivewriter.constants import (
     EXIT_CODE_INVALID_POSTING_KEY,
     EXIT_CODE_UNKNOWN,
@@ -41,21 +43,46 @@ from podping_hivewriter.exceptions import (
     PodpingCustomJsonPayloadExceeded,
     TooManyCustomJsonsPerBlock,
 )
+from podping_hivewriter.hedged_broadcast import HedgedBroadcaster
 from podping_hivewriter.hive import get_client
-from podping_hivewriter.models.hive_operation_id import HiveOperationId
-from podping_hivewriter.models.iri_batch import IRIBatch
+from podping_hivewriter.hive_account_shard import HiveAccountShard
+from podping_hivewriter.hive_block_clock import HiveBlockClock
+from podping_hivewriter.hive_node_pool import HiveNodePool
+from podping_hivewriter.hive_rpc import HiveRPC, HiveRPCBroadcaster
+from podping_hivewriter.hive_signing import HiveSigningContext, LocalSigningBroadcaster
+from podping_hivewriter.iri_batch_accumulator import IRIBatchAccumulator
+from podping_hivewriter.iri_batch_planner import (
+    iri_list_size,
+    max_iri_list_size,
+    plan_iri_lists,
+)
+from podping_hivewriter.iri_dedup_cache import IRIDedupCache
+from podping_hivewriter.iri_journal import IRIJournal
+from podping_hivewriter.iri_validator import is_valid_iri
+from podping_hivewriter.models.hive_operation_id import (
+    HiveOperationId,
+    hive_operation_id_table,
+)
+from podping_hivewriter.models.iri_batch import AnyIRIBatch, QueuedIRIBatch
 from podping_hivewriter.models.lighthive_broadcast_response import (
     LighthiveBroadcastResponse,
 )
-from podping_hivewriter.models.medium import mediums
 from podping_hivewriter.models.internal_podping import InternalPodping
+from podping_hivewriter.models.podping_backpressure import PodpingBackpressure
 from podping_hivewriter.models.reason import reasons
 from podping_hivewriter.neuron import (
+    podping_backpressure_neuron,
     podping_hive_transaction_neuron,
     podping_write_neuron,
     podping_write_error_neuron,
 )
+from podping_hivewriter.podping_payload import encode_podping_payload
 from podping_hivewriter.podping_settings_manager import PodpingSettingsManager
+from podping_hivewriter.priority_lanes import (
+    LaneDelay,
+    iri_batch_priority,
+    is_live_lane,
+)
 from podping_schemas.org.podcastindex.podping.hivewriter.podping_hive_transaction import (
     PodpingHiveTransaction,
 )
@@ -98,6 +125,19 @@ class PodpingHivewriter(AsyncContext):
         status=True,
         client: Client = None,
         plexus: Plexus = None,
+        dedup_window: float = 0,
+        dedup_cache_size: int = 100000,
+        journal_path: Optional[str] = None,
+        max_broadcasts_in_flight: int = 3,
+        additional_accounts: Optional[Iterable[Tuple[str, str]]] = None,
+        block_aligned: bool = False,
+        probe_nodes: bool = False,
+        hedge_broadcasts: bool = False,
+        native_rpc: bool = False,
+        cache_signing: bool = False,
+        backlog_high_watermark: int = 10000,
+        backlog_low_watermark: Optional[int] = None,
+        adaptive_operation_period: bool = False,
     ):
         super().__init__()
 
@@ -110,6 +150,7 @@ class PodpingHivewriter(AsyncContext):
         self.listen_port = listen_port
         self.posting_keys: List[str] = posting_keys
         self.operation_id: str = operation_id
+        self.hive_operation_ids = hive_operation_id_table(operation_id)
         self.resource_test: bool = resource_test
         self.dry_run: bool = dry_run
         self.zmq_service: bool = zmq_service
@@ -124,21 +165,108 @@ class PodpingHivewriter(AsyncContext):
             loglevel=logging.ERROR,
         )
 
-        self._async_hive_broadcast = sync_to_async(
-            self.lighthive_client.broadcast_sync, thread_sensitive=False
+        # Optionally talk JSON-RPC to the nodes straight from the event loop
+        # instead of running lighthive calls in the thread pool
+        self.hive_rpc: Optional[HiveRPC] = (
+            HiveRPC(self.lighthive_client.nodes) if native_rpc else None
         )
 
+        # Optionally probe the nodes in the background and stick to the fastest
+        self.node_pool: Optional[HiveNodePool] = (
+            HiveNodePool(self.lighthive_client.nodes, rpc=self.hive_rpc)
+            if probe_nodes
+            else None
+        )
+
+        # Optionally send transactions right after each new block instead of
+        # on a fixed period, so they make it into the very next block
+        self.block_clock: Optional[HiveBlockClock] = (
+            HiveBlockClock(self.lighthive_client, rpc=self.hive_rpc)
+            if block_aligned
+            else None
+        )
+
+        # Optionally sign locally against a reference block refreshed in the
+        # background, saving a round trip to the node on every broadcast
+        self.signing_context: Optional[HiveSigningContext] = None
+        if cache_signing:
+            if self.hive_rpc is not None:
+                self.signing_context = HiveSigningContext(
+                    lambda: self.hive_rpc.get_dynamic_global_properties(
+                        self.lighthive_client.current_node
+                    )
+                )
+            else:
+                self.signing_context = HiveSigningContext(
+                    sync_to_async(
+                        self.lighthive_client.get_dynamic_global_properties,
+                        thread_sensitive=False,
+                    )
+                )
+
+        # Batches are spread over every account, each with its own custom_json
+        # per block quota and resource credits
+        self.hedge_broadcasts = hedge_broadcasts
+        self.shards: List[HiveAccountShard] = [
+            self._new_shard(server_account, self.lighthive_client)
+        ]
+        for account, posting_key in additional_accounts or ():
+            self.shards.append(
+                self._new_shard(
+                    account,
+                    get_client(posting_keys=[posting_key], loglevel=logging.ERROR),
+                )
+            )
+
         self.total_iris_recv = 0
         self.total_iris_sent = 0
         self.total_iris_recv_deduped = 0
+        self.total_iris_recv_deduped_window = 0
+
+        # Optionally drop IRIs already queued within the last dedup_window seconds
+        self.iri_dedup_cache: Optional[IRIDedupCache] = (
+            IRIDedupCache(dedup_window, dedup_cache_size) if dedup_window > 0 else None
+        )
+
+        # Optionally keep every accepted IRI on disk until it's been written to Hive
+        self.iri_journal: Optional[IRIJournal] = (
+            IRIJournal(journal_path) if journal_path else None
+        )
 
-        self.iri_batch_queue: "asyncio.PriorityQueue[IRIBatch]" = (
+        # Broadcasts overlap so a slow node doesn't hold up the next transaction,
+        # as long as each account stays under the custom_json per block limit
+        self.max_broadcasts_in_flight = max(1, max_broadcasts_in_flight)
+
+        self.iri_batch_queue: "asyncio.PriorityQueue[QueuedIRIBatch]" = (
             asyncio.PriorityQueue()
         )
         self.unprocessed_iri_queue: asyncio.Queue[PodpingWrite] = asyncio.Queue(1000)
-        self.iri_queues: Dict[
-            Tuple[PodpingMedium, PodpingReason], asyncio.Queue[str]
-        ] = {pair: asyncio.Queue() for pair in itertools.product(mediums, reasons)}
+        # live and liveEnd IRIs are batched as soon as they come in
+        self.iri_batch_accumulator = IRIBatchAccumulator(
+            self._max_iri_list_size,
+            immediate_reasons=frozenset(filter(is_live_lane, reasons)),
+        )
+        # IRIs in the batches of iri_batch_queue
+        self.iri_batch_queue_iris = 0
+        # live and liveEnd batches in iri_batch_queue, and a wake up call for the
+        # handler when one is queued
+        self.live_batches_queued = 0
+        self.live_batch_queued = asyncio.Event()
+        self.lane_delays: Dict[PodpingReason, LaneDelay] = {
+            reason: LaneDelay() for reason in reasons
+        }
+
+        # Optionally batch sooner than hive_operation_period while the block
+        # slots aren't busy, the setting becomes the longest it waits
+        self.adaptive_operation_period: Optional[AdaptiveOperationPeriod] = (
+            AdaptiveOperationPeriod() if adaptive_operation_period else None
+        )
+
+        # Producers are throttled while too many IRIs wait to be written, so
+        # memory stays bounded when IRIs come in faster than Hive takes them
+        self.backpressure = Backpressure(
+            self.backlog, backlog_high_watermark, backlog_low_watermark
+        )
 
         self.startup_datetime = datetime.utcnow()
         self.startup_time = timer()
@@ -146,16 +274,73 @@ class PodpingHivewriter(AsyncContext):
         self._startup_done = False
         asyncio.ensure_future(self._startup())
 
+    def _new_shard(self, account: str, client: Client) -> HiveAccountShard:
+        if self.block_clock is not None:
+            # Count operations per block rather than per sliding interval
+            block_slots = BlockSlotLimiter(clock=self.block_clock.block_time)
+        else:
+            block_slots = BlockSlotLimiter()
+
+        broadcaster = None
+        if self.hedge_broadcasts:
+            # Hedge with the next fastest node when the nodes are being probed
+            broadcaster = HedgedBroadcaster(
+                client,
+                ranked_nodes=(
+                    self.node_pool.ranked_nodes if self.node_pool is not None else None
+                ),
+                rpc=self.hive_rpc,
+                signing_context=self.signing_context,
+            )
+        elif self.hive_rpc is not None:
+            broadcaster = HiveRPCBroadcaster(
+                client, self.hive_rpc, signing_context=self.signing_context
+            )
+        elif self.signing_context is not None:
+            broadcaster = LocalSigningBroadcaster(client, self.signing_context)
+
+        return HiveAccountShard(account, client, block_slots, broadcaster)
+
     def close(self):
         super().close()
         if not self.external_plexus:
             self.plexus.close()
+        if self.iri_journal is not None:
+            self.iri_journal.close()
+        if self.hive_rpc is not None:
+            self.hive_rpc.close()
 
     async def _startup(self):
+        if self.node_pool is not None:
+            for client in [shard.client for shard in self.shards] + [
+                self.settings_manager.client
+            ]:
+                if client is not None and client not in self.node_pool.clients:
+                    self.node_pool.attach(client)
+            await self.node_pool.probe_all()
+            logging.info(f"Hive nodes by latency: {self.node_pool.ranked_nodes()}")
+            self._add_task(asyncio.create_task(self.node_pool.probe_loop()))
+
+        if self.signing_context is not None:
+            self._add_task(asyncio.create_task(self.signing_context.refresh_loop()))
+
         if self.resource_test and not self.dry_run:
             await self.test_hive_resources()
 
-        logging.info(f"Hive account: @{self.server_account}")
+        for shard in self.shards:
+            logging.info(f"Hive account: @{shard.account}")
+
+        if self.block_clock is not None:
+            self._add_task(asyncio.create_task(self.block_clock.sync_loop()))
+
+        if self.iri_journal is not None:
+            pending_iris = await self.iri_journal.open()
+            for medium, reason, iri in pending_iris:
+                # Already journaled, skip straight to batching
+                self.iri_batch_accumulator.add(medium, reason, iri)
+            if pending_iris:
+                logging.info(f"Replayed {len(pending_iris)} IRIs from the journal")
+            self._add_task(asyncio.create_task(self.iri_journal.flush_loop()))
 
         await self.plexus.adapt(podping_hive_transaction_neuron)
         await self.plexus.adapt(
@@ -165,10 +350,12 @@ class PodpingHivewriter(AsyncContext):
                     self._podping_write_reactant,
                     self.plexus,
                     self.unprocessed_iri_queue,
+                    self.backpressure,
                 ),
             ),
         )
         await self.plexus.adapt(podping_write_error_neuron)
+        await self.plexus.adapt(podping_backpressure_neuron)
 
         if self.zmq_service:
             tcp_pair_ganglion = GanglionZmqTcpPair(
@@ -178,32 +365,24 @@ class PodpingHivewriter(AsyncContext):
                     podping_hive_transaction_neuron,
                     podping_write_neuron,
                     podping_write_error_neuron,
+                    podping_backpressure_neuron,
                 ),
             )
             # tcp_pair_ganglion.socket.setsockopt(zmq.RCVHWM, 500)
             await self.plexus.infuse_ganglion(tcp_pair_ganglion)
 
-        for (medium, reason), iri_queue in self.iri_queues.items():
-            self._add_task(
-                asyncio.create_task(
-                    self._iri_batch_loop(
-                        medium, reason, iri_queue, self.iri_batch_queue
-                    )
-                )
-            )
+        self._add_task(
+            asyncio.create_task(self._iri_batch_flush_loop(self.iri_batch_queue))
+        )
         self._add_task(
             asyncio.create_task(self._iri_batch_handler_loop(self.iri_batch_queue))
         )
         self._add_task(
             asyncio.create_task(
-                self._unprocessed_iri_queue_handler(
-                    self.settings_manager,
-                    self.iri_batch_queue,
-                    self.unprocessed_iri_queue,
-                    self.iri_queues,
-                )
+                self._unprocessed_iri_queue_handler(self.unprocessed_iri_queue)
             )
         )
+        self._add_task(asyncio.create_task(self._backpressure_signal_loop()))
         if self.status:
             self._add_task(asyncio.create_task(self._hive_status_loop()))
 
@@ -217,32 +396,36 @@ class PodpingHivewriter(AsyncContext):
 
         # noinspection PyBroadException
         try:
-            # post custom json to test.
-            custom_json = {
-                "server_account": self.server_account,
-                "message": "Podping startup initiated",
-                "uuid": str(uuid.uuid4()),
-                "hive": str(self.lighthive_client.current_node),
-                "sessionId": self.session_id,
-            }
-
             startup_hive_operation_id = self.operation_id + STARTUP_OPERATION_ID
 
-            self.construct_operation(custom_json, startup_hive_operation_id)
-
-            custom_json["v"] = podping_hivewriter_version
-            custom_json["message"] = "Podping startup complete"
-            custom_json["hive"] = str(self.lighthive_client.current_node)
-
-            startup_notification_attempts_max = len(self.lighthive_client.node_list)
-            # Retry startup notification for every node before giving up
-            for i in range(startup_notification_attempts_max):
-                try:
-                    await self.broadcast_dict(custom_json, startup_hive_operation_id)
-                    break
-                except RPCNodeException:
-                    if i == startup_notification_attempts_max - 1:
-                        raise
+            # Every account has its own key and RC, so check each of them
+            for shard in self.shards:
+                # post custom json to test.
+                custom_json = {
+                    "server_account": shard.account,
+                    "message": "Podping startup initiated",
+                    "uuid": str(uuid.uuid4()),
+                    "hive": str(shard.client.current_node),
+                    "sessionId": self.session_id,
+                }
+
+                self.construct_operation(custom_json, startup_hive_operation_id, shard)
+
+                custom_json["v"] = podping_hivewriter_version
+                custom_json["message"] = "Podping startup complete"
+                custom_json["hive"] = str(shard.client.current_node)
+
+                startup_notification_attempts_max = len(shard.client.node_list)
+                # Retry startup notification for every node before giving up
+                for i in range(startup_notification_attempts_max):
+                    try:
+                        await self.broadcast_dict(
+                            custom_json, startup_hive_operation_id, shard
+                        )
+                        break
+                    except RPCNodeException:
+                        if i == startup_notification_attempts_max - 1:
+                            raise
 
             logging.info("Startup of Podping status: SUCCESS! Hit the BOOST Button.")
 
@@ -309,80 +492,103 @@ class PodpingHivewriter(AsyncContext):
 
     async def _iri_batch_handler_loop(
         self,
-        iri_batch_queue: "asyncio.Queue[IRIBatch]",
+        iri_batch_queue: "asyncio.PriorityQueue[QueuedIRIBatch]",
     ):
-        """Opens and watches a queue and sends notifications to Hive one by one"""
+        """Opens and watches a queue and sends notifications to Hive, spreading
+        transactions over every account and keeping up to max_broadcasts_in_flight
+        of them in flight per account.
+
+        live and liveEnd batches don't wait for the end of the period, they go
+        out in the next free block slot, ahead of anything else queued and even
+        when an account already has max_broadcasts_in_flight in flight."""
 
         session_id = self.session_id
+        shards = self.shards
+        live_batch_queued = self.live_batch_queued
 
         while True:
             try:
-                settings = self.settings_manager.get_settings()
-
                 start_time = timer()
-                num_in_batch = 0
-                batches = []
-                # Limited to 5 custom json operation per block
-                while not iri_batch_queue.empty() and num_in_batch < 5:
-                    iri_batch = await iri_batch_queue.get()
-                    batches.append(iri_batch)
-                    iri_batch_queue.task_done()
-                    logging.debug(
-                        f"Handling Podping ({iri_batch.timestampNs}, {session_id})"
-                    )
-                    num_in_batch += 1
+                live_batch_queued.clear()
 
-                if len(batches) > 0:
-                    broadcast_start_time = timer()
-                    failure_count, response = await self.broadcast_iri_batches_retry(
-                        batches
-                    )
-                    broadcast_duration = timer() - broadcast_start_time
-
-                    podpings = [
-                        Podping(
-                            medium=iri_batch.medium,
-                            reason=iri_batch.reason,
-                            iris=list(iri_batch.iri_set),
-                            timestampNs=iri_batch.timestampNs,
-                            sessionId=self.session_id,
+                # Don't take batches off the queue until they can be sent
+                while not self.live_batches_queued and all(
+                    len(shard.in_flight) >= self.max_broadcasts_in_flight
+                    for shard in shards
+                ):
+                    live_batch_wait = asyncio.create_task(live_batch_queued.wait())
+                    try:
+                        await asyncio.wait(
+                            set().union(*(shard.in_flight for shard in shards))
+                            | {live_batch_wait},
+                            return_when=asyncio.FIRST_COMPLETED,
                         )
-                        for iri_batch in batches
-                    ]
-
-                    num_iris = sum(len(iri_batch.iri_set) for iri_batch in batches)
-
-                    last_node = self.lighthive_client.current_node
-                    if response:
-                        for podping in podpings:
-                            logging.info(
-                                f"Podping ({podping.timestampNs}, {session_id}) | "
-                                f"Hive txid: {response.hive_tx_id}"
-                            )
-                        logging.info(
-                            f"TX send time: {broadcast_duration:0.2f} | "
-                            f"Failures: {failure_count} | "
-                            f"IRIs in TX: {num_iris} | "
-                            f"Hive txid: {response.hive_tx_id} | "
-                            f"Hive block num: {response.hive_block_num} | "
-                            f"last_node: {last_node}"
+                    finally:
+                        live_batch_wait.cancel()
+
+                for shard in shards:
+                    if iri_batch_queue.empty():
+                        break
+                    busy = len(shard.in_flight) >= self.max_broadcasts_in_flight
+                    if busy and not self.live_batches_queued:
+                        continue
+
+                    # Limited to 5 custom json operation per block per account
+                    num_slots = shard.available_slots()
+                    batches = []
+                    while not iri_batch_queue.empty() and len(batches) < num_slots:
+                        # The queue hands out live batches first, so once they're
+                        # gone a busy account takes no more
+                        if busy and not self.live_batches_queued:
+                            break
+                        iri_batch = await iri_batch_queue.get()
+                        batches.append(iri_batch)
+                        iri_batch_queue.task_done()
+                        self.iri_batch_queue_iris -= len(iri_batch.iri_set)
+                        if is_live_lane(iri_batch.reason):
+                            self.live_batches_queued -= 1
+                        self.lane_delays[iri_batch.reason].record(
+                            timer() - iri_batch.received
+                        )
+                        logging.debug(
+                            f"Handling Podping ({iri_batch.timestampNs}, {session_id})"
+                            f" | Hive account: @{shard.account}"
                         )
 
-                        await self.plexus.transmit(
-                            PodpingHiveTransaction(
-                                podpings=podpings,
-                                hiveTxId=response.hive_tx_id,
-                                hiveBlockNum=response.hive_block_num,
-                            )
+                    if len(batches) > 0:
+                        shard.block_slots.reserve(len(batches))
+                        broadcast_task = asyncio.create_task(
+                            self._broadcast_iri_batches_and_transmit(batches, shard)
                         )
+                        shard.in_flight.add(broadcast_task)
+                        broadcast_task.add_done_callback(shard.in_flight.discard)
 
-                        logging.debug(f"Transmitted TX: {response.hive_tx_id}")
+                # Taking batches off the queue may have made room for producers
+                self.backpressure.update()
 
-                end_time = timer()
-                sleep_time = settings.hive_operation_period - (end_time - start_time)
+                if self.live_batches_queued:
+                    # Out of block slots, try again as soon as one frees up
+                    sleep_time = min(shard.next_slot_in() for shard in shards)
+                else:
+                    end_time = timer()
+                    sleep_time = max(
+                        self.current_hive_operation_period() - (end_time - start_time),
+                        min(shard.next_slot_in() for shard in shards),
+                    )
+                    if self.block_clock is not None:
+                        # Wake up just after the block closest to the end of the
+                        # period
+                        sleep_time = self.block_clock.next_block_in(sleep_time)
                 if sleep_time > 0:
-                    await asyncio.sleep(sleep_time)
+                    # A live batch coming in cuts the sleep short
+                    try:
+                        await asyncio.wait_for(live_batch_queued.wait(), sleep_time)
+                    except asyncio.TimeoutError:
+                        pass
             except asyncio.CancelledError:
+                for shard in shards:
+                    for broadcast_task in shard.in_flight:
+                        broadcast_task.cancel()
                 raise
             except Exception:
                 logging.exception(
@@ -391,144 +597,210 @@ class PodpingHivewriter(AsyncContext):
                 )
                 raise
 
-    async def _iri_batch_loop(
-        self,
-        medium: PodpingMedium,
-        reason: PodpingReason,
-        iri_queue: "asyncio.Queue[str]",
-        iri_batch_queue: "asyncio.PriorityQueue[IRIBatch]",
+    async def _broadcast_iri_batches_and_transmit(
+        self, batches: List[QueuedIRIBatch], shard: Optional[HiveAccountShard] = None
     ):
-        async def get_from_queue():
-            try:
-                return await iri_queue.get()
-            except RuntimeError:
-                return
+        """Broadcast one transaction and report it over the plexus once it's in"""
+        session_id = self.session_id
 
-        priority = 1
+        try:
+            broadcast_start_time = timer()
+            failure_count, response, shard = await self._broadcast_iri_batches_retry(
+                batches, shard
+            )
+            broadcast_duration = timer() - broadcast_start_time
 
-        if reason == PodpingReason.live:
-            priority = -1
-        elif reason == PodpingReason.liveEnd:
-            priority = 0
+            podpings = [
+                Podping(
+                    medium=iri_batch.medium,
+                    reason=iri_batch.reason,
+                    iris=list(iri_batch.iri_set),
+                    timestampNs=iri_batch.timestampNs,
+                    sessionId=session_id,
+                )
+                for iri_batch in batches
+            ]
 
-        session_id = self.session_id
+            num_iris = sum(len(iri_batch.iri_set) for iri_batch in batches)
 
-        while True:
-            settings = self.settings_manager.get_settings()
-
-            iri_set: Set[str] = set()
-            start = timer()
-            duration = 0
-            iris_size_without_commas = 0
-            iris_size_total = 0
-            podping_timestamp = int(current_timestamp_nanoseconds())
-
-            # Wait until we have enough IRIs to fit in the payload
-            # or get into the current Hive block
-            while (
-                duration < settings.hive_operation_period
-                or iri_batch_queue.qsize() >= 5
-            ) and iris_size_total < settings.max_url_list_bytes:
-                try:
-                    iri = await asyncio.wait_for(
-                        get_from_queue(),
-                        timeout=settings.hive_operation_period,
-                    )
-                    iri_set.add(iri)
-                    iri_queue.task_done()
-
-                    logging.debug(
-                        f"_iri_batch_loop | "
-                        f"Podping ({podping_timestamp}, {session_id}) | "
-                        f"Medium: {medium} - Reason: {reason} | "
-                        f"Duration: {duration:.3f} | "
-                        f"IRI in queue: {iri}"
+            last_node = shard.client.current_node
+            if response:
+                for podping in podpings:
+                    logging.info(
+                        f"Podping ({podping.timestampNs}, {session_id}) | "
+                        f"Hive txid: {response.hive_tx_id}"
                     )
+                logging.info(
+                    f"TX send time: {broadcast_duration:0.2f} | "
+                    f"Failures: {failure_count} | "
+                    f"IRIs in TX: {num_iris} | "
+                    f"Hive txid: {response.hive_tx_id} | "
+                    f"Hive block num: {response.hive_block_num} | "
+                    f"Hive account: @{shard.account} | "
+                    f"last_node: {last_node}"
+                )
 
-                    # byte size of IRI in JSON is IRI + 2 quotes
-                    iris_size_without_commas += len(iri.encode("UTF-8")) + 2
-
-                    # Size of payload in bytes is
-                    # length of IRIs in bytes + the number of commas + 2 square brackets
-                    # Assuming it's a JSON list eg ["https://...","https://"..."]
-                    iris_size_total = iris_size_without_commas + len(iri_set) - 1 + 2
-                except asyncio.TimeoutError:
-                    pass
-                except asyncio.CancelledError:
-                    raise
-                except Exception:
-                    logging.exception(
-                        f"Unknown error in _iri_batch_loop | "
-                        f"Podping ({podping_timestamp}, {session_id}) | "
-                        f"Medium: {medium} - Reason: {reason}",
-                        stack_info=True,
+                await self.plexus.transmit(
+                    PodpingHiveTransaction(
+                        podpings=podpings,
+                        hiveTxId=response.hive_tx_id,
+                        hiveBlockNum=response.hive_block_num,
                     )
-                    raise
-                finally:
-                    # Always get the time of the loop
-                    duration = timer() - start
+                )
+
+                logging.debug(f"Transmitted TX: {response.hive_tx_id}")
+
+                if self.iri_journal is not None:
+                    for iri_batch in batches:
+                        self.iri_journal.record_done(
+                            iri_batch.medium,
+                            iri_batch.reason,
+                            iri_batch.iri_set,
+                        )
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logging.exception(
+                "Unknown in _broadcast_iri_batches_and_transmit",
+                stack_info=True,
+            )
+
+    def current_hive_operation_period(self) -> float:
+        """How long IRIs are collected before they're batched, the
+        hive_operation_period setting unless it's adapted to the load"""
+        ceiling = self.settings_manager.get_settings().hive_operation_period
+        adaptive_operation_period = self.adaptive_operation_period
+        if adaptive_operation_period is None:
+            return ceiling
+        adaptive_operation_period.update(
+            sum(
+                shard.block_slots.slots / shard.block_slots.interval
+                for shard in self.shards
+            )
+        )
+        return adaptive_operation_period.period_for(ceiling)
 
+    def _max_iri_list_size(self, medium: PodpingMedium, reason: PodpingReason) -> int:
+        settings = self.settings_manager.get_settings()
+        return max_iri_list_size(
+            medium, reason, self.session_id, settings.max_url_list_bytes
+        )
+
+    async def _iri_batch_flush_loop(
+        self,
+        iri_batch_queue: "asyncio.PriorityQueue[QueuedIRIBatch]",
+    ):
+        """Turns the IRIs of every medium and reason into batches once they fill
+        an operation or have waited a whole hive_operation_period, sleeping
+        until the next of them is due"""
+        accumulator = self.iri_batch_accumulator
+
+        while True:
             try:
-                if len(iri_set):
-                    iri_batch = IRIBatch(
-                        medium=medium,
-                        reason=reason,
-                        iri_set=iri_set,
-                        priority=priority,
-                        timestampNs=podping_timestamp,
-                    )
-                    await iri_batch_queue.put(iri_batch)
-                    self.total_iris_recv_deduped += len(iri_set)
-                    logging.info(
-                        f"Podping ({podping_timestamp}, {session_id}) | "
-                        f"Medium: {medium} - Reason: {reason} | "
-                        f"Size of IRIs: {iris_size_total}"
-                    )
+                period = self.current_hive_operation_period()
+                # Only set again by IRIs that come in from here on
+                accumulator.changed.clear()
+
+                # While plenty of batches are waiting to go out, keep filling
+                # the ones being collected rather than sending them half empty
+                backed_up = iri_batch_queue.qsize() >= 5
+                for medium, reason in accumulator.due(period, timed_out=not backed_up):
+                    await self._flush_iri_list(medium, reason, iri_batch_queue)
+
+                if backed_up and len(accumulator):
+                    timeout = period
+                else:
+                    timeout = accumulator.next_due_in(period)
+
+                if timeout is None:
+                    await accumulator.changed.wait()
+                elif timeout > 0:
+                    try:
+                        await asyncio.wait_for(accumulator.changed.wait(), timeout)
+                    except asyncio.TimeoutError:
+                        pass
             except asyncio.CancelledError:
                 raise
             except Exception:
                 logging.exception(
-                    f"Unknown error in _iri_batch_loop | "
-                    f"Podping ({podping_timestamp}, {session_id}) | "
-                    f"Medium: {medium} - Reason: {reason}",
+                    "Unknown error in _iri_batch_flush_loop",
                     stack_info=True,
                 )
                 raise
 
+    async def _flush_iri_list(
+        self,
+        medium: PodpingMedium,
+        reason: PodpingReason,
+        iri_batch_queue: "asyncio.PriorityQueue[QueuedIRIBatch]",
+    ):
+        """Plan the IRIs collected for a medium and reason into batches and queue
+        them for broadcast"""
+        session_id = self.session_id
+        pending = self.iri_batch_accumulator.take(medium, reason)
+        iri_list = pending.iri_list
+        max_list_size = pending.max_list_size
+        priority = iri_batch_priority(reason)
+        podping_timestamp = int(current_timestamp_nanoseconds())
+
+        iri_lists, oversized_iris = plan_iri_lists(
+            iri_list.sizes, max_list_size, iri_list.sizes
+        )
+
+        for iri in oversized_iris:
+            logging.error(
+                f"_flush_iri_list | "
+                f"Medium: {medium} - Reason: {reason} | "
+                f"IRI too large for a custom_json operation, "
+                f"dropping: {iri}"
+            )
+        if oversized_iris and self.iri_journal is not None:
+            self.iri_journal.record_done(medium, reason, oversized_iris)
+
+        if (
+            iri_list.iris_size >= max_list_size
+            and len(iri_lists) > 1
+            and priority > 0
+            and self.iri_batch_accumulator.carry_over(
+                medium, reason, iri_lists[-1], pending
+            )
+        ):
+            # Flushed early because the payload filled up. Top up the least
+            # full operation in the next window instead of sending it half empty
+            iri_lists.pop()
+
+        if self.adaptive_operation_period is not None:
+            self.adaptive_operation_period.record_operations(len(iri_lists))
+
+        for i, batch_iris in enumerate(iri_lists):
+            batch_timestamp = podping_timestamp + i
+            iri_batch = QueuedIRIBatch(
+                medium, reason, batch_iris, priority, batch_timestamp, pending.started
+            )
+            await iri_batch_queue.put(iri_batch)
+            self.iri_batch_queue_iris += len(batch_iris)
+            if is_live_lane(reason):
+                self.live_batches_queued += 1
+                self.live_batch_queued.set()
+            self.total_iris_recv_deduped += len(batch_iris)
+            logging.info(
+                f"Podping ({batch_timestamp}, {session_id}) | "
+                f"Medium: {medium} - Reason: {reason} | "
+                f"Size of IRIs: "
+                f"{iri_list_size(batch_iris, iri_list.sizes)}"
+            )
+
     async def _unprocessed_iri_queue_handler(
         self,
-        settings_manager: PodpingSettingsManager,
-        iri_batch_queue: "asyncio.PriorityQueue[IRIBatch]",
         unprocessed_iri_queue: "asyncio.Queue[PodpingWrite]",
-        iri_queues: "Dict[Tuple[PodpingMedium, PodpingReason], asyncio.Queue[str]]",
     ):
         while True:
             try:
                 podping_write: PodpingWrite = await unprocessed_iri_queue.get()
-                queue = iri_queues[(podping_write.medium, podping_write.reason)]
-                await queue.put(podping_write.iri)
+                self._queue_iri(
+                    podping_write.medium, podping_write.reason, podping_write.iri
+                )
                 unprocessed_iri_queue.task_done()
-                self.total_iris_recv += 1
-
-                qsize = iri_batch_queue.qsize()
-
-                if qsize >= 10:
-                    logging.debug(
-                        f"_unprocessed_iri_queue_handler | "
-                        f"unprocessed_iri_queue size: {unprocessed_iri_queue.qsize()}"
-                    )
-                    logging.debug(
-                        f"_unprocessed_iri_queue_handler | "
-                        f"iri_batch_queue size: {qsize}"
-                    )
-                    op_period = settings_manager.get_settings().hive_operation_period
-                    logging.debug(
-                        f"_unprocessed_iri_queue_handler | "
-                        f"Sleeping for {op_period}s"
-                    )
-                    await asyncio.sleep(op_period)
-            except asyncio.TimeoutError:
-                pass
             except asyncio.CancelledError:
                 raise
             except Exception:
@@ -538,22 +810,62 @@ class PodpingHivewriter(AsyncContext):
                 )
                 raise
 
+    async def _backpressure_signal_loop(self):
+        """Tells producers whenever they're throttled and when they can send
+        again"""
+        backpressure = self.backpressure
+        while True:
+            try:
+                await backpressure.changed.wait()
+                backpressure.changed.clear()
+                await self.plexus.transmit(
+                    PodpingBackpressure(
+                        throttled=backpressure.throttled,
+                        backlog=self.backlog(),
+                        highWatermark=backpressure.high_watermark,
+                        lowWatermark=backpressure.low_watermark,
+                    )
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logging.exception(
+                    "Unknown error in _backpressure_signal_loop", stack_info=True
+                )
+
+    def _queue_iri(self, medium: PodpingMedium, reason: PodpingReason, iri: str):
+        """Hand an already validated IRI over to be batched"""
+        self.total_iris_recv += 1
+        dedup_cache = self.iri_dedup_cache
+        if dedup_cache is not None and dedup_cache.seen(iri, medium, reason):
+            self.total_iris_recv_deduped_window += 1
+            return
+        # Already waiting to be batched, the copy that's there covers it
+        if self.iri_batch_accumulator.add(medium, reason, iri) and (
+            self.iri_journal is not None
+        ):
+            self.iri_journal.record_accepted(medium, reason, iri)
+
     @staticmethod
     async def _podping_write_reactant(
         plexus: Plexus,
         unprocessed_iri_queue: "asyncio.Queue[PodpingWrite]",
+        backpressure: Backpressure,
         podping_write: PodpingWrite,
         _,
         _2,
     ):
-        if rfc3987.match(podping_write.iri, "IRI"):
-            await unprocessed_iri_queue.put(podping_write)
-        else:
+        if not is_valid_iri(podping_write.iri):
             podping_write_error = PodpingWriteError(
                 podpingWrite=podping_write,
                 errorType=PodpingWriteErrorType.invalidIri,
             )
             await plexus.transmit(podping_write_error)
+        else:
+            # Holds up the client until the backlog has room again.  It's told
+            # why by the PodpingBackpressure sent when throttling started
+            await backpressure.wait()
+            await unprocessed_iri_queue.put(podping_write)
 
     async def send_podping(
         self,
@@ -569,12 +881,43 @@ class PodpingHivewriter(AsyncContext):
 
         await self.plexus.transmit(podping_write)
 
-    async def num_operations_in_queue(self) -> int:
+    async def send_podpings(
+        self,
+        iris: Iterable[str],
+        medium: Optional[PodpingMedium] = None,
+        reason: Optional[PodpingReason] = None,
+    ) -> List[str]:
+        """Validate and queue many IRIs in one step, skipping the per IRI
+        PodpingWrite round trip through Plexus.  Waits while producers are
+        throttled.  Returns the invalid IRIs"""
+        if medium is None:
+            medium = self.medium
+        if reason is None:
+            reason = self.reason
+
+        invalid_iris: List[str] = []
+        backpressure = self.backpressure
+        for iri in iris:
+            if is_valid_iri(iri):
+                if backpressure.update():
+                    await backpressure.wait()
+                self._queue_iri(medium, reason, iri)
+            else:
+                invalid_iris.append(iri)
+
+        return invalid_iris
+
+    def backlog(self) -> int:
+        """IRIs received but not yet taken off the queue to be broadcast"""
         return (
-            sum(queue.qsize() for queue in self.iri_queues.values())
-            + self.iri_batch_queue.qsize()
+            self.unprocessed_iri_queue.qsize()
+            + len(self.iri_batch_accumulator)
+            + self.iri_batch_queue_iris
         )
 
+    async def num_operations_in_queue(self) -> int:
+        return len(self.iri_batch_accumulator) + self.iri_batch_queue.qsize()
+
     async def output_hive_status(self) -> None:
         """Output the name of the current hive node
         on a regular basis"""
@@ -584,20 +927,87 @@ class PodpingHivewriter(AsyncContext):
             f"Status - Uptime: {up_time} | "
             f"IRIs Received: {self.total_iris_recv} | "
             f"IRIs Deduped: {self.total_iris_recv_deduped} | "
+            f"IRIs Deduped (window): {self.total_iris_recv_deduped_window} | "
             f"IRIs Sent: {self.total_iris_sent} | "
             f"last_node: {last_node}"
         )
+        if self.signing_context is not None:
+            logging.info(
+                f"Status - Reference block age: {self.signing_context.age:.1f}s | "
+                f"Refreshes: {self.signing_context.num_refreshes} | "
+                f"Reused: {self.signing_context.num_cache_hits}"
+            )
+        if self.adaptive_operation_period is not None:
+            logging.info(
+                f"Status - Operation period: "
+                f"{self.current_hive_operation_period():.2f}s | "
+                f"Block slot utilization: "
+                f"{self.adaptive_operation_period.utilization:.0%}"
+            )
+        lane_delays = [
+            f"{reason}: {lane_delay.mean:.2f}s avg, {lane_delay.max:.2f}s max"
+            for reason, lane_delay in sorted(
+                self.lane_delays.items(), key=lambda item: iri_batch_priority(item[0])
+            )
+            if lane_delay.count
+        ]
+        if lane_delays:
+            logging.info(f"Status - Queueing delay | {' | '.join(lane_delays)}")
+        if self.backpressure.num_throttles:
+            logging.info(
+                f"Status - Backlog: {self.backlog()} IRIs | "
+                f"Throttled: {self.backpressure.throttled} | "
+                f"Times throttled: {self.backpressure.num_throttles}"
+            )
+        for shard in self.shards:
+            if isinstance(shard.broadcaster, HedgedBroadcaster):
+                hedged_broadcaster = shard.broadcaster
+                logging.info(
+                    f"Status - Hive account: @{shard.account} | "
+                    f"Broadcasts: {hedged_broadcaster.num_broadcasts} | "
+                    f"Hedged: {hedged_broadcaster.num_hedged} | "
+                    f"Hedges won: {hedged_broadcaster.num_hedge_wins} | "
+                    f"Hedge delay: {hedged_broadcaster.hedge_delay():.2f}s"
+                )
+        if len(self.shards) > 1:
+            for shard in self.shards:
+                logging.info(
+                    f"Status - Hive account: @{shard.account} | "
+                    f"Operations Sent: {shard.total_operations_sent} | "
+                    f"RC paused: {shard.rc_paused} | "
+                    f"last_node: {shard.client.current_node}"
+                )
+
+    def hive_operation_id(
+        self, medium: Optional[PodpingMedium], reason: Optional[PodpingReason]
+    ) -> HiveOperationId:
+        hive_operation_id = self.hive_operation_ids.get((medium, reason))
+        if hive_operation_id is None:
+            hive_operation_id = HiveOperationId(self.operation_id, medium, reason)
+        return hive_operation_id
 
     def construct_operations(
         self,
-        payload_operation_ids: Iterable[Tuple[dict, Union[HiveOperationId, str]]],
+        payload_operation_ids: Iterable[
+            Tuple[Union[dict, str], Union[HiveOperationId, str]]
+        ],
+        shard: Optional[HiveAccountShard] = None,
     ) -> List[Operation]:
-        """Build the operation for the blockchain"""
+        """Build the operation for the blockchain, payloads are either dicts or
+        already serialized JSON"""
 
+        required_posting_auths = (
+            shard.required_posting_auths
+            if shard is not None
+            else self.required_posting_auths
+        )
         operations: List[Operation] = []
 
         for payload, hive_operation_id in payload_operation_ids:
-            payload_json = json.dumps(payload, separators=(",", ":"))
+            if isinstance(payload, str):
+                payload_json = payload
+            else:
+                payload_json = json.dumps(payload, separators=(",", ":"))
             size_of_json = len(payload_json)
             if size_of_json > HIVE_CUSTOM_OP_DATA_MAX_LENGTH:
                 raise PodpingCustomJsonPayloadExceeded(
@@ -608,7 +1018,7 @@ class PodpingHivewriter(AsyncContext):
                 "custom_json",
                 {
                     "required_auths": [],
-                    "required_posting_auths": self.required_posting_auths,
+                    "required_posting_auths": required_posting_auths,
                     "id": str(hive_operation_id),
                     "json": payload_json,
                 },
@@ -619,28 +1029,40 @@ class PodpingHivewriter(AsyncContext):
         return operations
 
     def construct_operation(
-        self, payload: dict, hive_operation_id: Union[HiveOperationId, str]
+        self,
+        payload: dict,
+        hive_operation_id: Union[HiveOperationId, str],
+        shard: Optional[HiveAccountShard] = None,
     ) -> Operation:
-        return self.construct_operations(((payload, hive_operation_id),))[0]
+        return self.construct_operations(((payload, hive_operation_id),), shard)[0]
 
     async def broadcast_dicts(
         self,
-        payload_operation_ids: Iterable[Tuple[dict, Union[HiveOperationId, str]]],
+        payload_operation_ids: Iterable[
+            Tuple[Union[dict, str], Union[HiveOperationId, str]]
+        ],
+        shard: Optional[HiveAccountShard] = None,
     ) -> LighthiveBroadcastResponse:
         """Build and send an operation to the blockchain"""
+        if shard is None:
+            shard = self.shards[0]
+        if self.node_pool is not None:
+            self.node_pool.route(shard.client)
         try:
-            ops = self.construct_operations(payload_operation_ids)
+            ops = self.construct_operations(payload_operation_ids, shard)
             # if you want to FORCE the error condition for >5 operations
             # in one block, uncomment this line.
             # op = [op] * 6
 
             broadcast_task = asyncio.create_task(
-                self._async_hive_broadcast(op=ops, dry_run=self.dry_run)
+                shard.async_broadcast(op=ops, dry_run=self.dry_run)
             )
 
-            logging.info(f"Lighthive Node: {self.lighthive_client.current_node}")
+            logging.info(f"Lighthive Node: {shard.client.current_node}")
 
-            return LighthiveBroadcastResponse(await broadcast_task)
+            response = LighthiveBroadcastResponse(await broadcast_task)
+            shard.total_operations_sent += len(ops)
+            return response
         except RPCNodeException as ex:
             logging.error(f"send_notification error: {ex}")
             try:
@@ -675,30 +1097,35 @@ class PodpingHivewriter(AsyncContext):
             raise
 
     async def broadcast_dict(
-        self, payload: dict, hive_operation_id: Union[HiveOperationId, str]
+        self,
+        payload: dict,
+        hive_operation_id: Union[HiveOperationId, str],
+        shard: Optional[HiveAccountShard] = None,
     ) -> LighthiveBroadcastResponse:
-        return await self.broadcast_dicts(((payload, hive_operation_id),))
+        return await self.broadcast_dicts(((payload, hive_operation_id),), shard)
 
     async def broadcast_iri_batches(
         self,
-        iri_batches: Iterable[IRIBatch],
+        iri_batches: Iterable[AnyIRIBatch],
+        shard: Optional[HiveAccountShard] = None,
     ) -> LighthiveBroadcastResponse:
         num_iris = sum(len(iri_batch.iri_set) for iri_batch in iri_batches)
+        # The batches were validated on the way in, no need for InternalPodping
         payload_operation_ids = (
             (
-                InternalPodping(
-                    medium=iri_batch.medium,
-                    reason=iri_batch.reason,
-                    iris=list(iri_batch.iri_set),
-                    timestampNs=iri_batch.timestampNs,
-                    sessionId=self.session_id,
-                ).dict(),
-                HiveOperationId(self.operation_id, iri_batch.medium, iri_batch.reason),
+                encode_podping_payload(
+                    str(iri_batch.medium),
+                    str(iri_batch.reason),
+                    iri_batch.iri_set,
+                    iri_batch.timestampNs,
+                    self.session_id,
+                ),
+                self.hive_operation_id(iri_batch.medium, iri_batch.reason),
             )
             for iri_batch in iri_batches
         )
 
-        response = await self.broadcast_dicts(payload_operation_ids)
+        response = await self.broadcast_dicts(payload_operation_ids, shard)
 
         self.total_iris_sent += num_iris
 
@@ -718,7 +1145,7 @@ class PodpingHivewriter(AsyncContext):
             sessionId=self.session_id,
         )
 
-        hive_operation_id = HiveOperationId(self.operation_id, medium, reason)
+        hive_operation_id = self.hive_operation_id(medium, reason)
 
         response = await self.broadcast_dict(payload.dict(), hive_operation_id)
 
@@ -742,7 +1169,7 @@ class PodpingHivewriter(AsyncContext):
             sessionId=self.session_id,
         ).dict()
 
-        hive_operation_id = HiveOperationId(self.operation_id, medium, reason)
+        hive_operation_id = self.hive_operation_id(medium, reason)
 
         response = await self.broadcast_dict(payload_dict, hive_operation_id)
 
@@ -752,12 +1179,44 @@ class PodpingHivewriter(AsyncContext):
 
     async def broadcast_iri_batches_retry(
         self,
-        iri_batches: Iterable[IRIBatch],
+        iri_batches: Iterable[AnyIRIBatch],
+        shard: Optional[HiveAccountShard] = None,
     ) -> Tuple[int, Optional[LighthiveBroadcastResponse]]:
+        failure_count, response, _ = await self._broadcast_iri_batches_retry(
+            iri_batches, shard
+        )
+        return failure_count, response
+
+    def _shard_with_slots(
+        self, num_operations: int, exclude: HiveAccountShard
+    ) -> Optional[HiveAccountShard]:
+        """Another account that can send num_operations right now, if any"""
+        for shard in self.shards:
+            if shard is not exclude and shard.available_slots() >= num_operations:
+                return shard
+        return None
+
+    async def _broadcast_iri_batches_retry(
+        self,
+        iri_batches: Iterable[AnyIRIBatch],
+        shard: Optional[HiveAccountShard] = None,
+    ) -> Tuple[int, Optional[LighthiveBroadcastResponse], HiveAccountShard]:
+        """Keeps retrying until the batches are in, moving them to another account
+        if this one runs out of resource credits.  Also returns the account that
+        finally sent them."""
         await self.wait_startup()
         failure_count = 0
+        iri_batches = list(iri_batches)
+        if shard is None:
+            shard = self.shards[0]
+        # The first attempt goes out in the slots the caller reserved, a resend
+        # has to reserve its own
+        slots_reserved = True
 
         for _ in itertools.repeat(None):
+            if not slots_reserved:
+                await self._reserve_block_slots(shard, len(iri_batches))
+                slots_reserved = True
             num_iris = sum(len(iri_batch.iri_set) for iri_batch in iri_batches)
             if failure_count > 0:
                 logging.info(
@@ -768,10 +1227,12 @@ class PodpingHivewriter(AsyncContext):
 
             # noinspection PyBroadException
             try:
-                response = await self.broadcast_iri_batches(iri_batches=iri_batches)
+                response = await self.broadcast_iri_batches(
+                    iri_batches=iri_batches, shard=shard
+                )
                 if failure_count > 0:
                     logging.info(f"FAILURE CLEARED after {failure_count} retries")
-                return failure_count, response
+                return failure_count, response, shard
             except RPCNodeException as ex:
                 logging.error(f"Failed to send {num_iris} IRIs")
                 try:
@@ -793,31 +1254,45 @@ class PodpingHivewriter(AsyncContext):
                         sys.exit(EXIT_CODE_INVALID_POSTING_KEY)
                 except (KeyError, AttributeError):
                     logging.warning("Malformed error response")
-                    self.lighthive_client.circuit_breaker_cache[
-                        self.lighthive_client.current_node
-                    ] = True
+                    if self.node_pool is not None:
+                        # Out of the running until it answers a probe again
+                        self.node_pool.record_failure(shard.client.current_node)
+                    shard.client.circuit_breaker_cache[shard.client.current_node] = True
                     logging.warning(
                         "Ignoring node %s for %d seconds",
-                        self.lighthive_client.current_node,
-                        self.lighthive_client.circuit_breaker_ttl,
+                        shard.client.current_node,
+                        shard.client.circuit_breaker_ttl,
                     )
-                    self.lighthive_client.next_node()
+                    shard.client.next_node()
+                slots_reserved = False
             except NotEnoughResourceCredits as ex:
                 logging.warning(ex)
                 # 10s + exponential back off: need time for RC delegation
                 # script to kick in
                 sleep_for = 10 * 2**failure_count
-                logging.warning(f"Sleeping for {sleep_for}s")
-                await asyncio.sleep(sleep_for)
+                shard.pause_for_rc(sleep_for)
+                logging.warning(
+                    f"Hive account @{shard.account} is out of RC, "
+                    f"pausing it for {sleep_for}s"
+                )
+                other_shard = self._shard_with_slots(len(iri_batches), exclude=shard)
+                if other_shard is not None:
+                    other_shard.block_slots.reserve(len(iri_batches))
+                    shard = other_shard
+                    logging.warning(f"Retrying with Hive account @{shard.account}")
+                else:
+                    logging.warning(f"Sleeping for {sleep_for}s")
+                    await asyncio.sleep(sleep_for)
+                    slots_reserved = False
             except TooManyCustomJsonsPerBlock as ex:
                 logging.warning(ex)
-                # Wait for the next block to retry
-                sleep_for = (self.settings_manager.get_settings()).hive_operation_period
-                logging.warning(f"Sleeping for {sleep_for}s")
-                await asyncio.sleep(sleep_for)
+                # The block is full whatever the limiter thought, so take the
+                # rest of its slots and retry once they free up
+                shard.block_slots.reserve(shard.block_slots.available())
+                slots_reserved = False
             except Exception:
-                logging.info(f"Current node: {self.lighthive_client.current_node}")
-                logging.info(self.lighthive_client.nodes)
+                logging.info(f"Current node: {shard.client.current_node}")
+                logging.info(shard.client.nodes)
                 logging.exception("Unknown error in failure_retry", stack_info=True)
                 logging.error(f"Failed to send {num_iris} IRIs")
                 if logging.DEBUG >= logging.root.level:
@@ -829,7 +1304,20 @@ class PodpingHivewriter(AsyncContext):
             finally:
                 failure_count += 1
 
-        return failure_count, None
+        return failure_count, None, shard
+
+    @staticmethod
+    async def _reserve_block_slots(shard: HiveAccountShard, num_operations: int):
+        """Waits until the account can send num_operations, then reserves them"""
+        num_operations = min(num_operations, shard.block_slots.slots)
+        while shard.available_slots() < num_operations:
+            sleep_for = shard.next_slot_in()
+            logging.warning(
+                f"Hive account @{shard.account} | "
+                f"Waiting {sleep_for:.2f}s for {num_operations} block slots"
+            )
+            await asyncio.sleep(max(sleep_for, 0.1))
+        shard.block_slots.reserve(num_operations)
 
     async def broadcast_iris_retry(
         self,
@@ -839,12 +1327,12 @@ class PodpingHivewriter(AsyncContext):
     ) -> Tuple[int, Optional[LighthiveBroadcastResponse]]:
         return await self.broadcast_iri_batches_retry(
             (
-                IRIBatch(
-                    iri_set=iri_set,
-                    medium=medium or self.medium,
-                    reason=reason or self.reason,
-                    priority=0,
-                    timestampNs=int(current_timestamp_nanoseconds()),
+                QueuedIRIBatch(
+                    medium or self.medium,
+                    reason or self.reason,
+                    iri_set,
+                    0,
+                    int(current_timestamp_nanoseconds()),
                 ),
             )
         )
@@ -0,0 +1,32 @@
+from functools import lru_cache
+from json.encoder import encode_basestring_ascii
+from typing import Iterable
+
+from podping_hivewriter.models.internal_podping import CURRENT_PODPING_VERSION
+
+
+@lru_cache(maxsize=None)
+def _payload_head(medium: str, reason: str) -> str:
+    return (
+        f'{{"version":{encode_basestring_ascii(CURRENT_PODPING_VERSION)},'
+        f'"medium":{encode_basestring_ascii(medium)},'
+        f'"reason":{encode_basestring_ascii(reason)},'
+        f'"iris":['
+    )
+
+
+def encode_podping_payload(
+    medium: str, reason: str, iris: Iterable[str], timestamp_ns: int, session_id: int
+) -> str:
+    """Compact JSON of an InternalPodping, byte for byte what
+    json.dumps(InternalPodping(...).dict(), separators=(",", ":")) gives.
+
+    For podpings built from already validated IRI batches, skipping the
+    pydantic model and encoding the strings with the same C encoder json.dumps
+    uses.
+    """
+    return (
+        _payload_head(medium, reason)
+        + ",".join(map(encode_basestring_ascii, iris))
+        + f'],"timestampNs":{timestamp_ns},"sessionId":{session_id}}}'
+    )
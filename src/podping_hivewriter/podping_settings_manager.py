@@ -26,6 +26,8 @@ class PodpingSettingsManager(AsyncContext):
         self.last_update_time = float("-inf")
 
         self._settings = PodpingSettings()
+        if self.override_hive_operation_period:
+            self._settings.hive_operation_period = self.override_hive_operation_period
         self._settings_lock = asyncio.Lock()
 
         self._startup_done = False
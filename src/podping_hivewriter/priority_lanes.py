@@ -0,0 +1,42 @@
+from podping_schemas.org.podcastindex.podping.podping_reason import (
+    PodpingReason,
+)
+
+
+def iri_batch_priority(reason: PodpingReason) -> int:
+    """Lower goes out first: live, then liveEnd, then everything else"""
+    if reason == PodpingReason.live:
+        return -1
+    if reason == PodpingReason.liveEnd:
+        return 0
+    return 1
+
+
+def is_live_lane(reason: PodpingReason) -> bool:
+    """live and liveEnd batches skip the wait for more IRIs and go out in the
+    next free block slot"""
+    return iri_batch_priority(reason) <= 0
+
+
+class LaneDelay:
+    """Queueing delay of one lane, from the first IRI of a batch coming in to
+    the batch being handed to a broadcast"""
+
+    __slots__ = ("count", "total", "max", "last")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last = 0.0
+
+    def record(self, delay: float):
+        self.count += 1
+        self.total += delay
+        self.last = delay
+        if delay > self.max:
+            self.max = delay
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
@@ -1,4 +1,8 @@
+import json
 import logging
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
 import pytest
 
@@ -28,3 +32,127 @@ def pytest_collection_modifyitems(config, items):
 @pytest.fixture(scope="session")
 def lighthive_client():
     return get_client(loglevel=logging.WARN)
+
+
+class StandInHiveNode:
+    """Local HTTP server answering Hive JSON-RPC calls with canned results after
+    an adjustable delay, standing in for a real node"""
+
+    def __init__(self, delay: float = 0.0, head_block_number: int = 1000):
+        self.delay = delay
+        self.head_block_number = head_block_number
+        self.fail = False
+        # Close the connection partway through the body
+        self.truncate = False
+        self.num_requests = 0
+        self.transactions = []
+        # Transactions to put in a block, by block number
+        self.block_transactions = {}
+        # Client address of every connection, to tell keep-alive reuse apart
+        self.connections = set()
+
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body go out in separate writes
+            disable_nagle_algorithm = True
+
+            def do_POST(self):
+                stand_in.num_requests += 1
+                stand_in.connections.add(self.client_address)
+                request = json.loads(
+                    self.rfile.read(int(self.headers["Content-Length"]))
+                )
+                time.sleep(stand_in.delay)
+                if stand_in.fail:
+                    self.send_error(502)
+                    return
+                if isinstance(request, list):
+                    response = [stand_in.response(call) for call in request]
+                else:
+                    response = stand_in.response(request)
+                body = json.dumps(response).encode("UTF-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                if stand_in.truncate:
+                    self.send_header("Content-Length", str(len(body) + 100))
+                    self.close_connection = True
+                else:
+                    self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def response(self, request: dict) -> dict:
+        response = {"jsonrpc": "2.0", "id": request.get("id")}
+        try:
+            response["result"] = self.result(request["method"], request.get("params"))
+        except LookupError as e:
+            response["error"] = {
+                "code": -32000,
+                "message": f"Unknown: {e}",
+                "data": {"name": "fc::exception"},
+            }
+        return response
+
+    def result(self, method: str, params):
+        if method.endswith("get_dynamic_global_properties"):
+            return {
+                "head_block_number": self.head_block_number,
+                "time": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime()),
+            }
+        if method.endswith("broadcast_transaction_synchronous"):
+            self.transactions.append(params[0])
+            return {
+                "id": f"{len(self.transactions):040x}",
+                "block_num": self.head_block_number + 1,
+                "trx_num": 0,
+                "expired": False,
+            }
+        if method == "block_api.get_block":
+            block_num = params["block_num"]
+            if block_num > self.head_block_number:
+                return {}
+            transactions = self.block_transactions.get(block_num, [])
+            return {
+                "block": {
+                    "block_id": f"{block_num:08x}" + "0" * 32,
+                    "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime()),
+                    "transactions": transactions,
+                    "transaction_ids": [
+                        f"{block_num:08x}{tx_num:032x}"
+                        for tx_num in range(len(transactions))
+                    ],
+                }
+            }
+        if method == "condenser_api.get_accounts":
+            return [{"name": name} for name in params[0]]
+        raise LookupError(method)
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stand_in_hive_node():
+    """Factory for StandInHiveNode servers, shut down after the test"""
+    nodes = []
+
+    def _stand_in_hive_node(**kwargs) -> StandInHiveNode:
+        node = StandInHiveNode(**kwargs)
+        nodes.append(node)
+        return node
+
+    yield _stand_in_hive_node
+
+    for node in nodes:
+        node.close()
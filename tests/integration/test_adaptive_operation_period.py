@@ -0,0 +1,54 @@
+import pytest
+
+from podping_hivewriter import adaptive_operation_period as adaptive_module
+from podping_hivewriter.adaptive_operation_period import AdaptiveOperationPeriod
+
+
+def test_adaptive_operation_period(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(adaptive_module, "timer", lambda: now[0])
+    slots_per_second = 5 / 3
+
+    adaptive_operation_period = AdaptiveOperationPeriod(floor=1.0, time_constant=10)
+
+    # Light traffic batches as soon as the floor allows
+    for _ in range(30):
+        now[0] += 1
+        adaptive_operation_period.record_operations(0.1)
+        adaptive_operation_period.update(slots_per_second)
+    assert adaptive_operation_period.utilization < 0.2
+    assert adaptive_operation_period.period_for(3) == 1.0
+    assert adaptive_operation_period.period == 1.0
+
+    # Every slot taken widens it to the configured period
+    for _ in range(60):
+        now[0] += 1
+        adaptive_operation_period.record_operations(slots_per_second)
+        adaptive_operation_period.update(slots_per_second)
+    assert adaptive_operation_period.utilization == pytest.approx(1, abs=0.01)
+    assert adaptive_operation_period.period_for(3) == 3
+
+    # Half of them lands in between
+    for _ in range(60):
+        now[0] += 1
+        adaptive_operation_period.record_operations(slots_per_second / 2)
+        adaptive_operation_period.update(slots_per_second)
+    assert 1 < adaptive_operation_period.period_for(3) < 3
+
+    # Never longer than the setting, even when it's below the floor
+    assert adaptive_operation_period.period_for(0.5) == 0.5
+
+
+def test_adaptive_operation_period_sample_interval(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(adaptive_module, "timer", lambda: now[0])
+
+    adaptive_operation_period = AdaptiveOperationPeriod(sample_interval=1.0)
+    adaptive_operation_period.record_operations(100)
+    now[0] += 0.5
+    adaptive_operation_period.update(1)
+    assert adaptive_operation_period.utilization == 0
+
+    now[0] += 0.5
+    adaptive_operation_period.update(1)
+    assert adaptive_operation_period.utilization > 0
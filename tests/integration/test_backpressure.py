@@ -0,0 +1,74 @@
+import asyncio
+import json
+
+import pytest
+
+from podping_hivewriter.backpressure import Backpressure
+from podping_hivewriter.codec.podping_codec import podping_backpressure_codec
+from podping_hivewriter.models.podping_backpressure import PodpingBackpressure
+
+
+def test_backpressure_watermarks():
+    backlog = 0
+    backpressure = Backpressure(lambda: backlog, 10, 4)
+
+    assert not backpressure.update()
+    assert not backpressure.changed.is_set()
+    backlog = 10
+    assert backpressure.update()
+    assert backpressure.num_throttles == 1
+    assert backpressure.changed.is_set()
+    backpressure.changed.clear()
+
+    # Stays throttled until down to the low watermark
+    backlog = 5
+    assert backpressure.update()
+    assert not backpressure.changed.is_set()
+    backlog = 4
+    assert not backpressure.update()
+    assert backpressure.changed.is_set()
+    backlog = 9
+    assert not backpressure.update()
+    assert backpressure.num_throttles == 1
+
+
+def test_backpressure_invalid_watermarks():
+    assert Backpressure(lambda: 0, 10).low_watermark == 5
+    with pytest.raises(ValueError):
+        Backpressure(lambda: 0, 0)
+    with pytest.raises(ValueError):
+        Backpressure(lambda: 0, 10, 10)
+
+
+@pytest.mark.asyncio
+@pytest.mark.timeout(5)
+async def test_backpressure_wait():
+    backlog = [10]
+    backpressure = Backpressure(lambda: backlog[0], 10, 4)
+    assert backpressure.update()
+
+    waiter = asyncio.create_task(backpressure.wait())
+    await asyncio.sleep(0.05)
+    assert not waiter.done()
+
+    # Draining without checking the watermarks doesn't release anyone
+    backlog[0] = 4
+    await asyncio.sleep(0.05)
+    assert not waiter.done()
+
+    backpressure.update()
+    await asyncio.wait_for(waiter, 1)
+
+
+def test_podping_backpressure_codec():
+    signal = PodpingBackpressure(
+        throttled=True, backlog=10000, highWatermark=10000, lowWatermark=5000
+    )
+    encoded = podping_backpressure_codec.encode(signal)
+    assert json.loads(encoded) == {
+        "throttled": True,
+        "backlog": 10000,
+        "highWatermark": 10000,
+        "lowWatermark": 5000,
+    }
+    assert podping_backpressure_codec.decode(encoded) == signal
@@ -0,0 +1,28 @@
+import time
+
+from podping_hivewriter.block_slots import BlockSlotLimiter
+
+
+def test_block_slot_limiter_counts_operations_in_interval():
+    block_slots = BlockSlotLimiter(slots=5, interval=60)
+
+    assert block_slots.available() == 5
+    assert block_slots.next_slot_in() == 0
+
+    block_slots.reserve(3)
+    assert block_slots.available() == 2
+
+    block_slots.reserve(2)
+    assert block_slots.available() == 0
+    assert 59 < block_slots.next_slot_in() <= 60
+
+
+def test_block_slot_limiter_frees_slots_after_interval():
+    block_slots = BlockSlotLimiter(slots=5, interval=0.05)
+
+    block_slots.reserve(5)
+    assert block_slots.available() == 0
+
+    time.sleep(0.1)
+    assert block_slots.available() == 5
+    assert block_slots.next_slot_in() == 0
@@ -0,0 +1,242 @@
+import json
+import os
+
+import pytest
+
+from podping_hivewriter import hive
+from podping_hivewriter.chain_reader_checkpoint import ChainReaderCheckpoint
+from podping_hivewriter.hive import (
+    _podping_transactions_from_block,
+    get_relevant_transactions_from_blockchain,
+)
+from podping_hivewriter.hive_rpc import HiveRPC
+from podping_hivewriter.models.internal_podping import CURRENT_PODPING_VERSION
+
+
+def podping_transaction(iri: str, operation_id: str = "pp_podcast_update") -> dict:
+    return {
+        "operations": [
+            {
+                "type": "custom_json_operation",
+                "value": {
+                    "id": operation_id,
+                    "json": json.dumps(
+                        {
+                            "version": CURRENT_PODPING_VERSION,
+                            "medium": "podcast",
+                            "reason": "update",
+                            "iris": [iri],
+                            "timestampNs": 0,
+                            "sessionId": 0,
+                        }
+                    ),
+                },
+            }
+        ]
+    }
+
+
+@pytest.mark.asyncio
+@pytest.mark.timeout(30)
+async def test_get_relevant_transactions_in_block_order(stand_in_hive_node):
+    # Every request takes a while, so catching up only works out when the
+    # blocks are fetched concurrently
+    node = stand_in_hive_node(delay=0.05, head_block_number=1200)
+    iris = []
+    for block_num in range(1000, 1200, 7):
+        iri = f"https://example.com/{block_num}"
+        node.block_transactions[block_num] = [
+            podping_transaction("https://example.com/other", "pp_other"),
+            podping_transaction(iri),
+        ]
+        iris.append(iri)
+
+    rpc = HiveRPC([node.url])
+    received = []
+    block_nums = []
+    transactions = get_relevant_transactions_from_blockchain(
+        None, 1000, "pp_podcast_update", window=20, rpc=rpc
+    )
+    async for tx in transactions:
+        received.extend(tx.podpings[0].iris)
+        block_nums.append(tx.hiveBlockNum)
+        assert tx.hiveTxId.endswith(f"{1:032x}")
+        if len(received) == len(iris):
+            break
+    await transactions.aclose()
+    rpc.close()
+
+    assert received == iris
+    assert block_nums == sorted(block_nums)
+
+
+@pytest.mark.asyncio
+@pytest.mark.timeout(30)
+async def test_get_relevant_transactions_resumes_from_checkpoint(
+    stand_in_hive_node, tmp_path
+):
+    node = stand_in_hive_node(head_block_number=1100)
+    for block_num in (1010, 1020, 1030):
+        node.block_transactions[block_num] = [
+            podping_transaction(f"https://example.com/{block_num}/{tx_num}")
+            for tx_num in range(3)
+        ]
+    rpc = HiveRPC([node.url])
+    checkpoint_path = tmp_path / "reader-checkpoint.json"
+
+    async def read(num_iris: int):
+        iris = []
+        transactions = get_relevant_transactions_from_blockchain(
+            None,
+            1000,
+            "pp_podcast_update",
+            rpc=rpc,
+            checkpoint=ChainReaderCheckpoint(checkpoint_path, save_interval=60),
+        )
+        async for tx in transactions:
+            iris.extend(tx.podpings[0].iris)
+            if len(iris) == num_iris:
+                break
+        await transactions.aclose()
+        return iris
+
+    assert await read(4) == [
+        "https://example.com/1010/0",
+        "https://example.com/1010/1",
+        "https://example.com/1010/2",
+        "https://example.com/1020/0",
+    ]
+    # The last one wasn't acknowledged by asking for the next, so it's
+    # delivered again, then reading carries on where it left off
+    assert await read(3) == [
+        "https://example.com/1020/0",
+        "https://example.com/1020/1",
+        "https://example.com/1020/2",
+    ]
+    assert await read(3) == [
+        "https://example.com/1020/2",
+        "https://example.com/1030/0",
+        "https://example.com/1030/1",
+    ]
+
+    rpc.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.timeout(10)
+async def test_get_relevant_transactions_survives_head_block_errors(monkeypatch):
+    monkeypatch.setattr(hive, "HIVE_BLOCK_INTERVAL", 0.05)
+
+    class FlakyRPC:
+        def __init__(self):
+            self.num_head_block_calls = 0
+
+        async def get_dynamic_global_properties(self):
+            self.num_head_block_calls += 1
+            if self.num_head_block_calls == 1:
+                raise ConnectionResetError("Connection reset by peer")
+            if self.num_head_block_calls == 2:
+                return {}
+            return {"head_block_number": 1001}
+
+        async def get_block(self, block_num):
+            return {
+                "block": {
+                    "transactions": [podping_transaction("https://example.com/1")],
+                    "transaction_ids": [f"{block_num:040x}"],
+                }
+            }
+
+    rpc = FlakyRPC()
+    transactions = get_relevant_transactions_from_blockchain(
+        None, 1000, "pp_podcast_update", rpc=rpc
+    )
+    tx = await transactions.__anext__()
+    await transactions.aclose()
+
+    assert tx.hiveBlockNum == 1000
+    assert tx.podpings[0].iris == ["https://example.com/1"]
+    assert rpc.num_head_block_calls >= 3
+
+
+@pytest.mark.asyncio
+@pytest.mark.timeout(10)
+async def test_get_relevant_transactions_fails_over(stand_in_hive_node, monkeypatch):
+    monkeypatch.setattr(hive, "HIVE_BLOCK_INTERVAL", 0.05)
+    down = stand_in_hive_node()
+    down.fail = True
+    up = stand_in_hive_node(head_block_number=1001)
+    up.block_transactions[1000] = [podping_transaction("https://example.com/1")]
+
+    rpc = HiveRPC([down.url, up.url])
+    transactions = get_relevant_transactions_from_blockchain(
+        None, 1000, "pp_podcast_update", rpc=rpc
+    )
+    tx = await transactions.__anext__()
+    await transactions.aclose()
+
+    assert tx.podpings[0].iris == ["https://example.com/1"]
+    assert rpc.current_node == up.url
+
+    rpc.close()
+
+
+def test_chain_reader_checkpoint_survives_bad_files(tmp_path):
+    checkpoint_path = tmp_path / "reader-checkpoint.json"
+    checkpoint = ChainReaderCheckpoint(checkpoint_path)
+    assert not checkpoint.load()
+
+    checkpoint_path.write_text('{"block_num": 12')
+    assert not checkpoint.load()
+
+    checkpoint._write({"block_num": 1234, "tx_num": 5})
+    assert checkpoint.load()
+    assert (checkpoint.block_num, checkpoint.tx_num) == (1234, 5)
+    # Nothing left over from the atomic write
+    assert [path.name for path in tmp_path.iterdir()] == [checkpoint_path.name]
+
+
+def test_podping_transactions_from_block_filters_operations():
+    block = {
+        "transactions": [
+            podping_transaction("https://example.com/pp"),
+            podping_transaction("https://example.com/pplt", "pplt_podcast_update"),
+            # Looks like a podping but isn't under a podping id
+            podping_transaction("https://example.com/other", "ppx_podcast_update"),
+            {
+                "operations": [
+                    {
+                        "type": "custom_json_operation",
+                        "value": {"id": "pp_startup", "json": '{"message": "hi"}'},
+                    }
+                ]
+            },
+        ],
+        "transaction_ids": ["a", "b", "c", "d"],
+    }
+
+    transactions = _podping_transactions_from_block(block, 1)
+    assert [(tx_num, tx.hiveTxId) for tx_num, tx in transactions] == [
+        (0, "a"),
+        (1, "b"),
+    ]
+
+    transactions = _podping_transactions_from_block(block, 1, "pplt_podcast_update")
+    assert [tx.podpings[0].iris for _, tx in transactions] == [
+        ["https://example.com/pplt"]
+    ]
+
+
+def test_chain_reader_checkpoint_fsyncs_directory(tmp_path, monkeypatch):
+    checkpoint = ChainReaderCheckpoint(tmp_path / "reader-checkpoint.json")
+    fsync = os.fsync
+    fsynced = []
+
+    def recording_fsync(fd: int):
+        fsynced.append(os.path.samestat(os.fstat(fd), os.stat(tmp_path)))
+        fsync(fd)
+
+    monkeypatch.setattr(os, "fsync", recording_fsync)
+    checkpoint._write({"block_num": 1234, "tx_num": 5})
+    # The checkpoint, then the directory the rename happened in
+    assert fsynced == [False, True]
@@ -0,0 +1,144 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from lighthive.exceptions import RPCNodeException
+
+from podping_hivewriter.hedged_broadcast import HedgedBroadcaster
+from podping_hivewriter.hive_rpc import HiveRPC
+
+
+def stand_in_client(*nodes):
+    return SimpleNamespace(
+        current_node=nodes[0].url,
+        nodes=[node.url for node in nodes],
+        circuit_breaker_cache={},
+        get_dynamic_global_properties=lambda: {"head_block_number": 1000},
+    )
+
+
+def signed_transaction_stub(self, operations, dynamic_global_properties):
+    return {"operations": operations, "signatures": ["stub"]}
+
+
+@pytest.mark.asyncio
+@pytest.mark.timeout(30)
+async def test_hedged_broadcast_second_node_wins(stand_in_hive_node, monkeypatch):
+    monkeypatch.setattr(HedgedBroadcaster, "sign", signed_transaction_stub)
+    hung = stand_in_hive_node(delay=3)
+    fast = stand_in_hive_node()
+
+    hedged_broadcaster = HedgedBroadcaster(
+        stand_in_client(hung, fast), initial_hedge_delay=0.2
+    )
+    response = await hedged_broadcaster.broadcast(["op"])
+
+    assert response["block_num"] == fast.head_block_number + 1
+    assert hedged_broadcaster.num_hedged == 1
+    assert hedged_broadcaster.num_hedge_wins == 1
+    # Answered long before the hung node would have
+    assert hedged_broadcaster.latencies[0] < 2
+    # The second node got the very same signed transaction
+    assert fast.transactions == [{"operations": ["op"], "signatures": ["stub"]}]
+
+
+@pytest.mark.asyncio
+@pytest.mark.timeout(30)
+async def test_hedged_broadcast_no_hedge_when_fast(stand_in_hive_node, monkeypatch):
+    monkeypatch.setattr(HedgedBroadcaster, "sign", signed_transaction_stub)
+    fast = stand_in_hive_node()
+    other = stand_in_hive_node()
+
+    hedged_broadcaster = HedgedBroadcaster(
+        stand_in_client(fast, other), initial_hedge_delay=2
+    )
+    for _ in range(3):
+        await hedged_broadcaster.broadcast(["op"])
+
+    assert hedged_broadcaster.num_hedged == 0
+    assert len(fast.transactions) == 3
+    assert other.num_requests == 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.timeout(30)
+async def test_hedged_broadcast_node_errors(stand_in_hive_node, monkeypatch):
+    monkeypatch.setattr(HedgedBroadcaster, "sign", signed_transaction_stub)
+    down = stand_in_hive_node()
+    down.fail = True
+
+    hedged_broadcaster = HedgedBroadcaster(stand_in_client(down))
+
+    with pytest.raises(RPCNodeException):
+        await hedged_broadcaster.broadcast(["op"])
+
+
+@pytest.mark.asyncio
+@pytest.mark.timeout(30)
+async def test_hedged_broadcast_cancelled(monkeypatch):
+    monkeypatch.setattr(HedgedBroadcaster, "sign", signed_transaction_stub)
+    nodes = [
+        SimpleNamespace(url="http://127.0.0.1:1"),
+        SimpleNamespace(url="http://127.0.0.1:2"),
+    ]
+    hedged_broadcaster = HedgedBroadcaster(
+        stand_in_client(*nodes), initial_hedge_delay=0.1
+    )
+
+    cancelled = []
+
+    async def hung_broadcast(node, signed_transaction):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(node)
+            raise
+
+    hedged_broadcaster._async_rpc_broadcast = hung_broadcast
+
+    broadcast = asyncio.ensure_future(hedged_broadcaster.broadcast(["op"]))
+    await asyncio.sleep(0.5)
+    assert hedged_broadcaster.num_hedged == 1
+
+    broadcast.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await broadcast
+    await asyncio.sleep(0)
+
+    # Neither the primary nor the hedge is left running
+    assert sorted(cancelled) == [node.url for node in nodes]
+
+
+@pytest.mark.asyncio
+@pytest.mark.timeout(30)
+async def test_hedged_broadcast_hive_rpc(stand_in_hive_node, monkeypatch):
+    monkeypatch.setattr(HedgedBroadcaster, "sign", signed_transaction_stub)
+    hung = stand_in_hive_node(delay=3)
+    fast = stand_in_hive_node()
+    rpc = HiveRPC([hung.url, fast.url])
+
+    hedged_broadcaster = HedgedBroadcaster(
+        stand_in_client(hung, fast), initial_hedge_delay=0.2, rpc=rpc
+    )
+    response = await hedged_broadcaster.broadcast(["op"])
+
+    assert response["block_num"] == fast.head_block_number + 1
+    assert hedged_broadcaster.num_hedge_wins == 1
+    assert fast.transactions == [{"operations": ["op"], "signatures": ["stub"]}]
+
+    # Let the cancelled broadcast to the hung node wind down
+    await asyncio.sleep(0.1)
+    rpc.close()
+
+
+def test_hedge_delay_follows_p95():
+    hedged_broadcaster = HedgedBroadcaster(
+        stand_in_client(SimpleNamespace(url="http://127.0.0.1:1")),
+        initial_hedge_delay=5,
+        min_hedge_delay=0.1,
+        min_samples=20,
+    )
+    assert hedged_broadcaster.hedge_delay() == 5
+
+    hedged_broadcaster.latencies.extend(i / 100 for i in range(1, 101))
+    assert hedged_broadcaster.hedge_delay() == pytest.approx(0.96)
@@ -0,0 +1,34 @@
+import time
+from types import SimpleNamespace
+
+from podping_hivewriter.hive_account_shard import HiveAccountShard
+
+
+def test_hive_account_shard_pauses_for_rc():
+    shard = HiveAccountShard(
+        "podping.test", SimpleNamespace(broadcast_sync=lambda op, dry_run: {})
+    )
+
+    assert shard.required_posting_auths == ["podping.test"]
+    assert shard.available_slots() == 5
+    assert not shard.rc_paused
+
+    shard.pause_for_rc(0.05)
+    assert shard.rc_paused
+    assert shard.available_slots() == 0
+    assert 0 < shard.next_slot_in() <= 0.05
+
+    time.sleep(0.1)
+    assert not shard.rc_paused
+    assert shard.available_slots() == 5
+    assert shard.next_slot_in() == 0
+
+
+def test_hive_account_shard_block_slots():
+    shard = HiveAccountShard(
+        "podping.test", SimpleNamespace(broadcast_sync=lambda op, dry_run: {})
+    )
+
+    shard.block_slots.reserve(5)
+    assert shard.available_slots() == 0
+    assert shard.next_slot_in() > 0
@@ -0,0 +1,67 @@
+import time
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from podping_hivewriter.block_slots import BlockSlotLimiter
+from podping_hivewriter.hive_block_clock import HiveBlockClock, parse_hive_time
+
+
+def dynamic_global_properties(head_block_timestamp: float) -> dict:
+    return {
+        "head_block_number": 1000,
+        "time": datetime.fromtimestamp(head_block_timestamp, timezone.utc).strftime(
+            "%Y-%m-%dT%H:%M:%S"
+        ),
+    }
+
+
+def test_parse_hive_time():
+    assert parse_hive_time("1970-01-01T00:00:03") == 3
+    assert parse_hive_time("2022-05-01T12:00:00") == 1651406400
+
+
+@pytest.mark.asyncio
+async def test_hive_block_clock_next_block_in():
+    # Latest block was produced 1.5 seconds ago, in the middle of the interval
+    head_block_timestamp = float(int(time.time()))
+    while time.time() - head_block_timestamp < 1.5:
+        time.sleep(0.05)
+    client = SimpleNamespace(
+        get_dynamic_global_properties=lambda: dynamic_global_properties(
+            head_block_timestamp
+        )
+    )
+    block_clock = HiveBlockClock(client, broadcast_delay=0.25)
+
+    assert not block_clock.synced
+    assert block_clock.next_block_in(2) == 2
+
+    await block_clock.sync()
+
+    assert block_clock.synced
+    assert block_clock.head_block_num == 1000
+    assert block_clock.block_time() == head_block_timestamp
+
+    next_block_in = block_clock.next_block_in()
+    now = time.time()
+    # Just after the next block
+    assert now + next_block_in == pytest.approx(head_block_timestamp + 3.25)
+    # The block boundary closest to 10 seconds from now
+    next_block_in = block_clock.next_block_in(10)
+    now = time.time()
+    assert now + next_block_in == pytest.approx(head_block_timestamp + 12.25)
+
+
+def test_block_slot_limiter_per_block():
+    block_time = 3000.0
+    block_slots = BlockSlotLimiter(clock=lambda: block_time)
+
+    block_slots.reserve(5)
+    assert block_slots.available() == 0
+    assert block_slots.next_slot_in() == 3
+
+    # All slots are free again as soon as the next block is produced
+    block_time += 3
+    assert block_slots.available() == 5
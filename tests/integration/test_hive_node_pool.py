@@ -0,0 +1,56 @@
+from types import SimpleNamespace
+
+import pytest
+
+from podping_hivewriter.hive_node_pool import HiveNodePool
+
+
+@pytest.mark.asyncio
+@pytest.mark.timeout(30)
+async def test_hive_node_pool_routes_to_fastest_healthy_node(stand_in_hive_node):
+    fast = stand_in_hive_node(delay=0.0)
+    slow = stand_in_hive_node(delay=0.3)
+    lagging = stand_in_hive_node(delay=0.0, head_block_number=900)
+    down = stand_in_hive_node(delay=0.0)
+    down.fail = True
+
+    node_pool = HiveNodePool(
+        [slow.url, lagging.url, down.url, fast.url], probe_timeout=2
+    )
+    client = SimpleNamespace(current_node=slow.url, load_balance_nodes=True)
+    node_pool.attach(client)
+
+    # Nothing is known before the first probe, so the client is left alone
+    assert client.current_node == slow.url
+    assert not client.load_balance_nodes
+
+    await node_pool.probe_all()
+
+    assert node_pool.ranked_nodes() == [fast.url, slow.url]
+    assert client.current_node == fast.url
+
+    # The fast node slows down and the EWMA catches up after a few probes
+    fast.delay = 0.6
+    for _ in range(5):
+        await node_pool.probe_all()
+
+    assert node_pool.ranked_nodes() == [slow.url, fast.url]
+    assert client.current_node == slow.url
+
+    # A failed broadcast takes a node out until it answers a probe again
+    node_pool.record_failure(slow.url)
+    assert node_pool.best_node() == fast.url
+    await node_pool.probe_all()
+    assert node_pool.best_node() == slow.url
+
+
+@pytest.mark.asyncio
+@pytest.mark.timeout(30)
+async def test_hive_node_pool_probe_timeout(stand_in_hive_node):
+    hung = stand_in_hive_node(delay=2)
+
+    node_pool = HiveNodePool([hung.url], probe_timeout=0.2)
+    await node_pool.probe_all()
+
+    assert node_pool.stats[hung.url].consecutive_failures == 1
+    assert node_pool.best_node() is None
@@ -0,0 +1,42 @@
+import pytest
+from podping_schemas.org.podcastindex.podping.podping_medium import (
+    PodpingMedium,
+)
+from podping_schemas.org.podcastindex.podping.podping_reason import (
+    PodpingReason,
+)
+
+from podping_hivewriter.models.hive_operation_id import (
+    HiveOperationId,
+    hive_operation_id_table,
+)
+from podping_hivewriter.models.medium import mediums
+from podping_hivewriter.models.reason import reasons
+
+
+def test_hive_operation_id_equality_and_hashing():
+    hive_operation_id = HiveOperationId("pp", PodpingMedium.podcast, PodpingReason.live)
+
+    assert str(hive_operation_id) == f"pp_{PodpingMedium.podcast}_live"
+    assert hive_operation_id == HiveOperationId(
+        "pp", PodpingMedium.podcast, PodpingReason.live
+    )
+    assert hive_operation_id == str(hive_operation_id)
+    assert hive_operation_id != HiveOperationId(
+        "pplt", PodpingMedium.podcast, PodpingReason.live
+    )
+    assert hash(hive_operation_id) == hash(str(hive_operation_id))
+    assert {hive_operation_id: 1}[str(hive_operation_id)] == 1
+
+    # The string is worked out once, so it can't be changed after the fact
+    with pytest.raises(AttributeError):
+        hive_operation_id.medium = PodpingMedium.music
+
+
+def test_hive_operation_id_table():
+    table = hive_operation_id_table("pp")
+
+    assert len(table) == len(mediums) * len(reasons)
+    for (medium, reason), hive_operation_id in table.items():
+        assert hive_operation_id == HiveOperationId("pp", medium, reason)
+        assert "_" not in str(hive_operation_id).split("_", 2)[2]
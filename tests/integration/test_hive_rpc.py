@@ -0,0 +1,117 @@
+from types import SimpleNamespace
+
+import pytest
+from lighthive.exceptions import RPCNodeException
+
+from podping_hivewriter import hive_rpc
+from podping_hivewriter.hive_rpc import HiveRPC, HiveRPCBroadcaster
+
+
+@pytest.mark.asyncio
+@pytest.mark.timeout(30)
+async def test_hive_rpc_reuses_connections(stand_in_hive_node):
+    node = stand_in_hive_node(head_block_number=1234)
+    rpc = HiveRPC([node.url])
+
+    for _ in range(5):
+        properties = await rpc.get_dynamic_global_properties()
+        assert properties["head_block_number"] == 1234
+
+    assert node.num_requests == 5
+    assert len(node.connections) == 1
+    assert rpc.num_connections_opened == 1
+
+    rpc.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.timeout(30)
+async def test_hive_rpc_batch_in_order(stand_in_hive_node):
+    node = stand_in_hive_node(head_block_number=1000)
+    rpc = HiveRPC([node.url])
+
+    blocks = await rpc.get_blocks(range(990, 1001))
+
+    assert node.num_requests == 1
+    assert [int(block["block"]["block_id"][:8], 16) for block in blocks] == list(
+        range(990, 1001)
+    )
+    # Not produced yet
+    assert await rpc.get_block(1001) == {}
+
+    rpc.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.timeout(30)
+async def test_hive_rpc_errors(stand_in_hive_node):
+    node = stand_in_hive_node()
+    rpc = HiveRPC([node.url])
+
+    # Hive errors keep the raw body for the retry logic
+    with pytest.raises(RPCNodeException) as exc_info:
+        await rpc.call("condenser_api.not_a_method", [])
+    assert exc_info.value.raw_body["error"]["data"]["name"] == "fc::exception"
+
+    # Anything else has no well-formed error, so the node gets skipped
+    node.fail = True
+    with pytest.raises(RPCNodeException) as exc_info:
+        await rpc.get_dynamic_global_properties()
+    assert exc_info.value.raw_body == {}
+
+    # As is a response cut short on a fresh connection
+    node.fail = False
+    node.truncate = True
+    with pytest.raises(RPCNodeException) as exc_info:
+        await rpc.get_dynamic_global_properties()
+    assert exc_info.value.raw_body == {}
+
+    rpc.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.timeout(30)
+async def test_hive_rpc_broadcaster(stand_in_hive_node, monkeypatch):
+    monkeypatch.setattr(
+        hive_rpc,
+        "sign_transaction",
+        lambda operations, props, keys, chain: {"operations": operations},
+    )
+    node = stand_in_hive_node(head_block_number=1000)
+    client = SimpleNamespace(current_node=node.url, keys=[], chain=None)
+    broadcaster = HiveRPCBroadcaster(client, HiveRPC([node.url]))
+
+    response = await broadcaster.broadcast(["op"])
+    assert response["block_num"] == 1001
+    assert node.transactions == [{"operations": ["op"]}]
+
+    # Dry runs come back signed without being sent
+    assert await broadcaster.broadcast(["op"], dry_run=True) == {"operations": ["op"]}
+    assert len(node.transactions) == 1
+
+    broadcaster.rpc.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.timeout(30)
+async def test_hive_rpc_fails_over(stand_in_hive_node):
+    down = stand_in_hive_node()
+    down.fail = True
+    up = stand_in_hive_node(head_block_number=1234)
+    rpc = HiveRPC([down.url, up.url])
+
+    # Calls pinned to a node stay on it
+    with pytest.raises(RPCNodeException):
+        await rpc.get_dynamic_global_properties(down.url)
+    assert rpc.current_node == down.url
+
+    with pytest.raises(RPCNodeException):
+        await rpc.get_dynamic_global_properties()
+    assert rpc.current_node == up.url
+    properties = await rpc.get_dynamic_global_properties()
+    assert properties["head_block_number"] == 1234
+
+    # A call that failed on a node it's no longer using doesn't move it on
+    assert rpc.next_node(down.url) == up.url
+
+    rpc.close()
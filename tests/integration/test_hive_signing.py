@@ -0,0 +1,82 @@
+from types import SimpleNamespace
+
+import pytest
+
+from podping_hivewriter import hive_signing
+from podping_hivewriter.hive_signing import HiveSigningContext, LocalSigningBroadcaster
+
+
+def stand_in_get_dynamic_global_properties(calls):
+    async def get_dynamic_global_properties():
+        calls.append(1)
+        return {
+            "head_block_number": 1000 + len(calls),
+            "head_block_id": "00000000" * 5,
+            "time": "2022-01-01T00:00:00",
+        }
+
+    return get_dynamic_global_properties
+
+
+@pytest.mark.asyncio
+@pytest.mark.timeout(10)
+async def test_hive_signing_context_reuses_reference_block(monkeypatch):
+    calls = []
+    signing_context = HiveSigningContext(
+        stand_in_get_dynamic_global_properties(calls), max_age=60
+    )
+
+    for _ in range(10):
+        properties = await signing_context.dynamic_global_properties()
+        assert properties["head_block_number"] == 1001
+
+    assert len(calls) == 1
+    assert signing_context.num_cache_hits == 9
+
+    # The head block time moves along with the local clock
+    monkeypatch.setattr(
+        signing_context, "_fetched_at", signing_context._fetched_at - 30
+    )
+    properties = await signing_context.dynamic_global_properties()
+    assert properties["time"] == "2022-01-01T00:00:30"
+    assert len(calls) == 1
+
+    # Too old to reuse
+    monkeypatch.setattr(
+        signing_context, "_fetched_at", signing_context._fetched_at - 60
+    )
+    properties = await signing_context.dynamic_global_properties()
+    assert properties["head_block_number"] == 1002
+    assert properties["time"] == "2022-01-01T00:00:00"
+
+
+@pytest.mark.asyncio
+@pytest.mark.timeout(10)
+async def test_local_signing_broadcaster(monkeypatch):
+    signed = []
+
+    def sign_transaction_stub(operations, properties, keys, chain):
+        signed.append((properties["head_block_number"], keys))
+        return {"operations": operations}
+
+    monkeypatch.setattr(hive_signing, "sign_transaction", sign_transaction_stub)
+    sent = []
+    client = SimpleNamespace(
+        keys=["key", "key"],
+        chain=None,
+        broadcast_transaction_synchronous=lambda signed_transaction: sent.append(
+            signed_transaction
+        )
+        or {"block_num": 1},
+    )
+    calls = []
+    broadcaster = LocalSigningBroadcaster(
+        client, HiveSigningContext(stand_in_get_dynamic_global_properties(calls))
+    )
+
+    for _ in range(3):
+        assert (await broadcaster.broadcast(["op"]))["block_num"] == 1
+
+    assert len(calls) == 1
+    assert signed == [(1001, ["key"])] * 3
+    assert sent == [{"operations": ["op"]}] * 3
@@ -0,0 +1,66 @@
+import asyncio
+
+import pytest
+from podping_schemas.org.podcastindex.podping.podping_medium import (
+    PodpingMedium,
+)
+from podping_schemas.org.podcastindex.podping.podping_reason import (
+    PodpingReason,
+)
+
+from podping_hivewriter.models.iri_batch import IRIBatch, QueuedIRIBatch
+
+
+@pytest.mark.asyncio
+@pytest.mark.timeout(5)
+async def test_queued_iri_batch_priority_queue_order():
+    medium = PodpingMedium.podcast
+    queue: "asyncio.PriorityQueue[QueuedIRIBatch]" = asyncio.PriorityQueue()
+
+    batches = [
+        QueuedIRIBatch(medium, PodpingReason.update, [f"https://{i}"], 1, i)
+        for i in range(5)
+    ]
+    live = QueuedIRIBatch(medium, PodpingReason.live, ["https://live"], -1, 5)
+    live_end = QueuedIRIBatch(medium, PodpingReason.liveEnd, ["https://end"], 0, 6)
+    for iri_batch in batches[:3] + [live_end, live] + batches[3:]:
+        await queue.put(iri_batch)
+
+    # Highest priority first, then first in first out within a priority
+    order = [queue.get_nowait() for _ in range(queue.qsize())]
+    assert order == [live, live_end] + batches
+
+
+def test_queued_iri_batch_model_round_trip():
+    queued = QueuedIRIBatch(
+        PodpingMedium.music, PodpingReason.update, ["https://a", "https://b"], 1, 42
+    )
+
+    assert not hasattr(queued, "__dict__")
+
+    iri_batch = queued.to_model()
+    assert isinstance(iri_batch, IRIBatch)
+    assert iri_batch.medium == PodpingMedium.music
+    assert iri_batch.reason == PodpingReason.update
+    assert iri_batch.iri_set == {"https://a", "https://b"}
+    assert iri_batch.priority == 1
+    assert iri_batch.timestampNs == 42
+
+    from_model = QueuedIRIBatch.from_model(iri_batch)
+    assert from_model.iri_set == iri_batch.iri_set
+    assert from_model.sequence > queued.sequence
+
+
+def test_iri_batch_equal_priority_is_not_less():
+    kwargs = dict(
+        medium=PodpingMedium.podcast,
+        reason=PodpingReason.update,
+        iri_set={"https://a"},
+        priority=1,
+        timestampNs=1,
+    )
+    a = IRIBatch(**kwargs)
+    b = IRIBatch(**kwargs)
+
+    assert not a < b
+    assert not b < a
@@ -0,0 +1,127 @@
+import asyncio
+
+import pytest
+from podping_schemas.org.podcastindex.podping.podping_medium import (
+    PodpingMedium,
+)
+from podping_schemas.org.podcastindex.podping.podping_reason import (
+    PodpingReason,
+)
+
+from podping_hivewriter.iri_batch_accumulator import IRIBatchAccumulator
+from podping_hivewriter.iri_batch_planner import plan_iri_lists
+
+
+@pytest.mark.asyncio
+@pytest.mark.timeout(5)
+async def test_iri_batch_accumulator_due_after_period():
+    medium = PodpingMedium.podcast
+    accumulator = IRIBatchAccumulator(lambda medium, reason: 1000)
+
+    assert accumulator.next_due_in(0.2) is None
+    assert not accumulator.changed.is_set()
+
+    accumulator.add(medium, PodpingReason.update, "https://example.com/1")
+    # Starting a batch wakes the flusher up so it can set its timer
+    assert accumulator.changed.is_set()
+    accumulator.changed.clear()
+
+    accumulator.add(medium, PodpingReason.update, "https://example.com/2")
+    accumulator.add(medium, PodpingReason.update, "https://example.com/1")
+    # Adding to a batch that's already started doesn't
+    assert not accumulator.changed.is_set()
+    accumulator.add(medium, PodpingReason.live, "https://example.com/live")
+    assert len(accumulator) == 3
+
+    assert accumulator.due(0.2) == []
+    assert 0 < accumulator.next_due_in(0.2) <= 0.2
+
+    await asyncio.sleep(0.25)
+    assert accumulator.due(0.2, timed_out=False) == []
+    assert accumulator.due(0.2) == [
+        (medium, PodpingReason.update),
+        (medium, PodpingReason.live),
+    ]
+
+    pending = accumulator.take(medium, PodpingReason.update)
+    assert list(pending.iri_list.sizes) == [
+        "https://example.com/1",
+        "https://example.com/2",
+    ]
+    assert len(accumulator) == 1
+
+
+def test_iri_batch_accumulator_due_when_full():
+    medium = PodpingMedium.podcast
+    reason = PodpingReason.update
+    accumulator = IRIBatchAccumulator(lambda medium, reason: 50)
+
+    accumulator.add(medium, reason, "https://example.com/1")
+    accumulator.changed.clear()
+    assert accumulator.due(60) == []
+
+    accumulator.add(medium, reason, "https://example.com/2")
+    accumulator.add(medium, reason, "https://example.com/3")
+    assert accumulator.changed.is_set()
+    assert accumulator.due(60) == [(medium, reason)]
+
+    taken = accumulator.take(medium, reason)
+    assert accumulator.carry_over(medium, reason, ["https://example.com/3"], taken)
+    assert len(accumulator) == 1
+    assert accumulator.due(60) == []
+    # Still due a period after the batch it was left over from started
+    assert accumulator.take(medium, reason).started == taken.started
+
+
+def test_iri_batch_accumulator_immediate_reasons():
+    medium = PodpingMedium.podcast
+    accumulator = IRIBatchAccumulator(
+        lambda medium, reason: 1000,
+        immediate_reasons={PodpingReason.live, PodpingReason.liveEnd},
+    )
+
+    accumulator.add(medium, PodpingReason.update, "https://example.com/update")
+    accumulator.add(medium, PodpingReason.live, "https://example.com/live")
+    accumulator.add(medium, PodpingReason.liveEnd, "https://example.com/end")
+
+    # Even while held back for having too many batches queued
+    assert accumulator.due(60, timed_out=False) == [
+        (medium, PodpingReason.live),
+        (medium, PodpingReason.liveEnd),
+    ]
+
+
+def test_iri_batch_accumulator_add_reports_duplicates():
+    medium, reason = PodpingMedium.podcast, PodpingReason.update
+    accumulator = IRIBatchAccumulator(lambda medium, reason: 1000)
+
+    assert accumulator.add(medium, reason, "https://example.com/1")
+    assert not accumulator.add(medium, reason, "https://example.com/1")
+    assert accumulator.add(medium, PodpingReason.live, "https://example.com/1")
+    assert len(accumulator) == 2
+
+
+def test_iri_batch_accumulator_carries_iris_over_once():
+    medium, reason = PodpingMedium.podcast, PodpingReason.update
+    accumulator = IRIBatchAccumulator(lambda medium, reason: 200)
+    times_carried_over = {}
+
+    # The smallest IRI always ends up in the least full list
+    accumulator.add(medium, reason, "https://a.b/")
+    new_iris = (f"https://example.com/{n:04}" for n in range(10000))
+    for _ in range(50):
+        # Sustained load, every window fills up before its period is over
+        while not accumulator.due(60):
+            accumulator.add(medium, reason, next(new_iris))
+        pending = accumulator.take(medium, reason)
+        iri_lists, _ = plan_iri_lists(
+            pending.iri_list.sizes, pending.max_list_size, pending.iri_list.sizes
+        )
+        if len(iri_lists) > 1 and accumulator.carry_over(
+            medium, reason, iri_lists[-1], pending
+        ):
+            for iri in iri_lists[-1]:
+                times_carried_over[iri] = times_carried_over.get(iri, 0) + 1
+
+    assert "https://a.b/" in times_carried_over
+    assert max(times_carried_over.values()) == 1
@@ -0,0 +1,84 @@
+import json
+import random
+
+from podping_schemas.org.podcastindex.podping.podping_medium import (
+    PodpingMedium,
+)
+from podping_schemas.org.podcastindex.podping.podping_reason import (
+    PodpingReason,
+)
+
+from podping_hivewriter.constants import HIVE_CUSTOM_OP_DATA_MAX_LENGTH
+from podping_hivewriter.iri_batch_planner import (
+    IRIListSizeTracker,
+    iri_list_size,
+    max_iri_list_size,
+    plan_iri_lists,
+)
+from podping_hivewriter.models.internal_podping import InternalPodping
+
+
+def test_plan_iri_lists_fills_operations_to_the_limit():
+    rng = random.Random(42)
+    medium = PodpingMedium.podcast
+    reason = PodpingReason.update
+    session_id = (1 << 64) - 1
+
+    iris = {
+        f"https://example.com/{'é' * rng.randint(0, 3)}{'x' * rng.randint(10, 300)}/{i}"
+        for i in range(2000)
+    }
+
+    max_list_size = max_iri_list_size(medium, reason, session_id, 8000)
+    iri_lists, oversized = plan_iri_lists(iris, max_list_size)
+
+    assert not oversized
+    assert set(iri for iri_list in iri_lists for iri in iri_list) == iris
+
+    # No more operations than the total size strictly requires, plus one
+    total_size = sum(iri_list_size(iri_list) - 2 for iri_list in iri_lists)
+    assert len(iri_lists) <= total_size // max_list_size + 2
+
+    for iri_list in iri_lists:
+        payload = InternalPodping(
+            medium=medium,
+            reason=reason,
+            iris=iri_list,
+            timestampNs=10**19 - 1,
+            sessionId=session_id,
+        ).dict()
+        payload_json = json.dumps(payload, separators=(",", ":"))
+        assert len(payload_json) <= HIVE_CUSTOM_OP_DATA_MAX_LENGTH
+        assert iri_list_size(iri_list) == len(
+            json.dumps(iri_list, separators=(",", ":"))
+        )
+
+
+def test_plan_iri_lists_rejects_oversized_iris():
+    huge_iri = "https://example.com/" + "x" * HIVE_CUSTOM_OP_DATA_MAX_LENGTH
+    iri_lists, oversized = plan_iri_lists(
+        ["https://example.com/feed.xml", huge_iri], 7998
+    )
+
+    assert iri_lists == [["https://example.com/feed.xml"]]
+    assert oversized == [huge_iri]
+
+
+def test_iri_list_size_tracker_matches_json_dumps():
+    iris = [
+        "https://example.com/feed.xml",
+        "https://www.example.com/pódcast.xml",
+        "https://example.com/\U0001f600/feed.xml",
+        'https://example.com/"quoted"\\feed.xml',
+        "https://example.com/feed.xml",
+    ]
+    iri_list = IRIListSizeTracker()
+
+    for i, iri in enumerate(iris):
+        iri_list.add(iri)
+        unique_iris = list(dict.fromkeys(iris[: i + 1]))
+        assert iri_list.size == len(json.dumps(unique_iris, separators=(",", ":")))
+        assert iri_list.iris_size == iri_list.size - 2
+
+    assert len(iri_list) == 4
+    assert iri_list_size(iri_list.sizes, iri_list.sizes) == iri_list.size
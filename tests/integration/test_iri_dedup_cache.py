@@ -0,0 +1,50 @@
+import time
+
+from podping_schemas.org.podcastindex.podping.podping_medium import (
+    PodpingMedium,
+)
+from podping_schemas.org.podcastindex.podping.podping_reason import (
+    PodpingReason,
+)
+
+from podping_hivewriter.iri_dedup_cache import IRIDedupCache
+
+
+def test_iri_dedup_cache_drops_repeats_within_window():
+    cache = IRIDedupCache(window=60)
+    iri = "https://example.com/feed.xml"
+
+    assert not cache.seen(iri, PodpingMedium.podcast, PodpingReason.update)
+    assert cache.seen(iri, PodpingMedium.podcast, PodpingReason.update)
+    # Different medium or reason is a different podping
+    assert not cache.seen(iri, PodpingMedium.music, PodpingReason.update)
+    assert not cache.seen(iri, PodpingMedium.podcast, PodpingReason.live)
+    assert len(cache) == 3
+
+
+def test_iri_dedup_cache_expires_entries():
+    cache = IRIDedupCache(window=0.05)
+    iri = "https://example.com/feed.xml"
+
+    assert not cache.seen(iri, PodpingMedium.podcast, PodpingReason.update)
+    time.sleep(0.1)
+    assert not cache.seen(iri, PodpingMedium.podcast, PodpingReason.update)
+    assert len(cache) == 1
+
+
+def test_iri_dedup_cache_is_bounded():
+    cache = IRIDedupCache(window=60, max_size=10)
+
+    for i in range(25):
+        cache.seen(
+            f"https://example.com/{i}", PodpingMedium.podcast, PodpingReason.update
+        )
+
+    assert len(cache) == 10
+    # Oldest entries are evicted first
+    assert not cache.seen(
+        "https://example.com/0", PodpingMedium.podcast, PodpingReason.update
+    )
+    assert cache.seen(
+        "https://example.com/24", PodpingMedium.podcast, PodpingReason.update
+    )
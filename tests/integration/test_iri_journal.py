@@ -0,0 +1,129 @@
+import asyncio
+import os
+import threading
+import time
+
+import pytest
+from podping_schemas.org.podcastindex.podping.podping_medium import (
+    PodpingMedium,
+)
+from podping_schemas.org.podcastindex.podping.podping_reason import (
+    PodpingReason,
+)
+
+from podping_hivewriter.iri_journal import IRIJournal
+
+
+@pytest.mark.asyncio
+async def test_iri_journal_replays_pending_iris(tmp_path):
+    journal = IRIJournal(tmp_path)
+    assert await journal.open() == []
+
+    iris = [f"https://example.com/{i}/feed.xml" for i in range(10)]
+    for iri in iris:
+        journal.record_accepted(PodpingMedium.podcast, PodpingReason.update, iri)
+    journal.record_accepted(PodpingMedium.music, PodpingReason.live, iris[0])
+    journal.record_done(PodpingMedium.podcast, PodpingReason.update, iris[:4])
+    await journal.flush()
+
+    # Simulate a crash: accepted but never flushed, plus a torn record
+    journal.record_accepted(PodpingMedium.podcast, PodpingReason.update, "lost")
+    journal._segment_file.write(b"A\tpodcast\tupdate\thttps://torn")
+    journal._segment_file.flush()
+
+    journal = IRIJournal(tmp_path)
+    pending = await journal.open()
+
+    assert set(pending) == {
+        *((PodpingMedium.podcast, PodpingReason.update, iri) for iri in iris[4:]),
+        (PodpingMedium.music, PodpingReason.live, iris[0]),
+    }
+    journal.close()
+
+
+@pytest.mark.asyncio
+async def test_iri_journal_compacts_segments(tmp_path):
+    journal = IRIJournal(tmp_path, max_segment_bytes=1024, max_segments=3)
+    await journal.open()
+
+    for i in range(500):
+        iri = f"https://example.com/{i}/feed.xml"
+        journal.record_accepted(PodpingMedium.podcast, PodpingReason.update, iri)
+        if i % 10:
+            journal.record_done(PodpingMedium.podcast, PodpingReason.update, [iri])
+        await journal.flush()
+
+    assert len(list(tmp_path.iterdir())) <= 3
+    journal.close()
+
+    journal = IRIJournal(tmp_path)
+    pending = await journal.open()
+
+    assert {iri for _, _, iri in pending} == {
+        f"https://example.com/{i}/feed.xml" for i in range(0, 500, 10)
+    }
+    assert len(list(tmp_path.iterdir())) == 1
+    journal.close()
+
+
+@pytest.mark.asyncio
+async def test_iri_journal_counts_copies_of_an_iri(tmp_path):
+    journal = IRIJournal(tmp_path)
+    await journal.open()
+
+    medium, reason, iri = PodpingMedium.podcast, PodpingReason.update, "https://a"
+    # Accepted again while the first copy is still on its way to Hive
+    journal.record_accepted(medium, reason, iri)
+    journal.record_accepted(medium, reason, iri)
+    journal.record_done(medium, reason, [iri])
+    await journal.flush()
+    assert len(journal) == 1
+    journal.close()
+
+    # The second copy survives a crash, and comes back once
+    journal = IRIJournal(tmp_path)
+    assert await journal.open() == [(medium, reason, iri)]
+    journal.record_done(medium, reason, [iri])
+    await journal.flush()
+    assert len(journal) == 0
+    journal.close()
+
+    journal = IRIJournal(tmp_path)
+    assert await journal.open() == []
+    journal.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.timeout(5)
+async def test_iri_journal_close_waits_for_cancelled_flush(tmp_path, monkeypatch):
+    journal = IRIJournal(tmp_path)
+    await journal.open()
+
+    fsync = os.fsync
+
+    def slow_fsync(fd: int):
+        # Only fsyncs in the worker thread are slow
+        if threading.current_thread() is not threading.main_thread():
+            time.sleep(0.3)
+        fsync(fd)
+
+    monkeypatch.setattr(os, "fsync", slow_fsync)
+    num_fsyncs = journal.num_fsyncs
+
+    medium, reason = PodpingMedium.podcast, PodpingReason.update
+    journal.record_accepted(medium, reason, "https://example.com/1")
+    flush = asyncio.ensure_future(journal.flush())
+    await asyncio.sleep(0.1)
+    # Shutting down cancels the flush while it's still writing
+    flush.cancel()
+    journal.record_accepted(medium, reason, "https://example.com/2")
+    journal.close()
+    # Neither write ran into the other
+    assert journal.num_fsyncs == num_fsyncs + 2
+
+    journal = IRIJournal(tmp_path)
+    assert sorted(await journal.open()) == [
+        (medium, reason, "https://example.com/1"),
+        (medium, reason, "https://example.com/2"),
+    ]
+    journal.close()
@@ -0,0 +1,46 @@
+import random
+
+import pytest
+import rfc3987
+
+from podping_hivewriter.iri_validator import is_valid_iri
+
+seed_iris = (
+    "https://example.com/feed.xml",
+    "http://feeds.example.org/podcast?format=rss&page=2#latest",
+    "https://www.example.com/pódcast.xml",
+    "ipns://example.com/feed.xml",
+    "https://example.com:8443/a/b/c/?q=%20a%2Fb",
+    "https://[2001:db8::1]/feed.xml",
+)
+mutation_chars = "abc09:/?#[]@!$&'()*+,;=%-._~ <>\"{}|\\^`é"
+
+
+@pytest.mark.parametrize("iri", seed_iris)
+def test_is_valid_iri_accepts_valid_iris(iri):
+    assert is_valid_iri(iri)
+
+
+@pytest.mark.parametrize(
+    "iri",
+    (
+        "",
+        "example.com/feed.xml",
+        "https://example.com/feed .xml",
+        "https://example.com/<feed>.xml",
+        "https://example.com/%zzfeed.xml",
+    ),
+)
+def test_is_valid_iri_rejects_invalid_iris(iri):
+    assert not is_valid_iri(iri)
+
+
+def test_is_valid_iri_matches_rfc3987():
+    rng = random.Random(3987)
+    for _ in range(20000):
+        iri = rng.choice(seed_iris)
+        for _ in range(rng.randint(1, 3)):
+            i = rng.randrange(len(iri) + 1)
+            iri = iri[:i] + rng.choice(mutation_chars) + iri[i:]
+
+        assert is_valid_iri(iri) == bool(rfc3987.match(iri, "IRI")), iri
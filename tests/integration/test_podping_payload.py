@@ -0,0 +1,34 @@
+import itertools
+import json
+
+from podping_hivewriter.models.internal_podping import InternalPodping
+from podping_hivewriter.models.medium import mediums
+from podping_hivewriter.models.reason import reasons
+from podping_hivewriter.podping_payload import encode_podping_payload
+
+
+def test_encode_podping_payload_matches_internal_podping():
+    iris = [
+        "https://example.com/feed.xml",
+        'https://example.com/pódcast.xml?a=1&b="quoted"',
+        "https://example.com/\\back\\slash/\U0001f600",
+        "https://example.com/中文/feed",
+    ]
+    for medium, reason in itertools.product(mediums, reasons):
+        for session_id in (0, (1 << 64) - 1):
+            expected = json.dumps(
+                InternalPodping(
+                    medium=medium,
+                    reason=reason,
+                    iris=iris,
+                    timestampNs=1640995200123456789,
+                    sessionId=session_id,
+                ).dict(),
+                separators=(",", ":"),
+            )
+            assert (
+                encode_podping_payload(
+                    str(medium), str(reason), iris, 1640995200123456789, session_id
+                )
+                == expected
+            )
@@ -0,0 +1,37 @@
+import pytest
+from podping_schemas.org.podcastindex.podping.podping_reason import (
+    PodpingReason,
+)
+
+from podping_hivewriter.models.reason import reasons
+from podping_hivewriter.priority_lanes import (
+    LaneDelay,
+    iri_batch_priority,
+    is_live_lane,
+)
+
+
+def test_priority_lanes():
+    assert iri_batch_priority(PodpingReason.live) < iri_batch_priority(
+        PodpingReason.liveEnd
+    )
+    assert iri_batch_priority(PodpingReason.liveEnd) < iri_batch_priority(
+        PodpingReason.update
+    )
+    assert {reason for reason in reasons if is_live_lane(reason)} == {
+        PodpingReason.live,
+        PodpingReason.liveEnd,
+    }
+
+
+def test_lane_delay():
+    lane_delay = LaneDelay()
+    assert lane_delay.mean == 0.0
+
+    for delay in (0.5, 1.5, 0.1):
+        lane_delay.record(delay)
+
+    assert lane_delay.count == 3
+    assert lane_delay.mean == pytest.approx(0.7)
+    assert lane_delay.max == 1.5
+    assert lane_delay.last == 0.1
@@ -0,0 +1,40 @@
+import pytest
+
+from benchmarks.block_corpus import read_blocks, write_blocks
+from benchmarks.record_blocks import synthetic_blocks
+from benchmarks.replay_node import ReplayNode
+from podping_hivewriter.hive import (
+    _podping_transactions_from_block,
+    get_relevant_transactions_from_blockchain,
+)
+from podping_hivewriter.hive_rpc import HiveRPC
+
+
+@pytest.mark.asyncio
+@pytest.mark.timeout(60)
+async def test_replay_node_serves_corpus_to_reader(tmp_path):
+    corpus_path = tmp_path / "blocks.jsonl.gz"
+    assert write_blocks(corpus_path, synthetic_blocks(5000, 200, 20, 0.1, 1)) == 200
+    expected = [
+        tx.hiveTxId
+        for block_num, result in read_blocks(corpus_path)
+        for _, tx in _podping_transactions_from_block(result["block"], block_num)
+    ]
+    assert expected
+
+    replay_node = ReplayNode(corpus_path).start()
+    rpc = HiveRPC([replay_node.url])
+    received = []
+    transactions = get_relevant_transactions_from_blockchain(None, 5000, rpc=rpc)
+    async for tx in transactions:
+        received.append(tx.hiveTxId)
+        if len(received) == len(expected):
+            break
+    await transactions.aclose()
+
+    assert received == expected
+    # Past the end of the corpus, like a block the node doesn't have yet
+    assert await rpc.get_block(5200) == {}
+
+    rpc.close()
+    replay_node.close()
@@ -0,0 +1,90 @@
+import asyncio
+import os
+import uuid
+
+import lighthive
+import pytest
+from podping_schemas.org.podcastindex.podping.podping_medium import (
+    PodpingMedium,
+)
+from podping_schemas.org.podcastindex.podping.podping_reason import (
+    PodpingReason,
+)
+
+from podping_hivewriter.constants import LIVETEST_OPERATION_ID
+from podping_hivewriter.models.podping_backpressure import PodpingBackpressure
+from podping_hivewriter.neuron import podping_backpressure_neuron
+from podping_hivewriter.podping_hivewriter import PodpingHivewriter
+from podping_hivewriter.podping_settings_manager import PodpingSettingsManager
+
+
+@pytest.mark.asyncio
+@pytest.mark.timeout(60)
+async def test_write_backpressure(monkeypatch):
+    settings_manager = PodpingSettingsManager(ignore_updates=True)
+
+    def mock_broadcast(*args, **kwargs):
+        return {"id": "1", "block_num": 1, "trx_num": 0, "expired": False}
+
+    monkeypatch.setattr(lighthive.client.Client, "broadcast_sync", mock_broadcast)
+
+    # Short enough not to fill an operation, so they wait for the period
+    session_uuid_str = str(uuid.uuid4())[:8]
+    test_iris = [f"https://example.com?i={i}&s={session_uuid_str}" for i in range(30)]
+
+    signals: asyncio.Queue[PodpingBackpressure] = asyncio.Queue()
+
+    async def _podping_backpressure_reaction(signal: PodpingBackpressure, _, _2):
+        await signals.put(signal)
+
+    with PodpingHivewriter(
+        os.environ["PODPING_HIVE_ACCOUNT"],
+        [os.environ["PODPING_HIVE_POSTING_KEY"]],
+        settings_manager,
+        resource_test=False,
+        status=False,
+        operation_id=LIVETEST_OPERATION_ID,
+        zmq_service=False,
+        backlog_high_watermark=20,
+        backlog_low_watermark=5,
+    ) as podping_hivewriter:
+        await podping_hivewriter.wait_startup()
+
+        await podping_hivewriter.plexus.adapt(
+            podping_backpressure_neuron,
+            reactants=(_podping_backpressure_reaction,),
+        )
+
+        sending = asyncio.ensure_future(
+            podping_hivewriter.send_podpings(
+                test_iris[:-1], PodpingMedium.podcast, PodpingReason.update
+            )
+        )
+
+        # Held up at the high watermark, until the IRIs are batched
+        signal = await asyncio.wait_for(signals.get(), 10)
+        assert signal.throttled
+        assert signal.backlog == 20
+        assert (signal.highWatermark, signal.lowWatermark) == (20, 5)
+        await asyncio.sleep(0.1)
+        assert not sending.done()
+        assert podping_hivewriter.total_iris_recv == 20
+
+        # Writes through Plexus are held up too
+        writing = asyncio.ensure_future(
+            podping_hivewriter.send_podping(
+                test_iris[-1], PodpingMedium.podcast, PodpingReason.update
+            )
+        )
+        await asyncio.sleep(0.1)
+        assert not writing.done()
+        assert podping_hivewriter.unprocessed_iri_queue.qsize() == 0
+
+        # Going out brings the backlog under the low watermark, and both resume
+        signal = await asyncio.wait_for(signals.get(), 30)
+        assert not signal.throttled
+        assert signal.backlog < 20
+        assert await asyncio.wait_for(sending, 30) == []
+        await asyncio.wait_for(writing, 30)
+        while podping_hivewriter.total_iris_recv < len(test_iris):
+            await asyncio.sleep(0.1)
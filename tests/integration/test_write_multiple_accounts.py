@@ -0,0 +1,101 @@
+import asyncio
+import os
+import uuid
+from platform import python_version as pv
+from typing import List
+
+import lighthive
+import pytest
+from podping_schemas.org.podcastindex.podping.podping_medium import (
+    PodpingMedium,
+)
+from podping_schemas.org.podcastindex.podping.podping_reason import (
+    PodpingReason,
+)
+
+from podping_hivewriter.constants import LIVETEST_OPERATION_ID
+from podping_hivewriter.neuron import (
+    podping_hive_transaction_neuron,
+)
+from podping_hivewriter.podping_hivewriter import PodpingHivewriter
+from podping_hivewriter.podping_settings_manager import PodpingSettingsManager
+from podping_schemas.org.podcastindex.podping.hivewriter.podping_hive_transaction import (
+    PodpingHiveTransaction,
+)
+
+
+@pytest.mark.asyncio
+@pytest.mark.timeout(60)
+async def test_write_multiple_accounts(monkeypatch):
+    settings_manager = PodpingSettingsManager(ignore_updates=True)
+
+    broadcast_clients: List[lighthive.client.Client] = []
+    broadcast_num_operations: List[int] = []
+
+    def mock_broadcast(self, op, dry_run=False):
+        broadcast_clients.append(self)
+        broadcast_num_operations.append(len(op))
+        return {"id": "1", "block_num": 1, "trx_num": 0, "expired": False}
+
+    monkeypatch.setattr(lighthive.client.Client, "broadcast_sync", mock_broadcast)
+
+    session_uuid_str = str(uuid.uuid4())
+
+    test_name = "multiple_accounts"
+    python_version = pv()
+    # More batches than a single account can get into one block
+    num_batches = 8
+    test_iris = {
+        f"https://example.com?t={test_name}&b={b}&v={python_version}&s={session_uuid_str}"
+        for b in range(num_batches)
+    }
+
+    tx_queue: asyncio.Queue[PodpingHiveTransaction] = asyncio.Queue()
+
+    async def _podping_hive_transaction_reaction(
+        transaction: PodpingHiveTransaction, _, _2
+    ):
+        await tx_queue.put(transaction)
+
+    additional_account = f"{os.environ['PODPING_HIVE_ACCOUNT']}.shard"
+
+    with PodpingHivewriter(
+        os.environ["PODPING_HIVE_ACCOUNT"],
+        [os.environ["PODPING_HIVE_POSTING_KEY"]],
+        settings_manager,
+        resource_test=False,
+        status=False,
+        operation_id=LIVETEST_OPERATION_ID,
+        zmq_service=False,
+        additional_accounts=[
+            (additional_account, os.environ["PODPING_HIVE_POSTING_KEY"])
+        ],
+    ) as podping_hivewriter:
+        await podping_hivewriter.wait_startup()
+
+        assert [shard.account for shard in podping_hivewriter.shards] == [
+            os.environ["PODPING_HIVE_ACCOUNT"],
+            additional_account,
+        ]
+
+        await podping_hivewriter.plexus.adapt(
+            podping_hive_transaction_neuron,
+            reactants=(_podping_hive_transaction_reaction,),
+        )
+
+        # Every batch goes in its own medium so they can't be merged
+        for iri, medium in zip(sorted(test_iris), sorted(PodpingMedium)):
+            await podping_hivewriter.send_podping(iri, medium, PodpingReason.update)
+
+        received_iris = set()
+        while len(received_iris) < len(test_iris):
+            tx = await tx_queue.get()
+            received_iris.update(iri for podping in tx.podpings for iri in podping.iris)
+
+        shard_clients = [shard.client for shard in podping_hivewriter.shards]
+
+    assert received_iris == test_iris
+    # More than one block's worth of batches for one account, so both were used
+    assert set(map(id, broadcast_clients)) == set(map(id, shard_clients))
+    assert sum(broadcast_num_operations) == num_batches
+    assert max(broadcast_num_operations) <= 5
@@ -0,0 +1,118 @@
+import asyncio
+import os
+import threading
+import uuid
+from platform import python_version as pv
+from timeit import default_timer as timer
+from typing import List
+
+import lighthive
+import pytest
+from podping_schemas.org.podcastindex.podping.podping_medium import (
+    PodpingMedium,
+)
+from podping_schemas.org.podcastindex.podping.podping_reason import (
+    PodpingReason,
+)
+
+from podping_hivewriter.constants import LIVETEST_OPERATION_ID
+from podping_hivewriter.neuron import (
+    podping_hive_transaction_neuron,
+)
+from podping_hivewriter.podping_hivewriter import PodpingHivewriter
+from podping_hivewriter.podping_settings_manager import PodpingSettingsManager
+from podping_schemas.org.podcastindex.podping.hivewriter.podping_hive_transaction import (
+    PodpingHiveTransaction,
+)
+
+
+@pytest.mark.asyncio
+@pytest.mark.timeout(60)
+async def test_write_pipelined_broadcast(monkeypatch):
+    settings_manager = PodpingSettingsManager(
+        ignore_updates=True, hive_operation_period=1
+    )
+
+    broadcast_latency = 2.5
+    lock = threading.Lock()
+    in_flight = 0
+    max_in_flight = 0
+    broadcast_times: List[float] = []
+    broadcast_num_operations: List[int] = []
+
+    def mock_broadcast(self, op, dry_run=False):
+        nonlocal in_flight, max_in_flight
+        with lock:
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            broadcast_times.append(timer())
+            broadcast_num_operations.append(len(op))
+        # A slow node
+        threading.Event().wait(broadcast_latency)
+        with lock:
+            in_flight -= 1
+        return {"id": "1", "block_num": 1, "trx_num": 0, "expired": False}
+
+    monkeypatch.setattr(lighthive.client.Client, "broadcast_sync", mock_broadcast)
+
+    session_uuid_str = str(uuid.uuid4())
+
+    test_name = "pipelined_broadcast"
+    python_version = pv()
+    num_rounds = 3
+    test_iris = [
+        f"https://example.com?t={test_name}&r={r}&v={python_version}&s={session_uuid_str}"
+        for r in range(num_rounds)
+    ]
+
+    tx_queue: asyncio.Queue[PodpingHiveTransaction] = asyncio.Queue()
+
+    async def _podping_hive_transaction_reaction(
+        transaction: PodpingHiveTransaction, _, _2
+    ):
+        await tx_queue.put(transaction)
+
+    with PodpingHivewriter(
+        os.environ["PODPING_HIVE_ACCOUNT"],
+        [os.environ["PODPING_HIVE_POSTING_KEY"]],
+        settings_manager,
+        resource_test=False,
+        status=False,
+        operation_id=LIVETEST_OPERATION_ID,
+        zmq_service=False,
+        max_broadcasts_in_flight=3,
+    ) as podping_hivewriter:
+        await podping_hivewriter.wait_startup()
+
+        await podping_hivewriter.plexus.adapt(
+            podping_hive_transaction_neuron,
+            reactants=(_podping_hive_transaction_reaction,),
+        )
+
+        for iri in test_iris:
+            await podping_hivewriter.send_podping(
+                iri, PodpingMedium.podcast, PodpingReason.update
+            )
+            # Each IRI lands in its own batch window
+            await asyncio.sleep(1.5)
+
+        received_iris = set()
+        while len(received_iris) < len(test_iris):
+            tx = await tx_queue.get()
+            received_iris.update(iri for podping in tx.podpings for iri in podping.iris)
+
+    assert received_iris == set(test_iris)
+    # A transaction was sent while an earlier one was still waiting on the node
+    assert max_in_flight > 1
+    # Still no more than 5 custom_json operations in any 3 second window
+    for start in broadcast_times:
+        assert (
+            sum(
+                num_operations
+                for broadcast_time, num_operations in zip(
+                    broadcast_times, broadcast_num_operations
+                )
+                if start <= broadcast_time < start + 3
+            )
+            <= 5
+        )
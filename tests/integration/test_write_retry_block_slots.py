@@ -0,0 +1,82 @@
+import asyncio
+import os
+import uuid
+from platform import python_version as pv
+from timeit import default_timer as timer
+from typing import List
+
+import lighthive
+import pytest
+from lighthive.exceptions import RPCNodeException
+from podping_schemas.org.podcastindex.podping.podping_medium import (
+    PodpingMedium,
+)
+from podping_schemas.org.podcastindex.podping.podping_reason import (
+    PodpingReason,
+)
+
+from podping_hivewriter.constants import HIVE_BLOCK_INTERVAL, LIVETEST_OPERATION_ID
+from podping_hivewriter.neuron import (
+    podping_hive_transaction_neuron,
+)
+from podping_hivewriter.podping_hivewriter import PodpingHivewriter
+from podping_hivewriter.podping_settings_manager import PodpingSettingsManager
+from podping_schemas.org.podcastindex.podping.hivewriter.podping_hive_transaction import (
+    PodpingHiveTransaction,
+)
+
+
+@pytest.mark.asyncio
+@pytest.mark.timeout(60)
+async def test_write_retry_waits_for_block_slots(monkeypatch):
+    settings_manager = PodpingSettingsManager(ignore_updates=True)
+
+    broadcast_times: List[float] = []
+
+    def mock_broadcast(self, op, dry_run=False):
+        broadcast_times.append(timer())
+        if len(broadcast_times) == 1:
+            message = "plugin exception: Account exceeded maximum custom json per block"
+            raise RPCNodeException(
+                message, code=None, raw_body={"error": {"message": message}}
+            )
+        return {"id": "1", "block_num": 1, "trx_num": 0, "expired": False}
+
+    monkeypatch.setattr(lighthive.client.Client, "broadcast_sync", mock_broadcast)
+
+    session_uuid_str = str(uuid.uuid4())
+    test_name = "retry_block_slots"
+    iri = f"https://example.com?t={test_name}&v={pv()}&s={session_uuid_str}"
+
+    tx_queue: asyncio.Queue[PodpingHiveTransaction] = asyncio.Queue()
+
+    async def _podping_hive_transaction_reaction(
+        transaction: PodpingHiveTransaction, _, _2
+    ):
+        await tx_queue.put(transaction)
+
+    with PodpingHivewriter(
+        os.environ["PODPING_HIVE_ACCOUNT"],
+        [os.environ["PODPING_HIVE_POSTING_KEY"]],
+        settings_manager,
+        resource_test=False,
+        status=False,
+        operation_id=LIVETEST_OPERATION_ID,
+        zmq_service=False,
+    ) as podping_hivewriter:
+        await podping_hivewriter.wait_startup()
+
+        await podping_hivewriter.plexus.adapt(
+            podping_hive_transaction_neuron,
+            reactants=(_podping_hive_transaction_reaction,),
+        )
+
+        await podping_hivewriter.send_podping(
+            iri, PodpingMedium.podcast, PodpingReason.update
+        )
+        tx = await tx_queue.get()
+
+    assert tx.podpings[0].iris == [iri]
+    assert len(broadcast_times) == 2
+    # The block was full, so the resend waits until its slots are free again
+    assert broadcast_times[1] - broadcast_times[0] >= HIVE_BLOCK_INTERVAL * 0.9
@@ -0,0 +1,97 @@
+import asyncio
+import os
+import random
+import uuid
+from platform import python_version as pv
+from typing import List
+
+import lighthive
+import pytest
+from podping_schemas.org.podcastindex.podping.podping_medium import (
+    PodpingMedium,
+)
+from podping_schemas.org.podcastindex.podping.podping_reason import (
+    PodpingReason,
+)
+
+from podping_hivewriter.constants import LIVETEST_OPERATION_ID
+from podping_hivewriter.models.medium import mediums
+from podping_hivewriter.models.reason import reasons
+from podping_hivewriter.neuron import (
+    podping_hive_transaction_neuron,
+)
+from podping_hivewriter.podping_hivewriter import PodpingHivewriter
+from podping_hivewriter.podping_settings_manager import PodpingSettingsManager
+from podping_schemas.org.podcastindex.podping.hivewriter.podping_hive_transaction import (
+    PodpingHiveTransaction,
+)
+
+
+@pytest.mark.asyncio
+@pytest.mark.timeout(60)
+async def test_write_send_podpings_multiple(monkeypatch):
+    settings_manager = PodpingSettingsManager(ignore_updates=True)
+
+    def mock_broadcast(*args, **kwargs):
+        return {"id": "1", "block_num": 1, "trx_num": 0, "expired": False}
+
+    monkeypatch.setattr(lighthive.client.Client, "broadcast_sync", mock_broadcast)
+
+    session_uuid = uuid.uuid4()
+    session_uuid_str = str(session_uuid)
+
+    test_name = "send_podpings_multiple"
+    python_version = pv()
+    test_iris = {
+        f"https://example.com?t={test_name}&i={i}&v={python_version}&s={session_uuid_str}"
+        for i in range(random.randint(50, 250))
+    }
+    invalid_iris = ["not an iri", "https://example.com/<invalid>"]
+
+    medium: PodpingMedium = random.sample(sorted(mediums), 1)[0]
+    reason: PodpingReason = random.sample(sorted(reasons), 1)[0]
+
+    tx_queue: asyncio.Queue[PodpingHiveTransaction] = asyncio.Queue()
+
+    async def _podping_hive_transaction_reaction(
+        transaction: PodpingHiveTransaction, _, _2
+    ):
+        await tx_queue.put(transaction)
+
+    with PodpingHivewriter(
+        os.environ["PODPING_HIVE_ACCOUNT"],
+        [os.environ["PODPING_HIVE_POSTING_KEY"]],
+        settings_manager,
+        resource_test=False,
+        status=False,
+        operation_id=LIVETEST_OPERATION_ID,
+        zmq_service=False,
+    ) as podping_hivewriter:
+        await podping_hivewriter.wait_startup()
+
+        await podping_hivewriter.plexus.adapt(
+            podping_hive_transaction_neuron,
+            reactants=(_podping_hive_transaction_reaction,),
+        )
+
+        rejected = await podping_hivewriter.send_podpings(
+            [*test_iris, *invalid_iris], medium=medium, reason=reason
+        )
+
+        assert rejected == invalid_iris
+        assert podping_hivewriter.total_iris_recv == len(test_iris)
+
+        txs: List[PodpingHiveTransaction] = []
+        while sum(len(podping.iris) for tx in txs for podping in tx.podpings) < len(
+            test_iris
+        ):
+            txs.append(await tx_queue.get())
+
+        for tx in txs:
+            for podping in tx.podpings:
+                assert podping.medium == medium
+                assert podping.reason == reason
+
+        assert test_iris == set(
+            iri for tx in txs for podping in tx.podpings for iri in podping.iris
+        )